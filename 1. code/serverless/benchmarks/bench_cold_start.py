@@ -0,0 +1,56 @@
+"""
+콜드 스타트 import 시간 측정
+
+새 인터프리터에서 `python -X importtime -c "import app"`를 여러 번 실행하여
+app 모듈의 누적 import 시간(모듈 수준 클라이언트 생성 포함)과 상위 모듈을 출력한다.
+클라이언트 생성이 첫 사용으로 미뤄졌는지 확인하려면 변경 전후로 실행해 비교한다.
+
+실행:
+    python benchmarks/bench_cold_start.py [--runs 5] [--top 10]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+
+def import_profile(module='app'):
+    """한 번의 콜드 import 결과: {모듈명: 누적 us}"""
+    env = dict(os.environ)
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=SRC_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    profiles = [import_profile() for _ in range(args.runs)]
+    totals = [p['app'] / 1000 for p in profiles]
+    print(f"import app x {args.runs}회: median {statistics.median(totals):.1f} ms "
+          f"(min {min(totals):.1f}, max {max(totals):.1f})")
+
+    last = profiles[-1]
+    print(f"\n누적 시간 상위 {args.top}개 모듈 (마지막 실행)")
+    for name, us in sorted(last.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == '__main__':
+    main()
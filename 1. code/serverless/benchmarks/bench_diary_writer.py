@@ -0,0 +1,158 @@
+"""
+일기 일괄 저장(DiaryBatchWriter) 동작/저장 보장 검증 (가짜 S3)
+
+1. 응답 경로 지연: object 모드(put_object 대기) vs batch 모드(버퍼에 넣고 반환)
+2. 크기 기준 flush: max_records를 채우면 백그라운드에서 업로드
+3. 시간 기준 flush: max_age_seconds가 지나면 업로드
+4. 업로드 실패: 레코드를 버퍼로 되돌렸다가 재시도 (손실 없음)
+5. 응답 유실: 저장은 됐지만 실패 응답 -> 재업로드로 중복, 읽을 때 diary_id로 제거
+6. 종료: SIGTERM을 받으면 남은 레코드를 올리고 종료 (별도 프로세스)
+
+실행:
+    python benchmarks/bench_diary_writer.py
+"""
+import os
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, '..', 'src')
+sys.path.insert(0, SRC_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+from fake_aws import FakeS3  # noqa: E402
+from handlers.aws_clients import register_client  # noqa: E402
+from handlers.diary_store import diary_record, iter_batch_records, new_diary_id  # noqa: E402
+from handlers.diary_writer import DiaryBatchWriter  # noqa: E402
+from handlers import text_handler  # noqa: E402
+
+BUCKET = 'bench-bucket'
+S3_LATENCY = 0.03
+
+
+def records(count):
+    return [diary_record(new_diary_id(), f'오늘의 일기 {i}번째, 산책을 했다', 'f', '멋져요 🌷') for i in range(count)]
+
+
+def stored_records(s3):
+    today = date.today()
+    return list(iter_batch_records(s3, BUCKET, today - timedelta(days=1), today + timedelta(days=1)))
+
+
+def wait_until(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def bench_latency(count=20):
+    s3 = FakeS3(latency=S3_LATENCY)
+    register_client('s3', s3)
+    start = time.perf_counter()
+    for record in records(count):
+        text_handler.save_diary_data(BUCKET, record['diary_id'], record['content'], record['type'], record['compliment'])
+    object_ms = (time.perf_counter() - start) * 1000 / count
+
+    s3 = FakeS3(latency=S3_LATENCY)
+    writer = DiaryBatchWriter(s3, BUCKET, max_records=count)
+    start = time.perf_counter()
+    for record in records(count):
+        writer.add(record)
+    batch_ms = (time.perf_counter() - start) * 1000 / count
+    writer.close()
+
+    print(f"[응답 경로] 건당 object {object_ms:.2f} ms / batch {batch_ms:.3f} ms, "
+          f"PUT {count}회 -> {s3.puts}회", file=sys.stderr)
+    assert s3.puts == 1 and len(stored_records(s3)) == count
+
+
+def check_size_flush():
+    s3 = FakeS3()
+    writer = DiaryBatchWriter(s3, BUCKET, max_records=10, max_age_seconds=60)
+    for record in records(25):
+        writer.add(record)
+    assert wait_until(lambda: writer.stats()['flushed'] >= 20), writer.stats()
+    pending_before_close = writer.pending()
+    writer.close()
+    stats = writer.stats()
+    print(f"[크기 기준] close 전 대기 {pending_before_close}건, {stats}", file=sys.stderr)
+    assert stats['flushed'] == 25 and len(stored_records(s3)) == 25
+
+
+def check_age_flush():
+    s3 = FakeS3()
+    writer = DiaryBatchWriter(s3, BUCKET, max_records=100, max_age_seconds=0.2)
+    for record in records(3):
+        writer.add(record)
+    assert writer.pending() == 3
+    assert wait_until(lambda: writer.stats()['flushed'] == 3), writer.stats()
+    print(f"[시간 기준] {writer.stats()}", file=sys.stderr)
+    writer.close()
+
+
+def check_failed_upload():
+    s3 = FakeS3(fail_puts=2)
+    writer = DiaryBatchWriter(s3, BUCKET, max_records=5, max_age_seconds=60, retry_seconds=0.1)
+    for record in records(5):
+        writer.add(record)
+    assert wait_until(lambda: writer.stats()['flushed'] == 5), writer.stats()
+    writer.close()
+    stats = writer.stats()
+    print(f"[업로드 실패] PUT {s3.puts}회, {stats}", file=sys.stderr)
+    assert stats['failed_flushes'] == 2 and len(stored_records(s3)) == 5
+
+
+def check_lost_ack():
+    s3 = FakeS3(lose_acks=1)
+    writer = DiaryBatchWriter(s3, BUCKET, max_records=4, max_age_seconds=60, retry_seconds=0.1)
+    for record in records(4):
+        writer.add(record)
+    assert wait_until(lambda: writer.stats()['flushed'] == 4), writer.stats()
+    writer.close()
+    unique = stored_records(s3)
+    print(f"[응답 유실] 배치 객체 {len(s3.objects)}개, 중복 제거 후 {len(unique)}건", file=sys.stderr)
+    assert len(s3.objects) == 2 and len(unique) == 4
+
+
+SHUTDOWN_SCRIPT = """
+import atexit, os, signal, sys
+sys.path.insert(0, {bench!r}); sys.path.insert(0, {src!r})
+from fake_aws import FakeS3
+from handlers.diary_store import diary_record, new_diary_id
+from handlers.diary_writer import DiaryBatchWriter, flush_on_shutdown
+s3 = FakeS3()
+# atexit는 역순 실행이므로 writer.close() 뒤에 결과 출력
+atexit.register(lambda: print(len(s3.objects), s3.puts))
+writer = DiaryBatchWriter(s3, 'b', max_records=100, max_age_seconds=60)
+flush_on_shutdown(writer)
+for i in range(7):
+    writer.add(diary_record(new_diary_id(), 'x', 'f', 'y'))
+os.kill(os.getpid(), signal.SIGTERM)
+"""
+
+
+def check_shutdown():
+    script = SHUTDOWN_SCRIPT.format(bench=BENCH_DIR, src=SRC_DIR)
+    output = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, timeout=30)
+    objects, puts = output.stdout.split()
+    print(f"[SIGTERM] exit={output.returncode}, 배치 객체 {objects}개 (PUT {puts}회)", file=sys.stderr)
+    assert output.returncode == 0 and objects == '1', output.stderr
+
+
+def main():
+    bench_latency()
+    check_size_flush()
+    check_age_flush()
+    check_failed_upload()
+    check_lost_ack()
+    check_shutdown()
+    print('모든 시나리오 통과', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
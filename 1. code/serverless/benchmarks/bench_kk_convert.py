@@ -0,0 +1,84 @@
+"""
+convert_to_kk_style 벤치마크 및 동등성 검증
+
+1. data/KoreanSyllableData의 초성(U+11xx) / 호환 자모(U+31xx) 이름으로 CHOSEONG_LIST 순서 검증
+2. 한글 음절 11,172자 전체에 대해 기존 jamo 기반 구현과 결과 비교
+3. 일기/칭찬 길이 문장으로 처리 속도 비교
+
+실행:
+    python benchmarks/bench_kk_convert.py
+"""
+import json
+import os
+import sys
+import timeit
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from handlers.voice_handler import (  # noqa: E402
+    CONSONANT_MAP, CHOSEONG_LIST, HANGUL_FIRST, HANGUL_LAST, convert_to_kk_style
+)
+
+try:
+    from jamo import h2j, j2hcj
+    JAMO_AVAILABLE = True
+except ImportError:
+    JAMO_AVAILABLE = False
+
+SAMPLE_TEXT = "감정을 이해하는 당신은 정말 멋져요 💚 오늘도 잘 버텨낸 너, 정말 대단해! 내일은 더 좋은 일이 있을 거야~ 🌷" * 2
+
+
+def legacy_convert_to_kk_style(text):
+    """기존 구현 (음절마다 jamo 분해)"""
+    result = []
+    for char in text:
+        if '가' <= char <= '힣':
+            jamos = j2hcj(h2j(char))
+            if jamos and jamos[0] in CONSONANT_MAP:
+                result.append(CONSONANT_MAP[jamos[0]])
+    return ''.join(result)
+
+
+def validate_choseong_list():
+    data_dir = os.path.join(BASE_DIR, 'data', 'KoreanSyllableData')
+    with open(os.path.join(data_dir, 'U+11xx.json'), encoding='utf-8') as f:
+        choseong = json.load(f)
+    with open(os.path.join(data_dir, 'U+31xx.json'), encoding='utf-8') as f:
+        letter_by_name = {name: char for char, name in json.load(f).items()}
+
+    # U+1100부터 19개가 현대 한글 초성 순서
+    expected = ''.join(
+        letter_by_name[choseong[chr(0x1100 + idx)].replace('CHOSEONG', 'LETTER')]
+        for idx in range(len(CHOSEONG_LIST))
+    )
+    assert expected == CHOSEONG_LIST, f"{expected} != {CHOSEONG_LIST}"
+    print(f"초성 순서 검증 통과: {CHOSEONG_LIST}")
+
+
+def validate_equivalence():
+    syllables = ''.join(chr(code) for code in range(HANGUL_FIRST, HANGUL_LAST + 1))
+    assert convert_to_kk_style(syllables) == legacy_convert_to_kk_style(syllables)
+    assert convert_to_kk_style(SAMPLE_TEXT) == legacy_convert_to_kk_style(SAMPLE_TEXT)
+    print(f"동등성 검증 통과: {len(syllables)}개 음절")
+
+
+def main():
+    validate_choseong_list()
+
+    if not JAMO_AVAILABLE:
+        print("jamo 미설치 - 기존 구현과의 비교를 건너뜁니다")
+        return
+
+    validate_equivalence()
+
+    number = 2000
+    legacy = timeit.timeit(lambda: legacy_convert_to_kk_style(SAMPLE_TEXT), number=number)
+    table = timeit.timeit(lambda: convert_to_kk_style(SAMPLE_TEXT), number=number)
+    print(f"{len(SAMPLE_TEXT)}자 문장 x {number}회")
+    print(f"  jamo 기반: {legacy * 1e6 / number:8.1f} us/call")
+    print(f"  변환표   : {table * 1e6 / number:8.1f} us/call ({legacy / table:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""
+핫 패스 마이크로 벤치마크 (AWS 없이)
+
+- validate_input: 일기 코퍼스 검증 1건당 시간
+- convert_to_kk_style: 칭찬 문장 -> 쿼카 자음 변환 1건당 시간
+- generate_voice_file: 합성 + WAV 인코딩 + (가짜 S3) 업로드 1건당 시간 (결과 캐시를 매번 비워 항상 미스)
+
+반복 측정의 중앙값을 µs/건으로 출력하고, --budget을 주면 perf_budget.json의 micro 한도와 비교한다.
+generate_voice_file은 사운드 뱅크(python src/handlers/sound_bank.py) 또는 ffmpeg + sources/high가 필요하다.
+
+실행:
+    python benchmarks/bench_micro.py [--repeat 5] [--json result.json] [--budget benchmarks/perf_budget.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('S3_BUCKET', 'bench-bucket')
+
+from fake_aws import FakeS3  # noqa: E402
+from handlers.aws_clients import register_client  # noqa: E402
+from handlers.cache import LRUCache  # noqa: E402
+from handlers.text_validation import validate_input  # noqa: E402
+from handlers import voice_handler  # noqa: E402
+
+CORPUS_PATH = os.path.join(BENCH_DIR, 'data', 'diaries.jsonl')
+DEFAULT_BUDGET = os.path.join(BENCH_DIR, 'perf_budget.json')
+
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def per_item_us(fn, items, repeat):
+    """items 전체를 repeat번 돌린 중앙값 기준 1건당 µs"""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        runs.append((time.perf_counter() - start) * 1e6 / len(items))
+    return statistics.median(runs)
+
+
+def bench_validate(corpus, repeat):
+    return per_item_us(lambda entry: validate_input(entry['type'], entry['content']), corpus * 25, repeat)
+
+
+def bench_kk_convert(compliments, repeat):
+    return per_item_us(voice_handler.convert_to_kk_style, compliments * 25, repeat)
+
+
+def bench_voice_file(compliments, repeat):
+    s3 = FakeS3()
+    register_client('s3', s3, voice_handler.S3_REGION)
+    if not voice_handler.load_padata_sounds():
+        return None
+
+    kk_sounds = [voice_handler.convert_to_kk_style(compliment) for compliment in compliments[:10]]
+    runs = []
+    for _ in range(repeat):
+        elapsed = 0.0
+        for kk_sound in kk_sounds:
+            # 결과 캐시(메모리 LRU + S3)를 비워 매번 합성/인코딩/업로드 경로를 탐
+            voice_handler.voice_cache = LRUCache(voice_handler.voice_cache.maxsize)
+            s3.objects.clear()
+            start = time.perf_counter()
+            url = voice_handler.generate_voice_file(kk_sound, 'diary-bench', 'wav')
+            elapsed += time.perf_counter() - start
+            assert url, '음성 생성 실패'
+        runs.append(elapsed * 1e6 / len(kk_sounds))
+    return statistics.median(runs)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    parser.add_argument('--budget', nargs='?', const=DEFAULT_BUDGET, help='perf_budget.json 한도와 비교')
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    compliments = [f"{entry['content'][:60]} 정말 멋져요" for entry in corpus]
+
+    # generate_voice_file의 캐시 통계 로그는 결과 표와 섞이지 않도록 stderr로
+    stdout = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        results = {
+            'validate_input': bench_validate(corpus, args.repeat),
+            'convert_to_kk_style': bench_kk_convert(compliments, args.repeat),
+            'generate_voice_file': bench_voice_file(compliments, args.repeat),
+        }
+    finally:
+        sys.stdout = stdout
+
+    for name, us in results.items():
+        print(f"{name:22} {'(사운드 없음, 건너뜀)' if us is None else f'{us:12.1f} µs/건'}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if args.budget:
+        with open(args.budget, encoding='utf-8') as f:
+            budget = json.load(f)['micro_us']
+        failures = [
+            f"{name} {us:.1f} µs > {budget[name]} µs"
+            for name, us in results.items()
+            if us is not None and name in budget and us > budget[name]
+        ]
+        if failures:
+            print('마이크로 벤치마크 예산 초과:\n  ' + '\n  '.join(failures))
+            sys.exit(1)
+        print('마이크로 벤치마크 예산 통과')
+
+
+if __name__ == '__main__':
+    main()
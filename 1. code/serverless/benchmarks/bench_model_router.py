@@ -0,0 +1,70 @@
+"""
+모델 라우터 시나리오 검증 (가짜 Bedrock 클라이언트)
+
+1. 정상: 품질 등급별 첫 모델로 라우팅
+2. 스로틀링: 첫 모델이 ThrottlingException이면 다음 모델로 failover
+3. 지연: 첫 모델이 hedge 지연보다 느리면 다음 모델을 동시에 호출해 먼저 온 응답 사용
+4. 제한 시간: 모든 모델이 제한 시간을 넘기면 실패
+
+실행:
+    python benchmarks/bench_model_router.py
+"""
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+# 시나리오를 짧게 돌리기 위해 hedge 지연/제한 시간을 줄임
+os.environ.setdefault('COMPLIMENT_HEDGE_DELAY_MS', '150')
+os.environ.setdefault('COMPLIMENT_MODEL_TIMEOUTS', '{"amazon.nova-micro-v1:0": 0.5, "amazon.nova-lite-v1:0": 0.5, "amazon.nova-pro-v1:0": 0.8}')
+os.environ.setdefault('METRICS_NAMESPACE', 'QuokkaDiaryBench')
+
+from fake_aws import FakeBedrockRuntime, ModelBehavior  # noqa: E402
+from handlers.aws_clients import register_client  # noqa: E402
+from handlers.model_router import NOVA_MICRO, NOVA_LITE, NOVA_PRO, get_router_stats  # noqa: E402
+from handlers.rate_limiter import reset_limiters  # noqa: E402
+from handlers import text_handler  # noqa: E402
+
+CONTENT = '오늘은 발표가 있었는데 생각보다 잘 끝나서 뿌듯했다. 준비한 만큼 결과가 나온 것 같다.'
+
+
+def run(name, behaviors, quality_level, expect_models=None, expect_error=False):
+    bedrock = FakeBedrockRuntime(behaviors)
+    register_client('bedrock-runtime', bedrock)
+    # 앞 시나리오의 스로틀링으로 줄어든 속도가 다음 시나리오의 지연시간에 섞이지 않도록
+    reset_limiters()
+
+    start = time.perf_counter()
+    try:
+        compliment = text_handler.generate_compliment(CONTENT, 'f', quality_level)
+        outcome = f"ok: {compliment}"
+        assert not expect_error, f"{name}: 실패해야 함"
+    except Exception as e:
+        outcome = f"error: {e}"
+        assert expect_error, f"{name}: {e}"
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if expect_models is not None:
+        assert bedrock.calls == expect_models, f"{name}: {bedrock.calls} != {expect_models}"
+    print(f"[{name}] {quality_level:6} {elapsed:7.1f} ms  calls={bedrock.calls}  {outcome}", file=sys.stderr)
+
+
+def main():
+    # EMF 지표 로그는 stdout, 시나리오 결과는 stderr
+    run('정상', {}, 'low', [NOVA_MICRO])
+    run('정상', {}, 'high', [NOVA_PRO])
+    run('스로틀링', {NOVA_LITE: ModelBehavior(throttle_rate=1.0)}, 'medium', [NOVA_LITE, NOVA_PRO])
+    run('서비스 오류', {NOVA_MICRO: ModelBehavior(fail_first=1)}, 'low', [NOVA_MICRO, NOVA_LITE])
+    run('지연 hedge', {NOVA_PRO: ModelBehavior(latency=0.6)}, 'high', [NOVA_PRO, NOVA_LITE])
+    run('제한 시간', {NOVA_LITE: ModelBehavior(latency=1.0), NOVA_PRO: ModelBehavior(latency=1.0)},
+        'medium', expect_error=True)
+
+    print('\n모델별 누적', file=sys.stderr)
+    for model_id, stats in get_router_stats().items():
+        print(f"  {model_id:26} {stats}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
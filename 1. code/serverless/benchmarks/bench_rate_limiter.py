@@ -0,0 +1,174 @@
+"""
+Bedrock 속도 제한 시나리오 검증 (가짜 시계 + 가짜 Bedrock/S3, AWS 없이)
+
+1. AIMD: 첫 스로틀링 전에는 제한 없음, 스로틀링이면 허용 속도 절반 (첫 스로틀링은 최근 1초 전송량 기준,
+   최소 BEDROCK_DEFAULT_RPS, cooldown 안의 연속 스로틀링은 한 번만), 성공하면 조금씩 증가
+2. 부하 차단: 토큰 대기가 MAX_QUEUE_WAIT_MS를 넘으면 기다리지 않고 RateLimited(retry_after)
+3. 마감 시간: Lambda 남은 시간이 부족하면 Bedrock을 호출하지 않고 바로 429
+4. 칭찬 모델 전부 스로틀링: /generate/text가 500 대신 429 + Retry-After
+5. Nova Canvas 일시 오류: 지터 백오프 재시도 후 성공, 계속 스로틀링이면 429
+
+실행:
+    python benchmarks/bench_rate_limiter.py
+"""
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('S3_BUCKET', 'bench-bucket')
+os.environ.setdefault('METRICS_NAMESPACE', 'QuokkaDiaryBench')
+os.environ.setdefault('COLD_START_PROFILE', '0')
+# 재시도 대기를 짧게
+os.environ.setdefault('BEDROCK_BACKOFF_BASE_MS', '20')
+
+from fake_aws import FakeBedrockRuntime, FakeS3, ModelBehavior  # noqa: E402
+from handlers.aws_clients import register_client  # noqa: E402
+from handlers.rate_limiter import AdaptiveRateLimiter, RateLimited, reset_limiters  # noqa: E402
+
+IMAGE_MODEL = 'amazon.nova-canvas-v1:0'
+CONTENT = '오늘은 발표가 있었는데 생각보다 잘 끝나서 뿌듯했다. 준비한 만큼 결과가 나온 것 같다.'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class Context:
+    """Lambda context 대용 (남은 실행 시간 지정)"""
+
+    def __init__(self, request_id, remaining_ms=30000):
+        self.aws_request_id = request_id
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+def install(behaviors=None, default=None):
+    bedrock = FakeBedrockRuntime(behaviors, default=default)
+    s3 = FakeS3()
+    for region in (None, 'us-east-1'):
+        register_client('bedrock-runtime', bedrock, region)
+        register_client('s3', s3, region)
+    reset_limiters()
+    return bedrock
+
+
+def post(app, path, body, context):
+    event = {'httpMethod': 'POST', 'path': path, 'body': json.dumps(body, ensure_ascii=False)}
+    start = time.perf_counter()
+    # 핸들러 로그/EMF는 버리고 결과만 출력
+    with contextlib.redirect_stdout(io.StringIO()):
+        response = app.lambda_handler(event, context)
+    return response, (time.perf_counter() - start) * 1000
+
+
+def check_aimd():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter('aimd', rate=10, burst=1, clock=clock, sleep=clock.sleep)
+    with contextlib.redirect_stdout(io.StringIO()):
+        limiter.on_throttle()
+        assert limiter.rate == 5, limiter.rate
+        limiter.on_throttle()
+        assert limiter.rate == 5, 'cooldown 안의 스로틀링은 한 번만 반영'
+        clock.sleep(1.5)
+        limiter.on_throttle()
+        assert limiter.rate == 2.5, limiter.rate
+    for _ in range(10):
+        limiter.on_success()
+    assert 5 < limiter.rate < 6, limiter.rate
+    print(f"[AIMD] 10 -> 5 -> 5 (cooldown) -> 2.5 -> 성공 10회 후 {limiter.rate:.2f} rps")
+
+
+def check_unlimited_until_throttle():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter('unlimited', rate=None, start_rate=10, clock=clock, sleep=clock.sleep)
+    for _ in range(20):
+        limiter.acquire()
+        limiter.on_success()
+    assert clock.now == 100.0 and limiter.rate is None, '첫 스로틀링 전에는 기다리지 않음'
+    with contextlib.redirect_stdout(io.StringIO()):
+        limiter.on_throttle()
+    assert limiter.rate == 10, limiter.rate
+    print(f"[첫 스로틀링] 제한 없이 1초에 20건 -> 스로틀링 -> {limiter.rate:.0f} rps부터 제한")
+
+
+def check_shedding():
+    clock = FakeClock()
+    limiter = AdaptiveRateLimiter('shed', rate=0.5, burst=1, clock=clock, sleep=clock.sleep)
+    limiter.acquire()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            limiter.acquire()
+        raise AssertionError('토큰 대기 2초 > MAX_QUEUE_WAIT_MS면 거절해야 함')
+    except RateLimited as e:
+        assert e.retry_after == 2, e.retry_after
+    clock.sleep(1.5)
+    limiter.acquire()
+    assert clock.now == 102.0, '0.5초만 기다리고 통과'
+    print(f"[부하 차단] 대기 2초 -> RateLimited(retry_after=2), 대기 0.5초 -> 통과  {limiter.snapshot()}")
+
+
+def check_deadline(app):
+    bedrock = install()
+    response, ms = post(app, '/generate/text', {'type': 'F', 'content': CONTENT}, Context('deadline', remaining_ms=1500))
+    assert response['statusCode'] == 429, response
+    assert bedrock.calls == [], bedrock.calls
+    print(f"[마감 시간] 남은 1.5초 -> {response['statusCode']} Retry-After={response['headers']['Retry-After']} "
+          f"Bedrock 호출 {len(bedrock.calls)}회 ({ms:.1f} ms)")
+
+
+def check_all_throttled(app):
+    bedrock = install(default=ModelBehavior(throttle_rate=1.0))
+    response, ms = post(app, '/generate/text', {'type': 'F', 'content': CONTENT}, Context('throttled'))
+    body = json.loads(response['body'])
+    assert response['statusCode'] == 429, response
+    assert int(response['headers']['Retry-After']) == body['retry_after'] >= 1, response
+    assert response['headers']['Access-Control-Expose-Headers'] == 'Retry-After'
+    print(f"[전부 스로틀링] /generate/text -> {response['statusCode']} Retry-After={body['retry_after']} "
+          f"calls={bedrock.calls} ({ms:.1f} ms)")
+
+
+def check_image_retry(app):
+    body = {'diary_id': 'diary-rate-limit', 'compliment': '정말 멋진 하루였어요'}
+
+    bedrock = install({IMAGE_MODEL: ModelBehavior(fail_first=2)})
+    response, ms = post(app, '/generate/image', body, Context('image-retry'))
+    generate_calls = bedrock.calls.count(IMAGE_MODEL)
+    assert response['statusCode'] == 200, response
+    print(f"[Canvas 일시 오류] 실패 2회 -> 재시도 후 {response['statusCode']} (배경 제거 포함 Canvas 호출 {generate_calls}회, {ms:.1f} ms)")
+
+    bedrock = install({IMAGE_MODEL: ModelBehavior(throttle_rate=1.0)})
+    response, ms = post(app, '/generate/image', dict(body, compliment='계속 스로틀링'), Context('image-throttled'))
+    assert response['statusCode'] == 429, response
+    print(f"[Canvas 스로틀링] -> {response['statusCode']} Retry-After={response['headers']['Retry-After']} "
+          f"(Canvas 호출 {bedrock.calls.count(IMAGE_MODEL)}회, {ms:.1f} ms)")
+
+
+def main():
+    check_unlimited_until_throttle()
+    check_aimd()
+    check_shedding()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        import app
+    check_deadline(app)
+    check_all_throttled(app)
+    check_image_retry(app)
+
+
+if __name__ == '__main__':
+    main()
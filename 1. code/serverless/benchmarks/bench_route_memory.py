@@ -0,0 +1,156 @@
+"""
+라우트 그룹별 메모리 사용량 측정 (함수 분리 시 MemorySize 근거, AWS 없이)
+
+template.yaml의 함수마다(FUNCTION_ROUTES) 새 프로세스를 띄워
+- import app 직후 / 웜업(app.warm_up) 후 / 요청 처리 + 실제 boto3 클라이언트 생성 후의 최대 RSS
+- 웜업 소요시간, 첫 요청 지연시간, 이후 요청당 CPU 시간(user+sys)과 지연시간
+을 측정한다 (--no-warmup이면 웜업 없이 첫 요청이 초기화 비용을 냄). 'single'은 분리 전처럼 한 함수가 모든 경로를 처리하는 경우다.
+Bedrock/S3는 benchmarks/fake_aws.py의 가짜 클라이언트이며, 음성 경로는 사운드 뱅크(python src/handlers/sound_bank.py)가 필요하다.
+
+권장 메모리 = (최대 RSS + Lambda 런타임 여유 RUNTIME_OVERHEAD_MB) * HEADROOM 을 128MB 단위로 올림.
+Lambda는 메모리에 비례해 CPU를 배정하므로(1769MB = vCPU 1개), CPU 시간이 긴 경로는 권장값보다 크게 잡을 수 있다.
+
+실행:
+    python benchmarks/bench_route_memory.py [--requests 10] [--groups voice,text] [--no-warmup] [--json result.json]
+"""
+import argparse
+import json
+import math
+import os
+import resource
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# template.yaml의 함수별 FUNCTION_ROUTES와 같게 유지
+ROUTE_GROUPS = {
+    'single': [],
+    'text': ['/generate/text', '/generate/text/batch'],
+    'image': ['/generate/image', '/generate/image/status'],
+    'voice': ['/generate/voice'],
+    'pipeline': ['/generate/all'],
+}
+# 요청을 보낼 경로 (상태 조회는 job_id가 필요해 제외)
+REQUEST_ROUTES = {
+    '/generate/text': 'text',
+    '/generate/text/batch': 'batch',
+    '/generate/image': 'image',
+    '/generate/voice': 'voice',
+    '/generate/all': 'all',
+}
+RUNTIME_OVERHEAD_MB = 64
+HEADROOM = 1.25
+
+
+def max_rss_mb():
+    # Linux ru_maxrss 단위는 KB
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def recommended_memory_mb(peak_rss_mb):
+    return max(128, int(math.ceil((peak_rss_mb + RUNTIME_OVERHEAD_MB) * HEADROOM / 128)) * 128)
+
+
+def measure(group, requests, warmup=True):
+    """자식 프로세스: FUNCTION_ROUTES가 설정된 상태로 app을 올리고 측정 결과 dict 반환"""
+    sys.path.insert(0, BENCH_DIR)
+    sys.path.insert(0, os.path.join(BENCH_DIR, '..', 'src'))
+    from load_test import install_fakes, load_corpus, make_event, Context
+
+    result = {'group': group, 'baseline_rss_mb': max_rss_mb()}
+    install_fakes(argparse.Namespace(bedrock_latency=0.01, bedrock_jitter=0.0, throttle_rate=0.0, s3_latency=0.0, seed=0))
+
+    import app
+    result['import_rss_mb'] = max_rss_mb()
+
+    result['warmup_ms'] = app.warm_up('bench')['ms'] if warmup else 0.0
+    result['warmup_rss_mb'] = max_rss_mb()
+
+    corpus = load_corpus()
+    routes = [REQUEST_ROUTES[path] for path in app.FUNCTION_ROUTES if path in REQUEST_ROUTES]
+
+    def call(route, index):
+        response = app.lambda_handler(make_event(route, index, corpus), Context(f"{group}-{route}-{index}"))
+        assert response['statusCode'] < 500, f"{group} {route}: {response}"
+
+    # 경로별 첫 요청 (웜업이 없으면 모듈 import/사운드 뱅크/피치 테이블 비용 포함)
+    start = time.perf_counter()
+    for route in routes:
+        call(route, 0)
+    result['first_ms'] = round((time.perf_counter() - start) * 1000 / max(len(routes), 1), 1)
+
+    cpu_start = cpu_seconds()
+    start = time.perf_counter()
+    for index in range(1, requests + 1):
+        for route in routes:
+            call(route, index)
+    count = requests * len(routes)
+    result['requests'] = count
+    result['ms_per_request'] = round((time.perf_counter() - start) * 1000 / count, 1) if count else 0.0
+    result['cpu_ms_per_request'] = round((cpu_seconds() - cpu_start) * 1000 / count, 1) if count else 0.0
+
+    # 가짜 클라이언트는 boto3를 올리지 않으므로 실제 클라이언트를 만들어 그 메모리까지 포함 (자격 증명/네트워크 불필요)
+    import boto3
+    for service in ('bedrock-runtime', 's3'):
+        boto3.client(service, region_name='us-east-1')
+    result['peak_rss_mb'] = max_rss_mb()
+    result['recommended_mb'] = recommended_memory_mb(result['peak_rss_mb'])
+    return result
+
+
+def run_child(group, requests, warmup=True):
+    env = dict(os.environ, FUNCTION_ROUTES=','.join(ROUTE_GROUPS[group]), COLD_START_PROFILE='0')
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    env.setdefault('S3_BUCKET', 'bench-bucket')
+    env.setdefault('METRICS_NAMESPACE', 'QuokkaDiaryBench')
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', group, '--requests', str(requests)]
+        + ([] if warmup else ['--no-warmup']),
+        env=env, capture_output=True, text=True, check=False
+    )
+    if completed.returncode != 0:
+        raise Exception(f"{group} 측정 실패:\n{completed.stderr}")
+    # 핸들러 로그(EMF 등) 뒤의 마지막 줄이 결과
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=10, help='경로당 요청 수')
+    parser.add_argument('--groups', default=','.join(ROUTE_GROUPS))
+    parser.add_argument('--no-warmup', action='store_true', help='웜업 없이 첫 요청부터 측정')
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.requests, warmup=not args.no_warmup)))
+        return
+
+    results = [
+        run_child(group.strip(), args.requests, warmup=not args.no_warmup)
+        for group in args.groups.split(',') if group.strip()
+    ]
+
+    print(f"{'group':10} {'import':>8} {'warmup':>8} {'peak':>8} {'warmup ms':>10} {'first ms':>9} {'ms/req':>8} "
+          f"{'cpu ms/req':>11} {'권장 MB':>8}")
+    for result in results:
+        print(f"{result['group']:10} {result['import_rss_mb']:8.1f} {result['warmup_rss_mb']:8.1f} {result['peak_rss_mb']:8.1f} "
+              f"{result['warmup_ms']:10.1f} {result['first_ms']:9.1f} {result['ms_per_request']:8.1f} "
+              f"{result['cpu_ms_per_request']:11.1f} {result['recommended_mb']:8d}")
+    print(f"(RSS 단위 MB, 권장 = (peak + {RUNTIME_OVERHEAD_MB}) x {HEADROOM} 을 128MB 단위로 올림)")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
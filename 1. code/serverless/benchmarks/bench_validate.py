@@ -0,0 +1,151 @@
+"""
+일기 입력 검증 벤치마크 및 동등성 검증
+
+benchmarks/data/diaries.jsonl 코퍼스로 기존 구현(정규식 매번 조회, 문자 단위 루프, 고정 스팸 목록)과
+handlers.text_validation을 비교한다.
+1. 결과 비교: 스팸 규칙 변경으로 판정이 달라진 항목만 출력 (그 외 차이는 실패)
+2. 처리량 비교: 코퍼스 전체를 반복 검증한 초당 건수
+
+실행:
+    python benchmarks/bench_validate.py
+"""
+import html
+import json
+import os
+import re
+import sys
+import timeit
+
+BASE_DIR = os.path.join(os.path.dirname(__file__), '..')
+sys.path.insert(0, os.path.join(BASE_DIR, 'src'))
+
+from handlers.text_validation import validate_input  # noqa: E402
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'diaries.jsonl')
+
+
+# 간단하고 안전한 스팸 패턴
+SIMPLE_SPAM_CHECKS = ['ㅋㅋㅋㅋㅋ', '!!!!!!', '??????', 'ㅎㅎㅎㅎㅎ']
+
+def legacy_analyze_content_quality(content):
+    """기존 품질 분석"""
+    
+    # 1. 기본 검증
+    if not content or not isinstance(content, str):
+        return "error", "잘못된 입력"
+    
+    content_clean = content.strip()
+    if not content_clean:
+        return "empty", "빈 내용"
+    
+    try:
+        # 2. 간단한 문자 수 계산 (정규식 없이)
+        char_count = 0
+        for char in content_clean:
+            if ('가' <= char <= '힣') or char.isalnum():
+                char_count += 1
+        
+        # 3. 단순 문자열 스팸 검사
+        for spam_pattern in SIMPLE_SPAM_CHECKS:
+            if spam_pattern in content_clean:
+                return "spam", "무의미한 반복 패턴 감지"
+        
+        # 4. 길이 기반 등급
+        if char_count > 80:
+            return "high", "상세한 내용"
+        elif char_count > 30:
+            return "medium", "적당한 내용"
+        elif char_count < 10:
+            return "low", "내용이 너무 짧습니다"
+        else:
+            return "medium", "적당한 내용"
+            
+    except Exception as e:
+        # 최종 안전망 - 기본값 반환
+        return "medium", "기본 품질"
+
+def legacy_validate_input(user_type, content):
+    """기존 입력 검증"""
+    if not isinstance(user_type, str) or not isinstance(content, str):
+        return "입력값은 문자열이어야 합니다", None, None
+
+    if not user_type or user_type.lower() not in ['t', 'f']:
+        return "사용자 타입은 't' 또는 'f'여야 합니다", None, None
+
+    # 안전한 HTML 처리 (간단한 태그 제거)
+    try:
+        content_clean = html.unescape(content)
+        content_clean = re.sub(r'<[^>]*?>', '', content_clean)
+        content_clean = re.sub(r'\s+', ' ', content_clean).strip()
+    except Exception:
+        content_clean = content.strip()
+
+    # 기본 길이 검증
+    if len(content_clean.replace(' ', '')) < 10:
+        return "일기 내용은 공백을 제외하고 최소 10자 이상이어야 합니다", None, None
+
+    if len(content_clean) > 1000:
+        return "일기 내용은 최대 1000자까지 입력 가능합니다", None, None
+
+    # 의미있는 내용 검증
+    if not re.search(r'[가-힣a-zA-Z]', content_clean):
+        return "의미있는 내용을 입력해주세요 (한글 또는 영문 포함)", None, None
+
+    # 간단한 개인정보 체크
+    if re.search(r'01[0-9][-\s]?\d{3,4}[-\s]?\d{4}', content_clean):
+        return "개인정보 보호를 위해 전화번호는 입력하지 말아주세요", None, None
+    
+    if re.search(r'\S+@\S+\.\S+', content_clean):
+        return "개인정보 보호를 위해 이메일은 입력하지 말아주세요", None, None
+
+    # 품질 분석 수행
+    quality_level, quality_reason = legacy_analyze_content_quality(content_clean)
+    
+    # 스팸으로 판정된 경우 거부
+    if quality_level == "spam":
+        return quality_reason, None, None
+
+    return None, content_clean, quality_level
+
+
+def load_corpus():
+    with open(CORPUS_PATH, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(corpus):
+    spam_changes = 0
+    for entry in corpus:
+        old = legacy_validate_input(entry['type'], entry['content'])
+        new = validate_input(entry['type'], entry['content'])
+        if old == new:
+            continue
+        spam_rule = '반복 패턴' in (old[0] or '') or '반복 패턴' in (new[0] or '')
+        assert spam_rule, f"결과 불일치: {entry['content'][:30]!r} {old} != {new}"
+        spam_changes += 1
+        print(f"  스팸 규칙 차이: {entry['content'][:30]!r} 기존={old[0] or old[2]} 신규={new[0] or new[2]}")
+    print(f"결과 비교: {len(corpus)}건 중 스팸 규칙 차이 {spam_changes}건, 그 외 동일")
+
+
+def throughput(func, corpus, number):
+    def run():
+        for entry in corpus:
+            func(entry['type'], entry['content'])
+    elapsed = timeit.timeit(run, number=number)
+    return len(corpus) * number / elapsed
+
+
+def main():
+    corpus = load_corpus()
+    compare(corpus)
+
+    number = 500
+    legacy = throughput(legacy_validate_input, corpus, number)
+    compiled = throughput(validate_input, corpus, number)
+    print(f"{len(corpus)}건 x {number}회")
+    print(f"  기존 구현: {legacy:10,.0f} 건/s")
+    print(f"  컴파일 검증기: {compiled:10,.0f} 건/s ({compiled / legacy:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
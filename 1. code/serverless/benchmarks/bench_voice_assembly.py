@@ -0,0 +1,82 @@
+"""
+음성 조립 벤치마크: 기존 AudioSegment.__add__ 루프 vs voice_engine.assemble
+
+실제 사운드 뱅크 없이도 돌 수 있도록 뱅크와 같은 포맷(16bit mono 44.1kHz)의
+합성 클립을 사용한다. 칭찬 길이가 늘어날 때 글자당 시간이 일정하면 선형이다.
+
+실행:
+    python benchmarks/bench_voice_assembly.py
+"""
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from handlers.voice_engine import assemble  # noqa: E402
+
+try:
+    from pydub import AudioSegment
+    PYDUB_AVAILABLE = True
+except ImportError:
+    PYDUB_AVAILABLE = False
+
+FRAME_RATE = 44100
+CLIP_SAMPLES = 20000  # 실제 클립 평균 길이 (~0.45초)
+LENGTHS = [25, 50, 100, 150, 300]
+REPEAT = 3
+
+
+def make_clips(count=20):
+    rng = np.random.default_rng(0)
+    return [rng.integers(-8000, 8000, CLIP_SAMPLES, dtype=np.int16) for _ in range(count)]
+
+
+def make_plan(clips, length):
+    rng = random.Random(length)
+    plan = []
+    for _ in range(length):
+        octaves = 2 * rng.uniform(0.96, 1.15)
+        plan.append((rng.choice(clips), int(FRAME_RATE * (2.0 ** octaves))))
+    return plan
+
+
+def legacy_assemble(plan):
+    """기존 generate_voice_file 루프 (매 글자마다 전체 버퍼 복사)"""
+    result_sound = None
+    for samples, rate in plan:
+        char_sound = AudioSegment(data=samples.tobytes(), sample_width=2, frame_rate=FRAME_RATE, channels=1)
+        pitch_char_sound = char_sound._spawn(char_sound.raw_data, overrides={'frame_rate': rate})
+        result_sound = pitch_char_sound if result_sound is None else result_sound + pitch_char_sound
+    return result_sound
+
+
+def engine_assemble(plan):
+    output_rate = max(rate for _, rate in plan)
+    return assemble(plan, output_rate)
+
+
+def best_of(func, plan):
+    best = float('inf')
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        func(plan)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    clips = make_clips()
+    print(f"{'chars':>6} {'legacy ms':>10} {'engine ms':>10} {'engine us/char':>15}")
+    for length in LENGTHS:
+        plan = make_plan(clips, length)
+        legacy_ms = best_of(legacy_assemble, plan) if PYDUB_AVAILABLE else float('nan')
+        engine_ms = best_of(engine_assemble, plan)
+        print(f"{length:>6} {legacy_ms:>10.1f} {engine_ms:>10.1f} {engine_ms * 1000 / length:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+라우트별 콜드 스타트 import 비용 검사 (CI 예산 가드)
+
+라우트마다 새 인터프리터에서 app을 import하고 load_route(path)를 호출하여,
+handlers.cold_start가 남기는 JSON 프로파일의 import_ms를 cold_start_budget.json의 예산과 비교한다.
+여러 번 실행한 중앙값이 예산을 넘으면 종료 코드 1로 실패한다.
+
+실행:
+    python benchmarks/check_cold_start.py [--runs 3] [--budget benchmarks/cold_start_budget.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, '..', 'src')
+DEFAULT_BUDGET = os.path.join(BENCH_DIR, 'cold_start_budget.json')
+
+PROBE = """
+import time
+start = time.perf_counter()
+import app
+app_ms = (time.perf_counter() - start) * 1000
+app.load_route({path!r})
+print('APP_IMPORT_MS', app_ms)
+"""
+
+
+def measure_route(path):
+    """한 번의 콜드 스타트: (app import ms, 라우트 프로파일 dict)"""
+    env = dict(os.environ, COLD_START_PROFILE='1')
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE.format(path=path)],
+        cwd=SRC_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+    app_ms, profile = None, None
+    for line in result.stdout.splitlines():
+        if line.startswith('APP_IMPORT_MS'):
+            app_ms = float(line.split()[1])
+        elif line.startswith('{'):
+            record = json.loads(line)
+            if record.get('event') == 'cold_start':
+                profile = record
+    return app_ms, profile
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--budget', default=DEFAULT_BUDGET)
+    args = parser.parse_args()
+
+    with open(args.budget, encoding='utf-8') as f:
+        budget = json.load(f)
+
+    failures = []
+    app_ms_all = []
+    for path, limit_ms in budget['routes'].items():
+        samples = [measure_route(path) for _ in range(args.runs)]
+        app_ms_all.extend(app_ms for app_ms, _ in samples)
+        route_ms = statistics.median(profile['import_ms'] for _, profile in samples)
+        top = samples[-1][1]['top_modules'][:3]
+
+        status = 'OK' if route_ms <= limit_ms else 'OVER'
+        print(f"{status:4} {path:26} {route_ms:8.1f} ms (budget {limit_ms} ms) "
+              f"top: {', '.join(m['module'] for m in top)}")
+        if route_ms > limit_ms:
+            failures.append(path)
+
+    app_ms = statistics.median(app_ms_all)
+    status = 'OK' if app_ms <= budget['app_import_ms'] else 'OVER'
+    print(f"{status:4} {'import app':26} {app_ms:8.1f} ms (budget {budget['app_import_ms']} ms)")
+    if app_ms > budget['app_import_ms']:
+        failures.append('import app')
+
+    if failures:
+        print(f"콜드 스타트 예산 초과: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
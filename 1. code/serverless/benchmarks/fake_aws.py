@@ -0,0 +1,164 @@
+"""
+로컬 가짜 AWS 클라이언트 (벤치마크/로컬 검증용)
+
+handlers.aws_clients.register_client()로 등록해 실제 AWS 없이 핸들러를 실행한다.
+- FakeBedrockRuntime: 모델별 지연시간, 스로틀링 비율, 실패 횟수를 지정해 Nova 형식 응답을 반환
+- FakeS3: 메모리 dict에 객체를 저장 (처음 fail_puts번 PUT 실패, lose_acks번은 저장 후 실패 응답)
+
+예:
+    from handlers.aws_clients import register_client
+    register_client('bedrock-runtime', FakeBedrockRuntime({'amazon.nova-micro-v1:0': ModelBehavior(throttle_rate=1.0)}))
+"""
+import io
+import json
+import random
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+
+def client_error(code, operation, status=400, message=None):
+    return ClientError(
+        {'Error': {'Code': code, 'Message': message or code}, 'ResponseMetadata': {'HTTPStatusCode': status}},
+        operation
+    )
+
+
+class ModelBehavior:
+    """
+    가짜 모델 동작: latency(초) + 0~jitter 무작위 추가, throttle_rate 확률로 ThrottlingException,
+    처음 fail_first번은 ServiceUnavailableException
+    """
+
+    def __init__(self, latency=0.05, jitter=0.0, throttle_rate=0.0, fail_first=0, text='오늘도 잘 해냈구나, 정말 멋져 🌷'):
+        self.latency = latency
+        self.jitter = jitter
+        self.throttle_rate = throttle_rate
+        self.fail_first = fail_first
+        self.text = text
+
+
+class FakeBedrockRuntime:
+    def __init__(self, behaviors=None, default=None, seed=0):
+        self.behaviors = behaviors or {}
+        self.default = default or ModelBehavior()
+        self.calls = []
+        self._failures = {}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _behave(self, model_id, operation):
+        behavior = self.behaviors.get(model_id, self.default)
+        with self._lock:
+            self.calls.append(model_id)
+            failed = self._failures.get(model_id, 0)
+            if failed < behavior.fail_first:
+                self._failures[model_id] = failed + 1
+                raise client_error('ServiceUnavailableException', operation, 503)
+            throttled = self._rng.random() < behavior.throttle_rate
+            delay = behavior.latency + self._rng.random() * behavior.jitter
+
+        time.sleep(delay)
+        if throttled:
+            raise client_error('ThrottlingException', operation, 429, 'Too many requests')
+        return behavior
+
+    def invoke_model(self, modelId, body, contentType=None, accept=None):
+        behavior = self._behave(modelId, 'InvokeModel')
+        request = json.loads(body)
+
+        if 'taskType' in request:
+            # Nova Canvas 이미지 응답 (1x1 PNG)
+            png = ('iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mP8z8BQDwAEhQGAhKmMIQAAAABJRU5ErkJggg==')
+            payload = {'images': [png]}
+        else:
+            prompt_chars = sum(len(block.get('text', '')) for block in request['messages'][0]['content'])
+            payload = {
+                'output': {'message': {'role': 'assistant', 'content': [{'text': behavior.text}]}},
+                'usage': {'inputTokens': prompt_chars, 'outputTokens': len(behavior.text)}
+            }
+        return {'body': io.BytesIO(json.dumps(payload).encode('utf-8'))}
+
+    def invoke_model_with_response_stream(self, modelId, body, contentType=None, accept=None):
+        behavior = self._behave(modelId, 'InvokeModelWithResponseStream')
+        chunks = [
+            {'contentBlockDelta': {'delta': {'text': behavior.text[i:i + 4]}}}
+            for i in range(0, len(behavior.text), 4)
+        ]
+        chunks.append({'metadata': {'usage': {'inputTokens': 0, 'outputTokens': len(behavior.text)}}})
+        return {'body': [{'chunk': {'bytes': json.dumps(chunk).encode('utf-8')}} for chunk in chunks]}
+
+
+class FakeS3:
+    def __init__(self, latency=0.0, fail_puts=0, lose_acks=0):
+        self.latency = latency
+        self.fail_puts = fail_puts
+        self.lose_acks = lose_acks
+        self.puts = 0
+        self.objects = {}
+        self._lock = threading.Lock()
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self._wait()
+        data = Body.encode('utf-8') if isinstance(Body, str) else bytes(Body)
+        with self._lock:
+            self.puts += 1
+            if self.fail_puts:
+                self.fail_puts -= 1
+                raise client_error('SlowDown', 'PutObject', 503)
+            self.objects[(Bucket, Key)] = {'Body': data, **kwargs}
+            if self.lose_acks:
+                # 저장은 됐지만 클라이언트는 실패로 보는 경우
+                self.lose_acks -= 1
+                raise client_error('RequestTimeout', 'PutObject', 500)
+        return {}
+
+    def upload_fileobj(self, fileobj, bucket, key, ExtraArgs=None):
+        self.put_object(bucket, key, fileobj.read(), **(ExtraArgs or {}))
+
+    def get_object(self, Bucket, Key):
+        self._wait()
+        with self._lock:
+            obj = self.objects.get((Bucket, Key))
+        if obj is None:
+            raise client_error('NoSuchKey', 'GetObject', 404)
+        return {'Body': io.BytesIO(obj['Body']), 'ContentLength': len(obj['Body'])}
+
+    def head_object(self, Bucket, Key):
+        self._wait()
+        with self._lock:
+            obj = self.objects.get((Bucket, Key))
+        if obj is None:
+            raise client_error('404', 'HeadObject', 404)
+        return {'ContentLength': len(obj['Body'])}
+
+    def copy_object(self, Bucket, Key, CopySource, **kwargs):
+        self._wait()
+        with self._lock:
+            source = self.objects.get((CopySource['Bucket'], CopySource['Key']))
+            if source is None:
+                raise client_error('NoSuchKey', 'CopyObject', 404)
+            self.objects[(Bucket, Key)] = {**source, **kwargs}
+        return {}
+
+    def list_objects_v2(self, Bucket, Prefix='', ContinuationToken=None, StartAfter=None, MaxKeys=1000):
+        with self._lock:
+            keys = sorted(key for bucket, key in self.objects if bucket == Bucket and key.startswith(Prefix))
+        after = ContinuationToken or StartAfter
+        if after:
+            keys = [key for key in keys if key > after]
+        page = keys[:MaxKeys]
+        response = {'Contents': [{'Key': key} for key in page], 'KeyCount': len(page)}
+        if len(keys) > MaxKeys:
+            response.update(IsTruncated=True, NextContinuationToken=page[-1])
+        else:
+            response['IsTruncated'] = False
+        return response
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn=3600):
+        return f"https://{Params['Bucket']}.s3.local/{Params['Key']}?expires={ExpiresIn}"
@@ -0,0 +1,220 @@
+"""
+오프라인 부하 테스트 (AWS 없이 app.lambda_handler 직접 호출)
+
+Bedrock/S3를 benchmarks/fake_aws.py의 가짜 클라이언트(지연시간/스로틀링 설정 가능)로 바꾸고,
+benchmarks/data/diaries.jsonl 일기 코퍼스로 라우트별 요청을 지정한 동시성으로 보낸다.
+라우트마다 첫 요청(콜드)은 따로 재고, 나머지 요청의 p50/p95/p99 지연시간, 처리량(req/s),
+오류(5xx 또는 200인데 voice_url/image_url이 null) 수, 429(속도 제한) 수, 최대 메모리(tracemalloc 최대 할당량, 프로세스 max RSS)를 출력한다.
+
+--budget을 주면 perf_budget.json의 라우트별 p95/오류 한도와 비교해 넘으면 종료 코드 1로 실패한다 (CI용).
+
+실행:
+    python benchmarks/load_test.py [--routes text,all] [--requests 40] [--concurrency 8]
+        [--bedrock-latency 0.2] [--bedrock-jitter 0.1] [--throttle-rate 0.05] [--s3-latency 0.02]
+        [--json result.json] [--budget benchmarks/perf_budget.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCH_DIR, '..', 'src')
+sys.path.insert(0, SRC_DIR)
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('S3_BUCKET', 'load-test-bucket')
+os.environ.setdefault('METRICS_NAMESPACE', 'QuokkaDiaryLoadTest')
+os.environ.setdefault('COLD_START_PROFILE', '0')
+
+from fake_aws import FakeBedrockRuntime, FakeS3, ModelBehavior  # noqa: E402
+from handlers.aws_clients import register_client  # noqa: E402
+from handlers.tracing import percentile  # noqa: E402
+
+CORPUS_PATH = os.path.join(BENCH_DIR, 'data', 'diaries.jsonl')
+DEFAULT_BUDGET = os.path.join(BENCH_DIR, 'perf_budget.json')
+
+ROUTE_PATHS = {
+    'text': '/generate/text',
+    'batch': '/generate/text/batch',
+    'image': '/generate/image',
+    'voice': '/generate/voice',
+    'all': '/generate/all',
+}
+
+# 200 응답이라도 이 필드가 null이면 미디어 생성이 실패한 것이므로 오류로 센다
+MEDIA_URL_FIELDS = ('voice_url', 'image_url')
+
+
+class Context:
+    """Lambda context 대용 (aws_request_id만 사용)"""
+
+    def __init__(self, request_id):
+        self.aws_request_id = request_id
+
+
+def load_corpus(path=CORPUS_PATH):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def make_event(route, index, corpus):
+    """라우트별 요청 이벤트 (index마다 다른 일기/칭찬이라 결과 캐시에 걸리지 않음)"""
+    entry = corpus[index % len(corpus)]
+    compliment = f"{entry['content'][:40]} 정말 잘했어요 {index}"
+    if route == 'text':
+        body = {'type': entry['type'], 'content': entry['content']}
+    elif route == 'batch':
+        body = {'entries': [corpus[(index + offset) % len(corpus)] for offset in range(3)]}
+    elif route == 'all':
+        body = {'type': entry['type'], 'content': entry['content']}
+    else:
+        body = {'diary_id': f"diary-load-{index}", 'compliment': compliment}
+    return {'httpMethod': 'POST', 'path': ROUTE_PATHS[route], 'body': json.dumps(body, ensure_ascii=False)}
+
+
+def install_fakes(args):
+    bedrock = FakeBedrockRuntime(
+        default=ModelBehavior(latency=args.bedrock_latency, jitter=args.bedrock_jitter, throttle_rate=args.throttle_rate),
+        seed=args.seed
+    )
+    s3 = FakeS3(latency=args.s3_latency)
+    # 핸들러는 기본 리전과 us-east-1 고정 리전 클라이언트를 모두 사용
+    for region in (None, 'us-east-1'):
+        register_client('bedrock-runtime', bedrock, region)
+        register_client('s3', s3, region)
+    return bedrock, s3
+
+
+def missing_media(response):
+    """200 응답 본문에 null인 voice_url/image_url이 있으면 True"""
+    try:
+        body = json.loads(response.get('body') or '{}')
+    except (TypeError, ValueError):
+        return True
+    return isinstance(body, dict) and any(field in body and body[field] is None for field in MEDIA_URL_FIELDS)
+
+
+def call(app, event, request_id):
+    """(지연시간 ms, 상태 코드, 오류 여부) 반환"""
+    start = time.perf_counter()
+    try:
+        response = app.lambda_handler(event, Context(request_id))
+        status = response.get('statusCode', 500)
+        failed = status >= 500 or (status == 200 and missing_media(response))
+    except Exception:
+        status, failed = 500, True
+    return (time.perf_counter() - start) * 1000, status, failed
+
+
+def run_route(app, route, args, corpus):
+    """콜드(첫) 요청 1건 + 본 요청 args.requests건을 args.concurrency 동시성으로 실행"""
+    cold_ms, _, cold_failed = call(app, make_event(route, 0, corpus), f"{route}-cold")
+
+    if tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(
+            lambda index: call(app, make_event(route, index, corpus), f"{route}-{index}"),
+            range(1, args.requests + 1)
+        ))
+    wall = time.perf_counter() - start
+
+    latencies = [ms for ms, _, _ in results]
+    errors = sum(1 for _, _, failed in results if failed) + int(cold_failed)
+    return {
+        'route': ROUTE_PATHS[route],
+        'requests': len(results),
+        'concurrency': args.concurrency,
+        'cold_ms': round(cold_ms, 1),
+        'p50_ms': round(percentile(latencies, 0.50), 1),
+        'p95_ms': round(percentile(latencies, 0.95), 1),
+        'p99_ms': round(percentile(latencies, 0.99), 1),
+        'throughput_rps': round(len(results) / wall, 1),
+        'errors': errors,
+        'rate_limited': sum(1 for _, status, _ in results if status == 429),
+        'peak_alloc_mb': round(tracemalloc.get_traced_memory()[1] / 1048576, 1) if tracemalloc.is_tracing() else None,
+        # Linux ru_maxrss 단위는 KB
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'rss_growth_mb': round((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024, 1)
+    }
+
+
+def check_budget(results, budget_path):
+    with open(budget_path, encoding='utf-8') as f:
+        budget = json.load(f)['load_test']
+
+    failures = []
+    for result in results:
+        limits = budget['routes'].get(result['route'])
+        if limits is None:
+            continue
+        if result['p95_ms'] > limits['p95_ms']:
+            failures.append(f"{result['route']} p95 {result['p95_ms']} ms > {limits['p95_ms']} ms")
+        if result['errors'] > limits.get('max_errors', 0):
+            failures.append(f"{result['route']} 오류 {result['errors']}건 > {limits.get('max_errors', 0)}건")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--routes', default='text,batch,image,voice,all')
+    parser.add_argument('--requests', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--bedrock-latency', type=float, default=0.2)
+    parser.add_argument('--bedrock-jitter', type=float, default=0.1)
+    parser.add_argument('--throttle-rate', type=float, default=0.0)
+    parser.add_argument('--s3-latency', type=float, default=0.02)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-tracemalloc', action='store_true', help='할당 추적 오버헤드 없이 지연시간만 측정')
+    parser.add_argument('--json', help='결과를 JSON 파일로 저장')
+    parser.add_argument('--budget', nargs='?', const=DEFAULT_BUDGET, help='perf_budget.json 한도와 비교')
+    parser.add_argument('--verbose', action='store_true', help='핸들러 로그(EMF 등)를 그대로 출력')
+    args = parser.parse_args()
+
+    routes = [route.strip() for route in args.routes.split(',') if route.strip()]
+    corpus = load_corpus()
+    bedrock, _ = install_fakes(args)
+
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+
+    # 핸들러의 print/EMF 로그는 기본적으로 버림 (결과 표만 출력)
+    sink = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    results = []
+    with sink:
+        import app
+        for route in routes:
+            results.append(run_route(app, route, args, corpus))
+
+    print(f"가짜 Bedrock {args.bedrock_latency * 1000:.0f}±{args.bedrock_jitter * 1000:.0f} ms "
+          f"(스로틀링 {args.throttle_rate:.0%}), 가짜 S3 {args.s3_latency * 1000:.0f} ms, "
+          f"동시성 {args.concurrency}, 라우트당 {args.requests}건, Bedrock 호출 {len(bedrock.calls)}회")
+    print(f"{'route':24} {'cold':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>7} {'err':>4} {'429':>4} {'peak MB':>8} {'rss MB':>7}")
+    for result in results:
+        print(f"{result['route']:24} {result['cold_ms']:8.1f} {result['p50_ms']:8.1f} {result['p95_ms']:8.1f} "
+              f"{result['p99_ms']:8.1f} {result['throughput_rps']:7.1f} {result['errors']:4d} {result['rate_limited']:4d} "
+              f"{result['peak_alloc_mb'] if result['peak_alloc_mb'] is not None else '-':>8} {result['max_rss_mb']:7.1f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'config': vars(args), 'results': results}, f, ensure_ascii=False, indent=2)
+
+    if args.budget:
+        failures = check_budget(results, args.budget)
+        if failures:
+            print('부하 테스트 예산 초과:\n  ' + '\n  '.join(failures))
+            sys.exit(1)
+        print('부하 테스트 예산 통과')
+
+
+if __name__ == '__main__':
+    main()
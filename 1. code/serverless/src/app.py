@@ -1,12 +1,111 @@
 import json
-from handlers.text_handler import handle_generate_text
-from handlers.image_handler import handle_generate_image
-from handlers.voice_handler import handle_generate_voice
+import os
+import resource
+import sys
+import time
+from handlers.cold_start import import_with_profile
+from handlers.tracing import trace_request, stage, next_invocation_is_cold
+from handlers.rate_limiter import request_deadline
+
+# 경로별 (모듈, 핸들러 함수) - 모듈은 해당 경로가 처음 호출될 때 import
+ROUTES = {
+    '/generate/text': ('handlers.text_handler', 'handle_generate_text'),
+    '/generate/text/batch': ('handlers.text_handler', 'handle_generate_text_batch'),
+    '/generate/image': ('handlers.image_handler', 'handle_generate_image'),
+    '/generate/image/status': ('handlers.image_handler', 'handle_image_job_status'),
+    '/generate/voice': ('handlers.voice_handler', 'handle_generate_voice'),
+    '/generate/all': ('handlers.pipeline_handler', 'handle_generate_all'),
+}
+
+# 이 함수가 처리할 경로 (쉼표 구분, 비우면 전체)
+# 라우트 그룹마다 함수를 따로 배포할 때(template.yaml) 지정하며, 웜업도 이 경로들의 모듈만 올린다
+FUNCTION_ROUTES = [path.strip() for path in os.environ.get('FUNCTION_ROUTES', '').split(',') if path.strip()] or list(ROUTES)
+_unknown_routes = [path for path in FUNCTION_ROUTES if path not in ROUTES]
+if _unknown_routes:
+    raise Exception(f"Unknown FUNCTION_ROUTES: {', '.join(_unknown_routes)}")
+
+_route_handlers = {}
+
+def load_route(path):
+    """경로의 핸들러 함수 반환 (첫 호출 시 모듈 import + 콜드 스타트 프로파일 로그)"""
+    handler = _route_handlers.get(path)
+    if handler is None:
+        module_name, func_name = ROUTES[path]
+        with stage('module_import', module=module_name):
+            module, _ = import_with_profile(module_name, route=path)
+        handler = _route_handlers[path] = getattr(module, func_name)
+    return handler
+
+def body_size(body):
+    if isinstance(body, str):
+        return len(body.encode('utf-8'))
+    return len(body) if isinstance(body, bytes) else 0
+
+def run_route(path, event, headers, context):
+    """
+    라우트 핸들러 실행 (요청 단위 Trace: 단계별 지연시간, 콜드 스타트, 요청/응답 크기)
+    Bedrock 호출은 Lambda 남은 실행 시간 안에서만 토큰을 기다림 (request_deadline)
+    """
+    request_id = getattr(context, 'aws_request_id', None)
+    with trace_request(path, request_id=request_id, request_bytes=body_size(event.get('body'))) as trace, \
+            request_deadline(context):
+        response = load_route(path)(event, headers)
+        trace.status = response.get('statusCode')
+        trace.set_size('response', body_size(response.get('body')))
+    return response
+
+def warm_up(reason):
+    """
+    이 함수의 경로 모듈을 import하고 모듈별 warm_up()으로 무거운 상태(사운드 뱅크, 피치 테이블, AWS 클라이언트)를 미리 올림
+    - {"warmup": true} 이벤트: EventBridge 스케줄 keep-alive (이미 올라간 컨테이너에서는 거의 비용 없음)
+    - 프로비저닝된 동시성 컨테이너의 초기화 단계 (아래 모듈 로드 시점)
+    """
+    start = time.perf_counter()
+    # 웜업으로 import가 끝났으므로 이후 첫 요청은 cold로 집계하지 않음
+    cold = next_invocation_is_cold()
+    modules = {}
+    for path in FUNCTION_ROUTES:
+        module_name = ROUTES[path][0]
+        if module_name in modules:
+            continue
+        load_route(path)
+        module_warm_up = getattr(sys.modules[module_name], 'warm_up', None)
+        modules[module_name] = module_warm_up() if module_warm_up else None
+
+    report = {
+        'event': 'warmup',
+        'reason': reason,
+        'cold': cold,
+        'routes': FUNCTION_ROUTES,
+        'ms': round((time.perf_counter() - start) * 1000, 1),
+        'modules': modules,
+        # Linux ru_maxrss 단위는 KB
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }
+    print(json.dumps(report, ensure_ascii=False))
+    return report
+
+def run_worker_job(message, context=None):
+    """비동기 작업 이벤트 처리 (작업 종류별 러너는 이미지 모듈에 정의)"""
+    with trace_request('job', request_id=getattr(context, 'aws_request_id', None)) as trace, request_deadline(context):
+        image_module, _ = import_with_profile('handlers.image_handler', route='job')
+        jobs_module, _ = import_with_profile('handlers.jobs', route='job')
+        job = jobs_module.run_job(message, image_module.JOB_RUNNERS)
+        trace.annotate(job_id=message.get('job_id'), job_status=(job or {}).get('status'))
+        trace.status = 200 if job and job.get('status') == jobs_module.STATUS_SUCCEEDED else 500
+    return job
 
 def lambda_handler(event, context):
     """
     API Gateway에서 호출되는 메인 핸들러
+    (비동기 작업 이벤트 {'job': {...}}는 워커로 처리)
     """
+    if event.get('warmup'):
+        return warm_up('event')
+    
+    if 'job' in event:
+        return run_worker_job(event['job'], context)
+    
     try:
         # CORS 헤더
         headers = {
@@ -27,12 +126,8 @@ def lambda_handler(event, context):
         # 경로별 라우팅
         path = event.get('path', '')
         
-        if path == '/generate/text':
-            return handle_generate_text(event, headers)
-        elif path == '/generate/image':
-            return handle_generate_image(event, headers)
-        elif path == '/generate/voice':
-            return handle_generate_voice(event, headers)
+        if path in ROUTES and path in FUNCTION_ROUTES:
+            return run_route(path, event, headers, context)
         else:
             return {
                 'statusCode': 404,
@@ -47,3 +142,10 @@ def lambda_handler(event, context):
             'headers': headers,
             'body': json.dumps({'error': str(e)})
         }
+
+# 프로비저닝된 동시성 컨테이너는 요청 전에 초기화되므로 그때 미리 웜업 (초기화 시간은 요청 지연시간에 포함되지 않음)
+if os.environ.get('AWS_LAMBDA_INITIALIZATION_TYPE') == 'provisioned-concurrency' or os.environ.get('WARMUP_ON_INIT') == 'true':
+    try:
+        warm_up('init')
+    except Exception as e:
+        print(f"Warm-up error: {str(e)}")
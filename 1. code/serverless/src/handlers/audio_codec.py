@@ -0,0 +1,94 @@
+"""
+음성 인코딩 (메모리 버퍼)
+
+합성된 PCM 샘플을 디스크를 거치지 않고 BytesIO로 인코딩한다.
+WAV는 표준 라이브러리 wave로 헤더와 PCM을 바로 쓰고,
+압축 포맷(mp3/ogg-opus)은 ffmpeg를 파이프로 호출한다 (/tmp 미사용).
+Lambda 기본 런타임에는 ffmpeg가 없으므로, 압축 포맷은 ffmpeg가 있는 환경(레이어 등)에서만 받는다 (supported_formats).
+"""
+import io
+import shutil
+import subprocess
+import wave
+
+AUDIO_FORMATS = {
+    'wav': {
+        'content_type': 'audio/wav',
+        'extension': 'wav'
+    },
+    'mp3': {
+        'content_type': 'audio/mpeg',
+        'extension': 'mp3',
+        'ffmpeg_args': ['-f', 'mp3', '-c:a', 'libmp3lame', '-b:a', '48k']
+    },
+    'ogg': {
+        'content_type': 'audio/ogg',
+        'extension': 'ogg',
+        'ffmpeg_args': ['-f', 'ogg', '-c:a', 'libopus', '-b:a', '24k']
+    }
+}
+DEFAULT_AUDIO_FORMAT = 'wav'
+
+_ffmpeg = None
+_ffmpeg_checked = False
+
+
+def ffmpeg_path():
+    """ffmpeg 실행 파일 경로 (없으면 None, 컨테이너 수명 동안 한 번만 찾음)"""
+    global _ffmpeg, _ffmpeg_checked
+    if not _ffmpeg_checked:
+        _ffmpeg = shutil.which('ffmpeg')
+        _ffmpeg_checked = True
+    return _ffmpeg
+
+
+def supported_formats():
+    """이 환경에서 실제로 인코딩할 수 있는 포맷 (압축 포맷은 ffmpeg가 있을 때만)"""
+    return [name for name, spec in AUDIO_FORMATS.items() if 'ffmpeg_args' not in spec or ffmpeg_path()]
+
+
+def encode_wav(samples, frame_rate, channels=1):
+    """16bit PCM 샘플(numpy 배열)을 WAV 헤더와 함께 메모리 버퍼에 기록"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(channels)
+        wav_file.setsampwidth(samples.itemsize)
+        wav_file.setframerate(frame_rate)
+        wav_file.writeframes(memoryview(samples).cast('B'))
+    buffer.seek(0)
+    return buffer
+
+
+def encode_compressed(samples, frame_rate, channels, audio_format):
+    """ffmpeg 파이프(stdin -> stdout)로 압축 포맷 인코딩"""
+    ffmpeg = ffmpeg_path()
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg를 찾을 수 없습니다")
+
+    result = subprocess.run(
+        [
+            ffmpeg, '-nostdin', '-loglevel', 'error',
+            '-f', f"s{samples.itemsize * 8}le", '-ar', str(frame_rate), '-ac', str(channels),
+            '-i', 'pipe:0',
+            *AUDIO_FORMATS[audio_format]['ffmpeg_args'],
+            'pipe:1'
+        ],
+        input=memoryview(samples).cast('B'),
+        capture_output=True,
+        check=True
+    )
+    return io.BytesIO(result.stdout)
+
+
+def encode_audio(samples, frame_rate, channels=1, audio_format=DEFAULT_AUDIO_FORMAT):
+    """
+    요청 포맷으로 인코딩하여 (buffer, 실제 포맷) 반환
+    압축 인코딩이 실패하면(ffmpeg 오류 등) WAV로 대체
+    """
+    if audio_format != 'wav':
+        try:
+            return encode_compressed(samples, frame_rate, channels, audio_format), audio_format
+        except (RuntimeError, OSError, subprocess.CalledProcessError) as e:
+            print(f"{audio_format} 인코딩 실패, wav로 대체: {e}")
+
+    return encode_wav(samples, frame_rate, channels), 'wav'
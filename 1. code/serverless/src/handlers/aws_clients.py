@@ -0,0 +1,90 @@
+"""
+AWS 클라이언트 공용 레지스트리
+
+핸들러 모듈마다 import 시점에 boto3 클라이언트를 만들면, 어떤 라우트가 호출되든
+콜드 스타트가 모든 클라이언트 생성 비용을 낸다. 여기서는 (service, region) 별로
+처음 사용할 때 한 번만 만들고 컨테이너 수명 동안 재사용한다.
+
+- keep-alive, 커넥션 풀 크기, adaptive 재시도를 한 곳에서 설정
+  (bedrock-runtime은 handlers.rate_limiter가 모델별로 재시도/속도 제한을 하므로 botocore 재시도를 끔)
+- bedrock-runtime 읽기 제한 시간은 botocore 기본값(60초) 대신 Lambda 제한 시간(30초) 안으로 두고,
+  get_client(..., read_timeout=초)로 호출별 제한 시간(모델별 제한 시간 등)을 가진 클라이언트를 따로 받을 수 있음
+  (제한 시간마다 클라이언트 하나, 정수 초로 넘겨 개수를 제한)
+- register_client()로 테스트/로컬 스텁 클라이언트(botocore Stubber 등)를 끼워 넣을 수 있음
+- 엔드포인트만 바꾸려면 boto3 표준 환경 변수(AWS_ENDPOINT_URL, AWS_ENDPOINT_URL_S3 등)를 사용
+"""
+import os
+import threading
+
+# 동시에 여러 요청(병렬 생성 등)이 같은 클라이언트를 쓰므로 기본값(10)보다 넉넉하게
+MAX_POOL_CONNECTIONS = int(os.environ.get('AWS_MAX_POOL_CONNECTIONS', '25'))
+MAX_RETRY_ATTEMPTS = int(os.environ.get('AWS_MAX_RETRY_ATTEMPTS', '3'))
+CONNECT_TIMEOUT = int(os.environ.get('AWS_CONNECT_TIMEOUT', '5'))
+# bedrock-runtime 기본 읽기 제한 시간 초 (Lambda 제한 시간 30초보다 짧게)
+BEDROCK_READ_TIMEOUT = int(os.environ.get('BEDROCK_READ_TIMEOUT', '25'))
+# 서비스별 총 시도 횟수 (1 = 재시도 없음)
+SERVICE_MAX_ATTEMPTS = {'bedrock-runtime': 1}
+# 서비스별 기본 읽기 제한 시간 (없으면 botocore 기본값)
+SERVICE_READ_TIMEOUTS = {'bedrock-runtime': BEDROCK_READ_TIMEOUT}
+
+_clients = {}
+# register_client로 등록한 클라이언트는 read_timeout과 관계없이 사용
+_registered = {}
+_lock = threading.Lock()
+_client_configs = {}
+
+
+def client_config(service=None, read_timeout=None):
+    """서비스별 botocore Config (botocore import를 첫 사용 시점까지 미룸)"""
+    max_attempts = SERVICE_MAX_ATTEMPTS.get(service, MAX_RETRY_ATTEMPTS)
+    read_timeout = read_timeout or SERVICE_READ_TIMEOUTS.get(service)
+    config = _client_configs.get((max_attempts, read_timeout))
+    if config is None:
+        from botocore.config import Config
+        timeouts = {'connect_timeout': CONNECT_TIMEOUT}
+        if read_timeout:
+            timeouts = {'connect_timeout': min(CONNECT_TIMEOUT, read_timeout), 'read_timeout': read_timeout}
+        config = _client_configs[(max_attempts, read_timeout)] = Config(
+            tcp_keepalive=True,
+            max_pool_connections=MAX_POOL_CONNECTIONS,
+            retries={'max_attempts': max_attempts, 'mode': 'adaptive' if max_attempts > 1 else 'standard'},
+            **timeouts
+        )
+    return config
+
+
+def get_client(service, region=None, read_timeout=None):
+    """
+    (service, region) 클라이언트를 반환, 없으면 생성 (region=None이면 기본 리전)
+    read_timeout(정수 초)을 주면 그 읽기 제한 시간을 가진 클라이언트를 따로 만들어 재사용
+    """
+    registered = _registered.get((service, region))
+    if registered is not None:
+        return registered
+
+    read_timeout = read_timeout or SERVICE_READ_TIMEOUTS.get(service)
+    key = (service, region, read_timeout)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            import boto3
+            client = boto3.client(service, region_name=region, config=client_config(service, read_timeout))
+            _clients[key] = client
+    return client
+
+
+def register_client(service, client, region=None):
+    """미리 만든 클라이언트(스텁 등)를 등록"""
+    with _lock:
+        _registered[(service, region)] = client
+
+
+def reset_clients():
+    """등록된 클라이언트를 모두 비움 (테스트용)"""
+    with _lock:
+        _clients.clear()
+        _registered.clear()
@@ -0,0 +1,93 @@
+"""
+로컬 배경 제거 엔진
+
+쿼카 이미지는 "clean, simple background" 프롬프트로 생성되므로 배경이 거의 단색이다.
+이미지 테두리에서 배경색을 추정하고, 배경색과 가까운 픽셀 중 테두리와 연결된 영역만
+투명하게 만든다 (벡터화된 flood fill). 테두리 균일도가 낮거나 전경 비율이 비정상이면
+신뢰도가 낮다고 보고 호출 측에서 Nova Canvas BACKGROUND_REMOVAL로 폴백한다.
+
+numpy/Pillow를 쓰므로 image_handler는 local 엔진을 쓸 때만 이 모듈을 import한다.
+"""
+import io
+
+import numpy as np
+
+# 배경색과의 RGB 거리 허용치
+COLOR_TOLERANCE = 40
+# 정상으로 보는 전경(쿼카) 비율 범위
+FOREGROUND_RATIO_RANGE = (0.05, 0.9)
+
+
+def estimate_background(rgb):
+    """테두리 픽셀의 중앙값을 배경색으로 보고, 테두리 중 배경색에 가까운 비율(균일도)을 함께 반환"""
+    border = np.concatenate([rgb[0], rgb[-1], rgb[1:-1, 0], rgb[1:-1, -1]])
+    color = np.median(border, axis=0)
+    distance = np.linalg.norm(border - color, axis=1)
+    return color, float(np.mean(distance < COLOR_TOLERANCE))
+
+
+def fill_runs(region, candidate):
+    """
+    행 방향 한 번의 패스로, seed(region)가 하나라도 포함된 candidate 연속 구간 전체를 채움
+    행 끝에 False 열을 덧대어 구간이 다음 행으로 이어지지 않게 한다.
+    """
+    height, width = candidate.shape
+    flat_candidate = np.pad(candidate, ((0, 0), (0, 1))).ravel()
+    flat_region = np.pad(region, ((0, 0), (0, 1))).ravel()
+
+    starts = flat_candidate & ~np.concatenate(([False], flat_candidate[:-1]))
+    labels = np.cumsum(starts) * flat_candidate
+    touched = np.bincount(labels, weights=flat_region, minlength=labels.max() + 1) > 0
+    touched[0] = False
+
+    return touched[labels].reshape(height, width + 1)[:, :width]
+
+
+def flood_fill_from_border(candidate):
+    """candidate 픽셀 중 이미지 테두리와 연결된 영역 (행/열 방향 구간 채우기를 수렴할 때까지 반복)"""
+    region = np.zeros_like(candidate)
+    region[[0, -1], :] = candidate[[0, -1], :]
+    region[:, [0, -1]] = candidate[:, [0, -1]]
+
+    while True:
+        grown = fill_runs(region, candidate)
+        grown = fill_runs(grown.T, candidate.T).T
+        if np.array_equal(grown, region):
+            return region
+        region = grown
+
+
+def remove_background_local(image_data, min_confidence):
+    """
+    PNG 바이트의 배경을 투명하게 만든 RGBA PNG 반환
+    반환: (png_bytes 또는 None, 품질 정보 dict) - 신뢰도가 min_confidence 미만이면 None
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        return None, {'confidence': 0.0, 'reason': 'Pillow not installed'}
+
+    image = Image.open(io.BytesIO(image_data)).convert('RGB')
+    rgb = np.asarray(image, dtype=np.float32)
+
+    color, border_uniformity = estimate_background(rgb)
+    candidate = np.linalg.norm(rgb - color, axis=2) < COLOR_TOLERANCE
+    background = flood_fill_from_border(candidate)
+
+    foreground_ratio = float(1.0 - background.mean())
+    in_range = FOREGROUND_RATIO_RANGE[0] <= foreground_ratio <= FOREGROUND_RATIO_RANGE[1]
+    quality = {
+        'confidence': round(border_uniformity if in_range else 0.0, 3),
+        'border_uniformity': round(border_uniformity, 3),
+        'foreground_ratio': round(foreground_ratio, 3)
+    }
+
+    if quality['confidence'] < min_confidence:
+        return None, quality
+
+    alpha = np.where(background, 0, 255).astype(np.uint8)
+    rgba = np.dstack([np.asarray(image, dtype=np.uint8), alpha])
+
+    buffer = io.BytesIO()
+    Image.fromarray(rgba, 'RGBA').save(buffer, format='PNG')
+    return buffer.getvalue(), quality
@@ -0,0 +1,71 @@
+"""
+결과 캐시 공통 모듈
+
+- LRUCache: 컨테이너(프로세스) 내 LRU 캐시, 히트/미스 카운터 포함
+- content_hash: 입력값으로부터 내용 기반(content-addressed) 키 생성
+- s3_object_exists: S3 영속 캐시 계층 조회 (HEAD 요청)
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from botocore.exceptions import ClientError
+
+
+class LRUCache:
+    """스레드 안전 LRU 캐시"""
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+
+def content_hash(*parts):
+    """입력값들을 정규화(JSON)하여 SHA-256 hex digest 반환"""
+    payload = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def s3_object_exists(s3_client, bucket, key):
+    """
+    S3 객체 존재 여부 확인
+    ListBucket 권한이 없으면 없는 키에 403이 오므로 404와 함께 미스로 처리
+    """
+    try:
+        s3_client.head_object(Bucket=bucket, Key=key)
+        return True
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in ('404', '403', 'NoSuchKey', 'NotFound'):
+            return False
+        raise
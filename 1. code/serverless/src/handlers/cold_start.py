@@ -0,0 +1,123 @@
+"""
+콜드 스타트 import 프로파일러
+
+라우트의 핸들러 모듈을 처음 import할 때 sys.meta_path에 타이머를 걸어
+모듈별 self/누적 import 시간(-X importtime과 같은 형식)을 모으고, 구조화된 JSON 한 줄로 로그에 남긴다.
+CloudWatch Logs Insights에서 `filter event = "cold_start"`로 라우트별 초기화 비용을 볼 수 있다.
+
+COLD_START_PROFILE=0 이면 타이머 없이 import만 한다.
+"""
+import importlib
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+COLD_START_PROFILE = os.environ.get('COLD_START_PROFILE', '1') != '0'
+# 로그에 남길 누적 시간 상위 모듈 수
+PROFILE_TOP_MODULES = int(os.environ.get('COLD_START_TOP_MODULES', '15'))
+
+# 컨테이너가 app 모듈을 로드한 시각 (첫 호출까지의 초기화 시간 계산용)
+PROCESS_START = time.perf_counter()
+
+
+class _TimedLoader:
+    """실제 로더의 exec_module을 감싸 실행 시간을 기록"""
+
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler.enter()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler.leave(module.__name__, time.perf_counter() - start)
+            # 모듈에는 원래 로더를 남겨 둠 (리소스 조회 등이 로더 타입을 보는 경우 대비)
+            module.__loader__ = self._loader
+            if getattr(module, '__spec__', None) is not None:
+                module.__spec__.loader = self._loader
+
+
+class ImportProfiler:
+    """
+    sys.meta_path 맨 앞에 들어가 다른 finder가 찾은 spec의 로더를 _TimedLoader로 바꾼다.
+    records: [(모듈명, self_us, 누적_us)] - import가 끝난 순서
+    """
+
+    def __init__(self):
+        self.records = []
+        self._child_time = [0.0]
+
+    def find_spec(self, fullname, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _TimedLoader(spec.loader, self)
+                return spec
+        return None
+
+    def enter(self):
+        self._child_time.append(0.0)
+
+    def leave(self, name, elapsed):
+        children = self._child_time.pop()
+        self._child_time[-1] += elapsed
+        self.records.append((name, int((elapsed - children) * 1e6), int(elapsed * 1e6)))
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+
+@contextmanager
+def profile_imports():
+    profiler = ImportProfiler()
+    profiler.install()
+    try:
+        yield profiler
+    finally:
+        profiler.uninstall()
+
+
+def import_with_profile(module_name, route=None):
+    """
+    모듈을 import하고, 처음 로드되는 경우 프로파일을 JSON 로그로 남긴 뒤 (모듈, 프로파일 dict 또는 None) 반환
+    """
+    if module_name in sys.modules or not COLD_START_PROFILE:
+        return importlib.import_module(module_name), None
+
+    start = time.perf_counter()
+    with profile_imports() as profiler:
+        module = importlib.import_module(module_name)
+    elapsed = time.perf_counter() - start
+
+    profile = {
+        'event': 'cold_start',
+        'route': route,
+        'module': module_name,
+        'import_ms': round(elapsed * 1000, 2),
+        'since_process_start_ms': round((time.perf_counter() - PROCESS_START) * 1000, 2),
+        'modules_loaded': len(profiler.records),
+        'top_modules': [
+            {'module': name, 'self_us': self_us, 'cumulative_us': cumulative_us}
+            for name, self_us, cumulative_us in sorted(profiler.records, key=lambda r: -r[2])[:PROFILE_TOP_MODULES]
+        ]
+    }
+    print(json.dumps(profile, ensure_ascii=False))
+    return module, profile
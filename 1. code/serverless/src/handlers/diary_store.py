@@ -0,0 +1,204 @@
+"""
+일기 ID / S3 키 규칙 및 저장소 조회
+
+- diary_id: "diary-" + ULID (48비트 ms 타임스탬프 + 80비트 난수, Crockford base32 26자)
+  충돌 없이 생성 시각 순으로 정렬된다. (기존 "diary-YYYYMMDD-xxx"는 하루 4,096개뿐이라 덮어쓰기가 발생)
+- S3 키: diaries/dt=YYYY-MM-DD/h=xx/{diary_id}.json
+  날짜 prefix로 기간 조회 시 해당 날짜만 나열하고, 그 아래 해시 2자리(256개) prefix로 쓰기 부하를 분산한다.
+- 일괄 저장 모드(handlers.diary_writer)의 배치: diaries/batches/dt=YYYY-MM-DD/{ULID}.ndjson.gz
+  iter_batch_records()로 기간 내 레코드를 읽는다 (at-least-once 업로드라 diary_id로 중복 제거).
+- 기존 키(diaries/{diary_id}.json)는 read_diary / list_diary_keys(include_legacy=True)로 그대로 읽을 수 있고,
+  migrate_legacy_diaries()로 새 배치로 복사할 수 있다.
+
+마이그레이션 실행 (src 디렉터리에서):
+    python -m handlers.diary_store 2024-09-01 2024-09-30 [--apply]
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+from botocore.exceptions import ClientError
+
+DIARY_PREFIX = 'diaries'
+DIARY_ID_PREFIX = 'diary-'
+BATCH_PREFIX = f"{DIARY_PREFIX}/batches"
+
+CROCKFORD_BASE32 = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+CROCKFORD_INDEX = {char: index for index, char in enumerate(CROCKFORD_BASE32)}
+ULID_PATTERN = re.compile(r'^diary-([0-9A-HJKMNP-TV-Z]{26})$')
+LEGACY_ID_PATTERN = re.compile(r'^diary-(\d{8})-[0-9a-f]+$')
+
+
+def encode_base32(value, length):
+    chars = []
+    for _ in range(length):
+        value, remainder = divmod(value, 32)
+        chars.append(CROCKFORD_BASE32[remainder])
+    return ''.join(reversed(chars))
+
+
+def new_ulid(timestamp_ms=None):
+    """ULID 문자열 (앞 10자 타임스탬프, 뒤 16자 난수)"""
+    if timestamp_ms is None:
+        timestamp_ms = int(time.time() * 1000)
+    randomness = int.from_bytes(os.urandom(10), 'big')
+    return encode_base32(timestamp_ms, 10) + encode_base32(randomness, 16)
+
+
+def ulid_timestamp_ms(ulid):
+    value = 0
+    for char in ulid[:10]:
+        value = value * 32 + CROCKFORD_INDEX[char]
+    return value
+
+
+def new_diary_id():
+    """시간순 정렬되는 충돌 없는 diary_id"""
+    return f"{DIARY_ID_PREFIX}{new_ulid()}"
+
+
+def diary_date(diary_id):
+    """diary_id에 담긴 생성 날짜(UTC, date) - 새 형식/기존 형식 모두 지원, 알 수 없으면 None"""
+    match = ULID_PATTERN.match(diary_id)
+    if match:
+        return datetime.fromtimestamp(ulid_timestamp_ms(match.group(1)) / 1000, tz=timezone.utc).date()
+
+    match = LEGACY_ID_PATTERN.match(diary_id)
+    if match:
+        return datetime.strptime(match.group(1), '%Y%m%d').date()
+    return None
+
+
+def hash_prefix(diary_id):
+    return hashlib.sha256(diary_id.encode('utf-8')).hexdigest()[:2]
+
+
+def date_prefix(day):
+    return f"{DIARY_PREFIX}/dt={day.isoformat()}/"
+
+
+def diary_key(diary_id):
+    """diaries/dt=YYYY-MM-DD/h=xx/{diary_id}.json"""
+    day = diary_date(diary_id)
+    if day is None:
+        raise Exception(f"Invalid diary_id: {diary_id}")
+    return f"{date_prefix(day)}h={hash_prefix(diary_id)}/{diary_id}.json"
+
+
+def batch_key(day, batch_id):
+    """diaries/batches/dt=YYYY-MM-DD/{batch_id}.ndjson.gz"""
+    return f"{BATCH_PREFIX}/dt={day.isoformat()}/{batch_id}.ndjson.gz"
+
+
+def legacy_diary_key(diary_id):
+    return f"{DIARY_PREFIX}/{diary_id}.json"
+
+
+def diary_record(diary_id, content, user_type, compliment):
+    return {
+        'diary_id': diary_id,
+        'timestamp': datetime.now().isoformat(),
+        'content': content,
+        'type': user_type,
+        'compliment': compliment
+    }
+
+
+def read_diary(s3_client, bucket, diary_id):
+    """
+    일기 한 건 조회 (없으면 None)
+    새 키를 먼저 보고, 없으면 기존 키(diaries/{diary_id}.json)를 읽는다.
+    """
+    keys = [diary_key(diary_id)]
+    if LEGACY_ID_PATTERN.match(diary_id):
+        keys.append(legacy_diary_key(diary_id))
+
+    for key in keys:
+        try:
+            response = s3_client.get_object(Bucket=bucket, Key=key)
+            return json.loads(response['Body'].read())
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') not in ('NoSuchKey', '404', '403'):
+                raise Exception(f"S3 read error: {e}")
+    return None
+
+
+def list_prefix(s3_client, bucket, prefix):
+    """prefix 아래 키 전체 (list_objects_v2 페이지 순회)"""
+    kwargs = {'Bucket': bucket, 'Prefix': prefix}
+    while True:
+        response = s3_client.list_objects_v2(**kwargs)
+        for item in response.get('Contents', []):
+            yield item['Key']
+        if not response.get('IsTruncated'):
+            return
+        kwargs['ContinuationToken'] = response['NextContinuationToken']
+
+
+def list_diary_keys(s3_client, bucket, start_date, end_date, include_legacy=False):
+    """
+    start_date ~ end_date(포함) 기간의 일기 키
+    날짜별 prefix만 나열하므로 버킷 전체를 훑지 않는다. 기존 키도 diaries/diary-YYYYMMDD- prefix로 날짜별 조회 가능.
+    """
+    day = start_date
+    while day <= end_date:
+        yield from list_prefix(s3_client, bucket, date_prefix(day))
+        if include_legacy:
+            yield from list_prefix(s3_client, bucket, f"{DIARY_PREFIX}/{DIARY_ID_PREFIX}{day.strftime('%Y%m%d')}-")
+        day += timedelta(days=1)
+
+
+def iter_batch_records(s3_client, bucket, start_date, end_date):
+    """start_date ~ end_date(포함) 기간의 배치 레코드 (같은 diary_id는 한 번만)"""
+    seen = set()
+    day = start_date
+    while day <= end_date:
+        for key in list_prefix(s3_client, bucket, f"{BATCH_PREFIX}/dt={day.isoformat()}/"):
+            body = s3_client.get_object(Bucket=bucket, Key=key)['Body'].read()
+            for line in gzip.decompress(body).decode('utf-8').splitlines():
+                if not line:
+                    continue
+                record = json.loads(line)
+                if record['diary_id'] not in seen:
+                    seen.add(record['diary_id'])
+                    yield record
+        day += timedelta(days=1)
+
+
+def migrate_legacy_diaries(s3_client, bucket, start_date, end_date, dry_run=True):
+    """기간 내 기존 키의 일기를 새 키로 복사 (원본은 남김). 반환: [(기존 키, 새 키)]"""
+    moved = []
+    day = start_date
+    while day <= end_date:
+        for key in list_prefix(s3_client, bucket, f"{DIARY_PREFIX}/{DIARY_ID_PREFIX}{day.strftime('%Y%m%d')}-"):
+            diary_id = key[len(DIARY_PREFIX) + 1:-len('.json')]
+            new_key = diary_key(diary_id)
+            if not dry_run:
+                s3_client.copy_object(
+                    Bucket=bucket, Key=new_key, CopySource={'Bucket': bucket, 'Key': key},
+                    ContentType='application/json', MetadataDirective='REPLACE'
+                )
+            moved.append((key, new_key))
+        day += timedelta(days=1)
+    return moved
+
+
+if __name__ == '__main__':
+    import argparse
+    from datetime import date
+
+    from handlers.aws_clients import get_client
+
+    parser = argparse.ArgumentParser(description='기존 diaries/{id}.json 키를 날짜/해시 분할 키로 복사')
+    parser.add_argument('start', type=date.fromisoformat)
+    parser.add_argument('end', type=date.fromisoformat)
+    parser.add_argument('--bucket', default=os.environ.get('S3_BUCKET'))
+    parser.add_argument('--apply', action='store_true', help='지정하지 않으면 복사 대상만 출력')
+    args = parser.parse_args()
+
+    for old_key, new_key in migrate_legacy_diaries(get_client('s3'), args.bucket, args.start, args.end, not args.apply):
+        print(f"{old_key} -> {new_key}")
@@ -0,0 +1,203 @@
+"""
+일기 일괄 저장 (버퍼링 + NDJSON gzip 배치)
+
+일기마다 put_object를 기다리지 않고 메모리 버퍼에 쌓아 두었다가,
+- 레코드 수가 max_records 또는 JSON 크기가 max_bytes를 넘거나
+- 가장 오래된 레코드가 max_age_seconds를 넘기거나
+- 프로세스가 종료될 때(atexit, SIGTERM)
+백그라운드 스레드가 날짜별로 묶어 diaries/batches/dt=YYYY-MM-DD/{ULID}.ndjson.gz 한 객체로 올린다.
+
+저장 보장 (at-least-once):
+- 레코드는 업로드가 성공한 뒤에만 버퍼에서 빠진다. 실패하면 버퍼 앞쪽으로 되돌려 다음 flush에서 다시 올린다.
+- 업로드는 성공했는데 응답을 못 받은 경우 같은 레코드가 두 배치에 들어갈 수 있으므로,
+  읽는 쪽(diary_store.iter_batch_records)이 diary_id로 중복을 제거한다.
+- Lambda는 호출 사이에 컨테이너를 멈추므로 타이머도 다음 호출까지 멈춘다. 컨테이너가 SIGTERM 없이 회수되면
+  아직 올리지 못한 레코드는 잃을 수 있다 (Lambda는 확장(extension)이 등록된 경우에만 종료 전 SIGTERM을 보냄).
+  일기 원본이 반드시 남아야 하는 환경에서는 DIARY_WRITE_MODE=object(기본)를 사용한다.
+"""
+import atexit
+import gzip
+import json
+import signal
+import threading
+import time
+
+from handlers.diary_store import batch_key, diary_date, new_ulid
+
+
+class DiaryBatchWriter:
+    """일기 레코드 버퍼 + 백그라운드 flush 스레드 (스레드 안전)"""
+
+    def __init__(self, s3_client, bucket, max_records=100, max_bytes=1024 * 1024, max_age_seconds=30,
+                 retry_seconds=5, clock=time.monotonic):
+        # s3_client: 클라이언트 또는 클라이언트를 돌려주는 함수 (첫 flush 때까지 생성을 미룰 수 있게)
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.retry_seconds = retry_seconds
+        self.clock = clock
+        self._buffer = []
+        self._buffer_bytes = 0
+        self._oldest = None
+        # 업로드 실패 후 다음 시도까지 대기 (S3 장애 시 재시도 폭주 방지)
+        self._retry_at = 0.0
+        self._condition = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._thread = None
+        self._stats = {'accepted': 0, 'flushed': 0, 'batches': 0, 'failed_flushes': 0}
+
+    def _client(self):
+        return self.s3_client() if callable(self.s3_client) else self.s3_client
+
+    def _full(self):
+        return len(self._buffer) >= self.max_records or self._buffer_bytes >= self.max_bytes
+
+    def _due(self):
+        if not self._buffer or self.clock() < self._retry_at:
+            return False
+        return self._full() or self.clock() - self._oldest >= self.max_age_seconds
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='diary-writer', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed and not self._due():
+                    timeout = None
+                    if self._buffer:
+                        wake_at = self._retry_at if self._full() else \
+                            max(self._oldest + self.max_age_seconds, self._retry_at)
+                        timeout = max(wake_at - self.clock(), 0)
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+            self.flush()
+
+    def add(self, record):
+        """레코드를 버퍼에 넣고 바로 반환 (업로드는 백그라운드)"""
+        line = record_line(record)
+        with self._condition:
+            if self._closed:
+                raise Exception("Diary writer is closed")
+            if not self._buffer:
+                self._oldest = self.clock()
+            self._buffer.append((record['diary_id'], line))
+            self._buffer_bytes += len(line.encode('utf-8')) + 1
+            self._stats['accepted'] += 1
+            self._start()
+            self._condition.notify()
+
+    def _take(self):
+        with self._condition:
+            taken = self._buffer
+            self._buffer, self._buffer_bytes, self._oldest = [], 0, None
+            return taken
+
+    def _restore(self, entries):
+        with self._condition:
+            self._buffer = entries + self._buffer
+            self._buffer_bytes = sum(len(line.encode('utf-8')) + 1 for _, line in self._buffer)
+            self._oldest = self.clock()
+            self._retry_at = self._oldest + self.retry_seconds
+
+    def flush(self):
+        """
+        버퍼 전체를 날짜별 배치 객체로 업로드
+        반환: 올린 레코드 수 (실패한 날짜의 레코드는 버퍼로 되돌리고 예외 없이 로그만 남김)
+        """
+        with self._flush_lock:
+            entries = self._take()
+            if not entries:
+                return 0
+
+            batches, failed = upload_batches(self._client(), self.bucket, entries)
+            flushed = len(entries) - len(failed)
+
+            with self._condition:
+                self._stats['flushed'] += flushed
+                self._stats['batches'] += batches
+                if failed:
+                    self._stats['failed_flushes'] += 1
+            if failed:
+                self._restore(failed)
+            return flushed
+
+    def close(self):
+        """남은 레코드를 올리고 백그라운드 스레드 종료 (종료 시 호출)"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.flush()
+        if self.pending():
+            print(f"Diary writer closed with {self.pending()}건 not uploaded")
+
+    def pending(self):
+        with self._condition:
+            return len(self._buffer)
+
+    def stats(self):
+        with self._condition:
+            return {**self._stats, 'pending': len(self._buffer)}
+
+
+def record_line(record):
+    """NDJSON 한 줄 (공백 없는 JSON)"""
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+
+def upload_batches(s3_client, bucket, entries):
+    """
+    (diary_id, NDJSON 줄) 목록을 날짜별 배치 객체 하나씩으로 업로드
+    반환: (올린 배치 수, 업로드에 실패한 항목 목록)
+    """
+    by_day = {}
+    for diary_id, line in entries:
+        by_day.setdefault(diary_date(diary_id), []).append((diary_id, line))
+
+    batches, failed = 0, []
+    for day, day_entries in by_day.items():
+        key = batch_key(day, new_ulid())
+        body = gzip.compress(('\n'.join(line for _, line in day_entries) + '\n').encode('utf-8'))
+        try:
+            s3_client.put_object(
+                Bucket=bucket,
+                Key=key,
+                Body=body,
+                ContentType='application/x-ndjson'
+            )
+            batches += 1
+        except Exception as e:
+            print(f"Diary batch flush error - {key}, {len(day_entries)}건: {str(e)}")
+            failed.extend(day_entries)
+    return batches, failed
+
+
+def flush_on_shutdown(writer):
+    """atexit + SIGTERM에서 writer.close() 호출 (기존 SIGTERM 핸들러는 이어서 호출)"""
+    atexit.register(writer.close)
+
+    try:
+        previous = signal.getsignal(signal.SIGTERM)
+    except (AttributeError, ValueError):
+        return
+
+    def on_sigterm(signum, frame):
+        writer.close()
+        if callable(previous):
+            previous(signum, frame)
+        elif previous == signal.SIG_DFL:
+            raise SystemExit(0)
+
+    try:
+        signal.signal(signal.SIGTERM, on_sigterm)
+    except ValueError:
+        # 메인 스레드가 아니면 시그널 핸들러를 등록할 수 없음 (atexit만 사용)
+        pass
@@ -1,14 +1,37 @@
 import json
-import boto3
 import base64
 import os
+import time
 from botocore.exceptions import ClientError
+from handlers.jobs import submit_job, get_job_store
+from handlers.cache import LRUCache, content_hash, s3_object_exists
+from handlers.media import media_url, put_media
+from handlers.aws_clients import BEDROCK_READ_TIMEOUT, get_client
+from handlers.tracing import stage, set_size, count, annotate, record_error, error_summary
+from handlers.rate_limiter import RateLimited, call_timeout, call_with_retry, too_many_requests
 
-bedrock_client = boto3.client('bedrock-runtime', region_name='us-east-1')
-s3_client = boto3.client('s3')
+# Nova Canvas는 us-east-1에서만 제공
+BEDROCK_REGION = 'us-east-1'
+IMAGE_MODEL_ID = 'amazon.nova-canvas-v1:0'
 
 S3_BUCKET = os.environ.get('S3_BUCKET')
 
+# 프롬프트/생성 설정이 바뀌면 올려서 기존 캐시와 분리
+IMAGE_PROMPT_VERSION = 1
+IMAGE_CACHE_PREFIX = 'images/by-hash'
+# 배경 제거 실패 시 원본 이미지 (캐시 조회 대상 아님, 짧은 Cache-Control)
+IMAGE_FALLBACK_PREFIX = 'images/fallback'
+# Nova Canvas seed 허용 범위: 0 ~ 2,147,483,646
+MAX_IMAGE_SEED = 2147483646
+
+# 배경 제거 엔진: remote(Nova Canvas) 또는 local(CPU, 신뢰도 낮으면 remote로 폴백)
+BACKGROUND_REMOVAL_ENGINE = os.environ.get('BACKGROUND_REMOVAL_ENGINE', 'remote')
+LOCAL_BG_MIN_CONFIDENCE = float(os.environ.get('LOCAL_BG_MIN_CONFIDENCE', '0.9'))
+
+# 이미지 결과 캐시: 컨테이너 내 LRU(S3 키 존재 여부) + S3 images/by-hash/ 영속 계층
+# 요청별 히트/미스는 Trace 지표(ImageCacheHit, ImageCacheS3Hit, ImageCacheMiss)로 남김
+image_cache = LRUCache(int(os.environ.get('IMAGE_CACHE_SIZE', '128')))
+
 def handle_generate_image(event, headers):
     """
     칭찬 이미지 생성 API 핸들러
@@ -34,14 +57,21 @@ def handle_generate_image(event, headers):
                 'body': json.dumps({'error': 'compliment is required'})
             }
         
-        # Bedrock으로 이미지 생성
-        image_data = generate_quokka_image(compliment, diary_id)
-        
-        # 배경 제거
-        bg_removed_image = remove_background(image_data)
+        # 비동기 모드: 작업 id만 즉시 반환하고 워커가 생성 (이미 생성된 이미지는 바로 반환)
+        cached_url = find_cached_image(diary_id, compliment) if body.get('async') is True else None
+        if body.get('async') is True and not cached_url:
+            job = submit_job('image', {'diary_id': diary_id, 'compliment': compliment})
+            return {
+                'statusCode': 202,
+                'headers': headers,
+                'body': json.dumps({
+                    'job_id': job['job_id'],
+                    'status': job['status'],
+                    'status_url': f"/generate/image/status?job_id={job['job_id']}"
+                })
+            }
         
-        # S3에 이미지 업로드
-        image_url = upload_image_to_s3(diary_id, bg_removed_image)
+        image_url = cached_url or create_quokka_image(diary_id, compliment)
         
         return {
             'statusCode': 200,
@@ -51,15 +81,160 @@ def handle_generate_image(event, headers):
             })
         }
         
+    except RateLimited as e:
+        print(f"Image generation rate limited: {error_summary(e)}")
+        record_error(e, 'generate_image')
+        return too_many_requests(headers, e)
+        
     except Exception as e:
-        print(f"Image generation error: {str(e)}")
+        print(f"Image generation error: {error_summary(e)}")
+        record_error(e, 'generate_image')
         return {
             'statusCode': 500,
             'headers': headers,
             'body': json.dumps({'error': 'Internal server error'})
         }
 
-def generate_quokka_image(compliment, diary_id=None):
+def handle_image_job_status(event, headers):
+    """
+    비동기 이미지 작업 상태 조회 API 핸들러
+    """
+    try:
+        params = event.get('queryStringParameters') or {}
+        job_id = params.get('job_id')
+        if not job_id and event.get('body'):
+            job_id = json.loads(event['body']).get('job_id')
+        
+        if not job_id:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({'error': 'job_id is required'})
+            }
+        
+        job = get_job_store().get(job_id)
+        if job is None or job.get('type') != 'image':
+            return {
+                'statusCode': 404,
+                'headers': headers,
+                'body': json.dumps({'error': 'job not found'})
+            }
+        
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': json.dumps({
+                'job_id': job['job_id'],
+                'status': job['status'],
+                'stage': job.get('stage'),
+                'image_url': (job.get('result') or {}).get('image_url'),
+                'error': job.get('error')
+            })
+        }
+        
+    except Exception as e:
+        print(f"Image job status error: {error_summary(e)}")
+        record_error(e, 'image_job_status')
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': json.dumps({'error': 'Internal server error'})
+        }
+
+def run_image_job(job, report):
+    """비동기 이미지 작업 워커"""
+    params = job['params']
+    return {'image_url': create_quokka_image(params['diary_id'], params['compliment'], report)}
+
+# 작업 타입별 워커 (app.lambda_handler의 job 이벤트에서 사용)
+JOB_RUNNERS = {
+    'image': run_image_job
+}
+
+def warm_up():
+    """웜업 이벤트/프로비저닝된 동시성 초기화 때 Bedrock/S3 클라이언트를 미리 생성"""
+    bedrock_client()
+    get_client('s3')
+    return {'clients': ['bedrock-runtime', 's3']}
+
+def bedrock_client():
+    """Nova Canvas 클라이언트 (읽기 제한 시간이 요청 마감까지 남은 시간을 넘지 않음)"""
+    return get_client('bedrock-runtime', BEDROCK_REGION, read_timeout=call_timeout(BEDROCK_READ_TIMEOUT))
+
+def image_cache_key(diary_id, compliment):
+    """diary_id + 칭찬 문장 + 프롬프트 버전으로 만든 내용 기반 키"""
+    return content_hash(diary_id or '', compliment, IMAGE_PROMPT_VERSION)
+
+def image_seed(cache_key):
+    """
+    캐시 키(SHA-256)로부터 고정 seed 생성
+    (hash()는 프로세스마다 salt가 달라 컨테이너마다 다른 이미지가 나온다)
+    """
+    return int(cache_key[:16], 16) % (MAX_IMAGE_SEED + 1)
+
+def find_cached_image(diary_id, compliment):
+    """이미 생성된 이미지가 있으면 URL 반환 (메모리 LRU -> S3 HEAD 순서)"""
+    cache_key = image_cache_key(diary_id, compliment)
+    key = f"{IMAGE_CACHE_PREFIX}/{cache_key}.png"
+    
+    if image_cache.get(cache_key):
+        count('image_cache_hit')
+        return media_url(get_client('s3'), key)
+    
+    if s3_object_exists(get_client('s3'), S3_BUCKET, key):
+        count('image_cache_hit')
+        count('image_cache_s3_hit')
+        image_cache.put(cache_key, True)
+        return media_url(get_client('s3'), key)
+    
+    return None
+
+def create_quokka_image(diary_id, compliment, report=None):
+    """
+    이미지 생성 -> 배경 제거 -> S3 업로드 후 이미지 URL 반환
+    같은 diary_id + 칭찬이면 Bedrock 호출 없이 기존 이미지를 재사용
+    report(stage)가 주어지면 단계별 진행 상황을 기록
+    """
+    report = report or (lambda stage: None)
+    
+    report('cache_lookup')
+    with stage('cache_lookup'):
+        cached_url = find_cached_image(diary_id, compliment)
+    if cached_url:
+        return cached_url
+    
+    count('image_cache_miss')
+    cache_key = image_cache_key(diary_id, compliment)
+    
+    # Bedrock으로 이미지 생성
+    report('generating')
+    with stage('image_generate', model=IMAGE_MODEL_ID):
+        image_data = generate_quokka_image(compliment, diary_id, seed=image_seed(cache_key))
+    set_size('image', len(image_data))
+    
+    # 배경 제거
+    report('removing_background')
+    with stage('background_removal'):
+        bg_removed_image, bg_report = remove_background_with_report(image_data)
+    set_size('image_no_bg', len(bg_removed_image))
+    annotate(background_removal=bg_report)
+    print(f"배경 제거 결과 - diary_id: {diary_id}, {json.dumps(bg_report)}")
+    
+    # 배경 제거에 실패한 원본 이미지는 내용 기반 키(immutable)에 저장하지 않음
+    # 짧은 TTL의 별도 키로 올려 같은 요청이 다음에 다시 생성되게 함
+    if not bg_report['removed']:
+        report('uploading')
+        with stage('s3_upload', target='image_fallback'):
+            return upload_image_to_s3(f"{IMAGE_FALLBACK_PREFIX}/{cache_key}.png", bg_removed_image, immutable=False)
+    
+    # S3에 이미지 업로드
+    report('uploading')
+    with stage('s3_upload', target='image'):
+        url = upload_image_to_s3(f"{IMAGE_CACHE_PREFIX}/{cache_key}.png", bg_removed_image)
+    image_cache.put(cache_key, True)
+    return url
+
+def generate_quokka_image(compliment, diary_id=None, seed=None):
     """
     Bedrock Nova Image Generator를 사용하여 쿼카 이미지 생성
     """
@@ -87,15 +262,16 @@ def generate_quokka_image(compliment, diary_id=None):
                 "height": 512,
                 "width": 512,
                 "cfgScale": 8.0,
-                "seed": hash(diary_id) % 1000000 if diary_id else 42
+                "seed": seed if seed is not None else image_seed(image_cache_key(diary_id, compliment))
             }
         }
         
-        response = bedrock_client.invoke_model(
-            modelId='amazon.nova-canvas-v1:0',
+        # 모델별 속도 제한 + 스로틀링 시 지터 백오프 재시도 (끝내 스로틀링이면 RateLimited -> 429)
+        response = call_with_retry(IMAGE_MODEL_ID, lambda: bedrock_client().invoke_model(
+            modelId=IMAGE_MODEL_ID,
             body=json.dumps(request_body),
             contentType='application/json'
-        )
+        ))
         
         response_body = json.loads(response['body'].read())
         image_data = base64.b64decode(response_body['images'][0])
@@ -105,9 +281,41 @@ def generate_quokka_image(compliment, diary_id=None):
     except ClientError as e:
         raise Exception(f"Bedrock image generation error: {e}")
 
+def remove_background_with_report(image_data, engine=None):
+    """
+    설정된 엔진으로 배경 제거 후 (이미지, 엔진/소요시간/품질 리포트) 반환
+    local 엔진의 신뢰도가 낮거나 실패하면 Nova Canvas로 폴백
+    Nova Canvas도 실패하면 원본 이미지와 removed=False를 반환
+    """
+    engine = engine or BACKGROUND_REMOVAL_ENGINE
+    report = {'engine': 'remote', 'fallback': False, 'removed': True}
+    
+    if engine == 'local':
+        start = time.perf_counter()
+        try:
+            # numpy/Pillow는 local 엔진에서만 필요하므로 기본(remote) 콜드 스타트에서 import하지 않음
+            from handlers.background_removal import remove_background_local
+            result, quality = remove_background_local(image_data, LOCAL_BG_MIN_CONFIDENCE)
+        except Exception as e:
+            result, quality = None, {'confidence': 0.0, 'reason': str(e)}
+        report['local'] = dict(quality, ms=round((time.perf_counter() - start) * 1000, 1))
+        
+        if result is not None:
+            report['engine'] = 'local'
+            return result, report
+        report['fallback'] = True
+    
+    start = time.perf_counter()
+    result = remove_background(image_data)
+    report['remote'] = {'ms': round((time.perf_counter() - start) * 1000, 1)}
+    if result is None:
+        report['removed'] = False
+        return image_data, report
+    return result, report
+
 def remove_background(image_data):
     """
-    Amazon Nova Canvas를 사용하여 이미지 배경 제거
+    Amazon Nova Canvas를 사용하여 이미지 배경 제거 (스로틀링 외의 실패 시 None)
     """
     try:
         # 이미지를 base64로 인코딩
@@ -125,11 +333,11 @@ def remove_background(image_data):
             }
         }
         
-        response = bedrock_client.invoke_model(
-            modelId='amazon.nova-canvas-v1:0',
+        response = call_with_retry(IMAGE_MODEL_ID, lambda: bedrock_client().invoke_model(
+            modelId=IMAGE_MODEL_ID,
             body=json.dumps(request_body),
             contentType='application/json'
-        )
+        ))
         
         response_body = json.loads(response['body'].read())
         bg_removed_data = base64.b64decode(response_body['images'][0])
@@ -137,32 +345,19 @@ def remove_background(image_data):
         return bg_removed_data
         
     except ClientError as e:
-        # 배경 제거 실패 시 원본 이미지 반환
-        return image_data
+        # 스로틀링 외의 배경 제거 실패 (원인은 로그/Trace에 남김)
+        # 호출한 쪽이 원본 이미지를 내용 기반 캐시 밖에 저장한다 (스로틀링은 RateLimited -> 429)
+        print(f"Background removal error: {error_summary(e)}")
+        record_error(e, 'background_removal')
+        return None
 
-def upload_image_to_s3(diary_id, image_data):
+def upload_image_to_s3(key, image_data, immutable=True):
     """
-    생성된 이미지를 S3에 업로드하고 pre-signed URL 반환
+    생성된 이미지를 S3에 업로드하고 미디어 URL(CloudFront 또는 pre-signed) 반환
+    내용 기반 키는 immutable Cache-Control, 폴백 이미지는 짧은 Cache-Control로 업로드
     """
     try:
-        key = f"images/{diary_id}.png"
-        
-        # S3에 이미지 업로드
-        s3_client.put_object(
-            Bucket=S3_BUCKET,
-            Key=key,
-            Body=image_data,
-            ContentType='image/png'
-        )
-        
-        # Pre-signed URL 생성
-        presigned_url = s3_client.generate_presigned_url(
-            'get_object',
-            Params={'Bucket': S3_BUCKET, 'Key': key},
-            ExpiresIn=3600
-        )
-        
-        return presigned_url
+        return put_media(get_client('s3'), key, image_data, 'image/png', immutable=immutable)
         
     except ClientError as e:
-        raise Exception(f"S3 upload error: {e}")
\ No newline at end of file
+        raise Exception(f"S3 upload error: {e}")
@@ -0,0 +1,217 @@
+"""
+비동기 작업(Job) 큐/저장소
+
+오래 걸리는 생성 작업(이미지 등)을 요청과 분리하기 위한 인터페이스.
+- JobStore: 작업 상태 저장 (S3 jobs/{job_id}.json 또는 메모리)
+- JobQueue: 작업 전달 (같은 Lambda를 비동기 호출하거나, 메모리 스레드로 실행)
+
+테스트/로컬에서는 set_job_backend(InMemoryJobStore(), InMemoryJobQueue(worker))로 교체한다.
+"""
+import json
+import os
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+
+from botocore.exceptions import ClientError
+
+from handlers.aws_clients import get_client
+from handlers.rate_limiter import RateLimited
+from handlers.tracing import record_error, error_summary
+
+JOB_PREFIX = 'jobs'
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_SUCCEEDED = 'succeeded'
+STATUS_FAILED = 'failed'
+
+# 실패한 작업의 error 필드 (클라이언트에 그대로 노출되므로 예외 원문 대신 고정된 코드만 저장, 원인은 로그/Trace에 남김)
+ERROR_RATE_LIMITED = 'rate_limited'
+ERROR_GENERATION_FAILED = 'generation_failed'
+ERROR_UNKNOWN_JOB_TYPE = 'unknown_job_type'
+
+
+def new_job(job_type, params):
+    """작업 레코드 생성"""
+    now = datetime.now().isoformat()
+    return {
+        'job_id': uuid.uuid4().hex,
+        'type': job_type,
+        'status': STATUS_QUEUED,
+        'params': params,
+        'created_at': now,
+        'updated_at': now
+    }
+
+
+class JobStore(ABC):
+    """작업 상태 저장소 인터페이스"""
+
+    @abstractmethod
+    def put(self, job):
+        """작업 레코드 저장 (같은 job_id면 덮어씀)"""
+
+    @abstractmethod
+    def get(self, job_id):
+        """작업 레코드 조회 (없으면 None)"""
+
+    def update(self, job_id, **fields):
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.update(fields, updated_at=datetime.now().isoformat())
+        self.put(job)
+        return job
+
+
+class S3JobStore(JobStore):
+    """S3 jobs/{job_id}.json에 작업 상태 저장"""
+
+    def __init__(self, bucket=None, s3_client=None):
+        self.bucket = bucket or os.environ.get('S3_BUCKET')
+        self.s3_client = s3_client or get_client('s3')
+
+    def put(self, job):
+        try:
+            self.s3_client.put_object(
+                Bucket=self.bucket,
+                Key=f"{JOB_PREFIX}/{job['job_id']}.json",
+                Body=json.dumps(job, ensure_ascii=False),
+                ContentType='application/json'
+            )
+        except ClientError as e:
+            raise Exception(f"Job save error: {e}")
+
+    def get(self, job_id):
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=f"{JOB_PREFIX}/{job_id}.json")
+            return json.loads(response['Body'].read())
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404', '403'):
+                return None
+            raise Exception(f"Job load error: {e}")
+
+
+class InMemoryJobStore(JobStore):
+    """프로세스 메모리 작업 저장소 (로컬/테스트용)"""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def put(self, job):
+        with self._lock:
+            self._jobs[job['job_id']] = json.loads(json.dumps(job))
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return json.loads(json.dumps(job)) if job else None
+
+
+class JobQueue(ABC):
+    """작업 전달 인터페이스"""
+
+    @abstractmethod
+    def submit(self, job):
+        """작업을 워커에 전달"""
+
+
+class LambdaJobQueue(JobQueue):
+    """
+    같은 Lambda 함수를 비동기(Event)로 호출하여 작업 실행
+    app.lambda_handler가 {'job': {...}} 이벤트를 받아 워커로 처리한다.
+    """
+
+    def __init__(self, function_name=None, lambda_client=None):
+        self.function_name = function_name or os.environ.get('AWS_LAMBDA_FUNCTION_NAME')
+        self.lambda_client = lambda_client or get_client('lambda')
+
+    def submit(self, job):
+        try:
+            self.lambda_client.invoke(
+                FunctionName=self.function_name,
+                InvocationType='Event',
+                Payload=json.dumps({'job': {'job_id': job['job_id'], 'type': job['type']}}).encode('utf-8')
+            )
+        except ClientError as e:
+            raise Exception(f"Job submit error: {e}")
+
+
+class InMemoryJobQueue(JobQueue):
+    """워커 함수를 백그라운드 스레드에서 실행 (로컬/테스트용)"""
+
+    def __init__(self, worker, synchronous=False):
+        self.worker = worker
+        self.synchronous = synchronous
+
+    def submit(self, job):
+        message = {'job_id': job['job_id'], 'type': job['type']}
+        if self.synchronous:
+            self.worker(message)
+        else:
+            threading.Thread(target=self.worker, args=(message,), daemon=True).start()
+
+
+_job_store = None
+_job_queue = None
+
+
+def set_job_backend(store, queue):
+    """작업 저장소/큐 교체 (로컬 스탠드인 등)"""
+    global _job_store, _job_queue
+    _job_store, _job_queue = store, queue
+
+
+def get_job_store():
+    global _job_store
+    if _job_store is None:
+        _job_store = S3JobStore()
+    return _job_store
+
+
+def get_job_queue():
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = LambdaJobQueue()
+    return _job_queue
+
+
+def submit_job(job_type, params):
+    """작업을 저장소에 queued 상태로 기록한 뒤 큐에 전달"""
+    job = new_job(job_type, params)
+    get_job_store().put(job)
+    get_job_queue().submit(job)
+    return job
+
+
+def run_job(message, runners):
+    """
+    워커 진입점: 작업을 running으로 바꾸고 runners[type](job, report)를 실행
+    report(stage)로 진행 단계를 기록하며, 결과 dict는 succeeded 상태와 함께 저장
+    """
+    store = get_job_store()
+    job = store.get(message['job_id'])
+    if job is None:
+        print(f"Job not found: {message['job_id']}")
+        return None
+
+    runner = runners.get(job['type'])
+    if runner is None:
+        print(f"Job {job['job_id']} unknown type: {job['type']}")
+        return store.update(job['job_id'], status=STATUS_FAILED, error=ERROR_UNKNOWN_JOB_TYPE)
+
+    def report(stage):
+        store.update(job['job_id'], status=STATUS_RUNNING, stage=stage)
+
+    try:
+        report('started')
+        result = runner(job, report)
+        return store.update(job['job_id'], status=STATUS_SUCCEEDED, stage='done', result=result)
+    except Exception as e:
+        print(f"Job {job['job_id']} failed: {error_summary(e)}")
+        record_error(e, f"job:{job['type']}")
+        error = ERROR_RATE_LIMITED if isinstance(e, RateLimited) else ERROR_GENERATION_FAILED
+        return store.update(job['job_id'], status=STATUS_FAILED, error=error)
@@ -0,0 +1,54 @@
+"""
+생성 미디어(이미지/음성) 업로드 및 URL 공통 모듈
+
+내용 기반 키(*/by-hash/*)는 한 번 쓰면 바뀌지 않으므로 긴 Cache-Control(immutable)을 붙여 올리고,
+CLOUDFRONT_DOMAIN이 설정되어 있으면 만료 없는 CDN URL을 반환해 반복 조회가 엣지에서 처리되게 한다.
+CloudFront가 없는 환경(로컬 등)에서는 pre-signed URL로 대체한다.
+"""
+import os
+
+CLOUDFRONT_DOMAIN = os.environ.get('CLOUDFRONT_DOMAIN')
+S3_BUCKET = os.environ.get('S3_BUCKET')
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=300'
+PRESIGNED_URL_EXPIRES = 3600
+
+
+def cache_control(immutable):
+    return IMMUTABLE_CACHE_CONTROL if immutable else DEFAULT_CACHE_CONTROL
+
+
+def media_url(s3_client, key):
+    """CloudFront URL (설정 시) 또는 pre-signed URL"""
+    if CLOUDFRONT_DOMAIN:
+        return f"https://{CLOUDFRONT_DOMAIN}/{key}"
+
+    return s3_client.generate_presigned_url(
+        'get_object',
+        Params={'Bucket': S3_BUCKET, 'Key': key},
+        ExpiresIn=PRESIGNED_URL_EXPIRES
+    )
+
+
+def put_media(s3_client, key, body, content_type, immutable=True):
+    """바이트 객체 업로드 후 미디어 URL 반환"""
+    s3_client.put_object(
+        Bucket=S3_BUCKET,
+        Key=key,
+        Body=body,
+        ContentType=content_type,
+        CacheControl=cache_control(immutable)
+    )
+    return media_url(s3_client, key)
+
+
+def upload_media(s3_client, key, fileobj, content_type, immutable=True):
+    """파일 객체 스트리밍 업로드(큰 객체는 멀티파트) 후 미디어 URL 반환"""
+    s3_client.upload_fileobj(
+        fileobj,
+        S3_BUCKET,
+        key,
+        ExtraArgs={'ContentType': content_type, 'CacheControl': cache_control(immutable)}
+    )
+    return media_url(s3_client, key)
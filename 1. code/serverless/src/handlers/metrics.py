@@ -0,0 +1,33 @@
+"""
+CloudWatch 지표 출력 (Embedded Metric Format)
+
+Lambda 로그에 EMF 형식 JSON 한 줄을 남기면 CloudWatch가 별도 API 호출 없이 지표로 추출한다.
+METRICS_NAMESPACE로 네임스페이스를 바꿀 수 있다.
+"""
+import json
+import os
+import time
+
+METRICS_NAMESPACE = os.environ.get('METRICS_NAMESPACE', 'QuokkaDiary')
+
+
+def emit_metrics(dimensions, metrics, properties=None):
+    """
+    dimensions: {'Model': 'amazon.nova-lite-v1:0', ...}
+    metrics: {'ModelLatency': (123.4, 'Milliseconds'), 'Failover': (1, 'Count')}
+    properties: 지표가 아닌 추가 필드 (로그 검색용)
+    """
+    record = {
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': METRICS_NAMESPACE,
+                'Dimensions': [list(dimensions)],
+                'Metrics': [{'Name': name, 'Unit': unit} for name, (_, unit) in metrics.items()]
+            }]
+        },
+        **dimensions,
+        **{name: value for name, (value, _) in metrics.items()},
+        **(properties or {})
+    }
+    print(json.dumps(record, ensure_ascii=False))
@@ -0,0 +1,185 @@
+"""
+칭찬 생성 모델 라우터
+
+품질 등급별 모델 체인에서 첫 모델부터 호출하고,
+- 스로틀링/서비스 오류가 나면 즉시 다음 모델로 넘어가고 (failover)
+- 모델별 제한 시간을 넘기면 그 호출은 버리고 다음 모델로 넘어가며
+- 응답이 HEDGE_DELAY_MS 안에 오지 않으면 다음 모델을 동시에 호출해 먼저 온 응답을 쓴다 (hedged request)
+
+체인의 모델은 같은 요청 스키마(Nova messages)를 써야 한다.
+호출은 model_client(model_id)로 받은 클라이언트를 쓰면 읽기 제한 시간이 모델별 제한 시간(요청 마감까지 남은 시간이
+더 짧으면 그 시간)과 같아져, 제한 시간이 지나 버린 호출도 그 무렵 끝나고 공용 스레드를 돌려준다 (botocore 기본 60초까지 붙잡지 않음).
+각 호출은 모델별 속도 제한(rate_limiter)의 토큰을 받은 뒤에 나가고, 제한 시간은 요청 마감 시간을 넘지 않는다.
+체인의 마지막 실패가 스로틀링/부하 차단이면 RateLimited를 던져 핸들러가 429로 응답한다.
+라우팅 결과와 모델별 지연시간은 EMF 지표(ModelLatency, ModelCall, Failover, Hedged)로 남긴다.
+
+설정 (JSON 환경 변수):
+- COMPLIMENT_MODEL_CHAINS: {"low": ["amazon.nova-micro-v1:0", ...], ...}
+- COMPLIMENT_MODEL_TIMEOUTS: {"amazon.nova-pro-v1:0": 10, ...} (초)
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from handlers.aws_clients import get_client
+from handlers.metrics import emit_metrics
+from handlers.rate_limiter import (
+    RateLimited, call_timeout, current_deadline, error_code, get_limiter, is_throttle, limited_call
+)
+from handlers.tracing import in_context
+
+NOVA_MICRO = 'amazon.nova-micro-v1:0'
+NOVA_LITE = 'amazon.nova-lite-v1:0'
+NOVA_PRO = 'amazon.nova-pro-v1:0'
+
+DEFAULT_MODEL_CHAINS = {
+    'low': [NOVA_MICRO, NOVA_LITE, NOVA_PRO],
+    'medium': [NOVA_LITE, NOVA_PRO],
+    'high': [NOVA_PRO, NOVA_LITE]
+}
+DEFAULT_MODEL_TIMEOUTS = {
+    NOVA_MICRO: 5,
+    NOVA_LITE: 8,
+    NOVA_PRO: 12
+}
+DEFAULT_TIMEOUT_SECONDS = 10
+
+MODEL_CHAINS = {**DEFAULT_MODEL_CHAINS, **json.loads(os.environ.get('COMPLIMENT_MODEL_CHAINS', '{}'))}
+MODEL_TIMEOUTS = {**DEFAULT_MODEL_TIMEOUTS, **json.loads(os.environ.get('COMPLIMENT_MODEL_TIMEOUTS', '{}'))}
+# 0이면 hedging 끔
+HEDGE_DELAY_MS = int(os.environ.get('COMPLIMENT_HEDGE_DELAY_MS', '3000'))
+# 한 요청에서 동시에 진행할 최대 호출 수 (원 호출 + hedge)
+MAX_IN_FLIGHT = 2
+
+# 다음 모델로 넘겨도 결과가 같을 요청 오류는 바로 실패
+NON_RETRYABLE_ERRORS = ('ValidationException',)
+
+_executor = ThreadPoolExecutor(max_workers=int(os.environ.get('MODEL_ROUTER_WORKERS', '16')))
+_stats_lock = threading.Lock()
+router_stats = {}
+
+
+class ModelTimeout(Exception):
+    pass
+
+
+def model_chain(quality_level):
+    return MODEL_CHAINS.get(quality_level) or MODEL_CHAINS['high']
+
+
+def model_timeout(model_id):
+    return MODEL_TIMEOUTS.get(model_id, DEFAULT_TIMEOUT_SECONDS)
+
+
+def model_client(model_id, region=None):
+    """읽기 제한 시간이 모델별 제한 시간(요청 마감까지 남은 시간이 더 짧으면 그 시간)인 bedrock-runtime 클라이언트"""
+    return get_client('bedrock-runtime', region, read_timeout=call_timeout(model_timeout(model_id)))
+
+
+def record_call(model_id, outcome, latency_ms):
+    """모델별 호출 결과/지연시간 기록 (프로세스 내 누적 + EMF)"""
+    with _stats_lock:
+        stats = router_stats.setdefault(model_id, {'calls': 0, 'errors': 0, 'total_ms': 0.0})
+        stats['calls'] += 1
+        stats['total_ms'] += latency_ms
+        if outcome != 'success':
+            stats['errors'] += 1
+
+    emit_metrics(
+        {'Model': model_id},
+        {'ModelLatency': (round(latency_ms, 1), 'Milliseconds'), 'ModelCall': (1, 'Count')},
+        {'Outcome': outcome}
+    )
+
+
+def _timed_call(invoke, model_id):
+    start = time.perf_counter()
+    try:
+        result = limited_call(model_id, lambda: invoke(model_id))
+    except Exception as e:
+        record_call(model_id, error_code(e), (time.perf_counter() - start) * 1000)
+        raise
+    record_call(model_id, 'success', (time.perf_counter() - start) * 1000)
+    return result
+
+
+def invoke_with_fallback(chain, invoke, hedge_delay_ms=None, route=None):
+    """
+    chain 순서대로 invoke(model_id)를 호출하여 (model_id, 결과) 반환
+    모든 모델이 실패하면 마지막 예외를 다시 던진다.
+    """
+    hedge_delay = (HEDGE_DELAY_MS if hedge_delay_ms is None else hedge_delay_ms) / 1000
+    remaining = list(chain)
+    in_flight = {}
+    last_error = None
+    failovers = 0
+    hedged = False
+
+    request_deadline = current_deadline()
+
+    def launch():
+        model_id = remaining.pop(0)
+        now = time.monotonic()
+        # 호출 스레드에서도 요청 Trace/마감 시간이 보이도록 contextvars 복사
+        future = _executor.submit(in_context(_timed_call), invoke, model_id)
+        deadline = now + model_timeout(model_id)
+        if request_deadline is not None:
+            deadline = min(deadline, request_deadline)
+        in_flight[future] = {'model': model_id, 'deadline': deadline, 'started': now}
+
+    launch()
+    while in_flight:
+        now = time.monotonic()
+        next_deadline = min(call['deadline'] for call in in_flight.values())
+        hedge_at = min(call['started'] for call in in_flight.values()) + hedge_delay
+        can_hedge = hedge_delay > 0 and remaining and len(in_flight) < MAX_IN_FLIGHT
+        wake_at = min(next_deadline, hedge_at) if can_hedge else next_deadline
+
+        done, _ = wait(list(in_flight), timeout=max(wake_at - now, 0), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            call = in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                last_error = e
+                if error_code(e) in NON_RETRYABLE_ERRORS:
+                    remaining.clear()
+                continue
+
+            emit_metrics(
+                {'Route': route or 'default'},
+                {'RouteDecision': (1, 'Count'), 'Failover': (failovers, 'Count'), 'Hedged': (int(hedged), 'Count')},
+                {'Model': call['model'], 'Chain': chain}
+            )
+            return call['model'], result
+
+        now = time.monotonic()
+        for future, call in list(in_flight.items()):
+            if now >= call['deadline']:
+                # 진행 중인 호출은 취소할 수 없으므로 결과를 버리고 다음 모델로 넘어감
+                del in_flight[future]
+                record_call(call['model'], 'Timeout', (now - call['started']) * 1000)
+                last_error = ModelTimeout(f"{call['model']} timed out after {model_timeout(call['model'])}s")
+
+        if remaining and not in_flight:
+            failovers += 1
+            launch()
+        elif can_hedge and in_flight and now >= hedge_at:
+            hedged = True
+            launch()
+
+    if is_throttle(last_error) and not isinstance(last_error, RateLimited):
+        retry_after = min(get_limiter(model_id).retry_after() for model_id in chain)
+        raise RateLimited(f"all models throttled: {', '.join(chain)}", retry_after) from last_error
+    raise last_error
+
+
+def get_router_stats():
+    with _stats_lock:
+        return {
+            model_id: {**stats, 'avg_ms': round(stats['total_ms'] / stats['calls'], 1) if stats['calls'] else 0.0}
+            for model_id, stats in router_stats.items()
+        }
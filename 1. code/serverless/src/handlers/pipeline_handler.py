@@ -0,0 +1,121 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from handlers import text_handler, image_handler, voice_handler
+from handlers.text_handler import validate_input, new_diary_id, generate_compliment, store_diary
+from handlers.image_handler import create_quokka_image
+from handlers.voice_handler import create_voice
+from handlers.audio_codec import DEFAULT_AUDIO_FORMAT, supported_formats
+from handlers.tracing import stage, annotate, in_context, record_error, error_summary
+from handlers.rate_limiter import RateLimited, too_many_requests
+
+def handle_generate_all(event, headers):
+    """
+    텍스트 -> (이미지, 음성) 통합 생성 API 핸들러
+    칭찬 생성 후 이미지/음성 생성과 일기 저장을 병렬로 실행하여
+    전체 지연시간이 이미지 + 음성이 아닌 max(이미지, 음성)이 되도록 한다.
+    """
+    try:
+        try:
+            body = json.loads(event.get('body', '{}'))
+        except json.JSONDecodeError:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({'error': '잘못된 JSON 형식입니다'})
+            }
+
+        user_type = body.get('type', '')
+        content = body.get('content', '')
+        audio_format = body.get('format', DEFAULT_AUDIO_FORMAT)
+
+        # 이 환경에서 인코딩할 수 있는 포맷만 받음 (ffmpeg가 없으면 wav만)
+        if audio_format not in supported_formats():
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({'error': f"format must be one of {', '.join(supported_formats())}"})
+            }
+
+        # 입력 검증은 한 번만 수행 (이미지/음성 단계에서 재검증하지 않음)
+        with stage('validation'):
+            error_msg, cleaned_content, quality_level = validate_input(user_type, content)
+        if error_msg:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({'error': error_msg})
+            }
+
+        user_type = user_type.lower()
+        diary_id = new_diary_id()
+        annotate(diary_id=diary_id, quality=quality_level)
+        compliment = generate_compliment(cleaned_content, user_type, quality_level)
+
+        print(f"품질 분석 결과 - diary_id: {diary_id}, quality: {quality_level}")
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            # 각 작업 스레드도 같은 요청 Trace에 단계를 기록하도록 contextvars 복사
+            image_future = executor.submit(in_context(create_quokka_image), diary_id, compliment)
+            voice_future = executor.submit(in_context(create_voice), diary_id, compliment, audio_format)
+            store_future = executor.submit(in_context(store_diary), diary_id, cleaned_content, user_type, compliment)
+
+        # 이미지/음성 중 하나가 실패해도 나머지 결과는 반환
+        errors = []
+        image_url = collect_result(image_future, 'image', errors)
+        voice_url = collect_result(voice_future, 'voice', errors)
+        collect_result(store_future, 'store', errors, required=False)
+
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': json.dumps({
+                'diary_id': diary_id,
+                'compliment': compliment,
+                'quality_analysis': {
+                    'level': quality_level,
+                    'message': f"콘텐츠 품질: {quality_level}"
+                },
+                'image_url': image_url,
+                'voice_url': voice_url,
+                'errors': errors
+            })
+        }
+
+    except RateLimited as e:
+        # 칭찬 생성이 스로틀링으로 막히면 이미지/음성도 만들 수 없으므로 바로 429
+        print(f"Pipeline rate limited: {error_summary(e)}")
+        record_error(e, 'pipeline')
+        return too_many_requests(headers, e)
+
+    except Exception as e:
+        print(f"Pipeline generation error: {error_summary(e)}")
+        record_error(e, 'pipeline')
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': json.dumps({'error': 'Internal server error'})
+        }
+
+def warm_up():
+    """통합 경로는 텍스트/이미지/음성을 모두 쓰므로 세 모듈을 모두 웜업"""
+    return {
+        'text': text_handler.warm_up(),
+        'image': image_handler.warm_up(),
+        'voice': voice_handler.warm_up()
+    }
+
+def collect_result(future, stage_name, errors, required=True):
+    """병렬 작업 결과 수집 (예외가 나거나 필수 결과가 비어 있으면 errors에 단계명 기록)"""
+    try:
+        result = future.result()
+    except Exception as e:
+        print(f"Pipeline {stage_name} error: {error_summary(e)}")
+        record_error(e, stage_name)
+        # 이미지 단계만 스로틀링된 경우 클라이언트가 해당 단계만 다시 요청할 수 있도록 구분
+        errors.append(f"{stage_name} rate limited" if isinstance(e, RateLimited) else f"{stage_name} failed")
+        return None
+    
+    if result is None and required:
+        errors.append(f"{stage_name} failed")
+    return result
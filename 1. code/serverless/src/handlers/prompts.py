@@ -0,0 +1,102 @@
+"""
+칭찬 프롬프트 템플릿
+
+템플릿은 src/prompts/compliment/{버전}.json 데이터로 관리하고, (버전, 성격 유형, 품질) 별
+고정 지시문(prefix)은 처음 쓸 때 한 번만 만들어 재사용한다. 일기 내용은 항상 프롬프트 끝에 붙으므로
+prefix 뒤에 cachePoint를 두면 Bedrock 프롬프트 캐싱을 지원하는 모델에서 prefix 토큰을 캐시에서 읽는다.
+(모델별 최소 토큰 수보다 짧은 prefix는 캐시되지 않을 뿐 요청은 그대로 처리된다.)
+
+A/B 테스트: PROMPT_VERSIONS="v1:90,v2:10" 처럼 가중치를 주면 일기 내용 해시로 버전을 고정 배정한다.
+새 버전은 JSON 파일만 추가하면 되고 코드 변경은 필요 없다.
+"""
+import hashlib
+import json
+import os
+from functools import lru_cache
+
+PROMPT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'prompts', 'compliment')
+# "버전" 또는 "버전:가중치,버전:가중치"
+PROMPT_VERSIONS = os.environ.get('PROMPT_VERSIONS', 'v1')
+# 프롬프트 캐싱(cachePoint)을 지원하는 모델 ID 접두사 (InvokeModel Nova 메시지 스키마)
+PROMPT_CACHE_MODEL_PREFIXES = ('amazon.nova-', 'us.amazon.nova-')
+
+
+def parse_version_weights(spec):
+    """'v1:90,v2:10' -> [('v1', 90), ('v2', 10)] (가중치 생략 시 1)"""
+    weights = []
+    for part in spec.split(','):
+        part = part.strip()
+        if not part:
+            continue
+        version, _, weight = part.partition(':')
+        weights.append((version.strip(), int(weight) if weight else 1))
+    if not weights or sum(weight for _, weight in weights) <= 0:
+        raise Exception(f"Invalid PROMPT_VERSIONS: {spec}")
+    return weights
+
+
+VERSION_WEIGHTS = parse_version_weights(PROMPT_VERSIONS)
+
+
+@lru_cache(maxsize=None)
+def load_template(version):
+    """버전 템플릿 JSON 로드 (컨테이너당 한 번)"""
+    path = os.path.join(PROMPT_DIR, f"{version}.json")
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        raise Exception(f"Prompt template not found: {version}")
+
+
+def select_version(key):
+    """A/B 버전 선택 - 같은 key(일기 내용)는 항상 같은 버전"""
+    if len(VERSION_WEIGHTS) == 1:
+        return VERSION_WEIGHTS[0][0]
+
+    total = sum(weight for _, weight in VERSION_WEIGHTS)
+    bucket = int.from_bytes(hashlib.sha256(key.encode('utf-8')).digest()[:4], 'big') % total
+    for version, weight in VERSION_WEIGHTS:
+        if bucket < weight:
+            return version
+        bucket -= weight
+    return VERSION_WEIGHTS[-1][0]
+
+
+@lru_cache(maxsize=None)
+def static_prefix(version, user_type, quality_level):
+    """일기 내용을 제외한 고정 지시문"""
+    template = load_template(version)
+    return '\n'.join(template['instruction']).format(
+        personality='\n'.join(template['personality'][user_type]),
+        length='\n'.join(template['length'][quality_level]),
+        quality='\n'.join(template['quality'][user_type][quality_level])
+    )
+
+
+def content_suffix(version, content):
+    """프롬프트 끝에 붙는 일기 내용 부분"""
+    return '\n'.join(load_template(version)['content']).format(content=content)
+
+
+def supports_prompt_cache(model_id):
+    return model_id.startswith(PROMPT_CACHE_MODEL_PREFIXES)
+
+
+def build_prompt_blocks(content, user_type, quality_level, model_id, version=None):
+    """
+    메시지 content 블록 생성: [고정 지시문, (cachePoint), 일기 내용]
+    반환: (버전, 블록 리스트, inferenceConfig)
+    """
+    version = version or select_version(content)
+    blocks = [{'text': static_prefix(version, user_type, quality_level)}]
+    if supports_prompt_cache(model_id):
+        blocks.append({'cachePoint': {'type': 'default'}})
+    blocks.append({'text': content_suffix(version, content)})
+    return version, blocks, dict(load_template(version)['inference'])
+
+
+def render_prompt(content, user_type, quality_level, version=None):
+    """블록을 이어 붙인 전체 프롬프트 문자열"""
+    version = version or select_version(content)
+    return static_prefix(version, user_type, quality_level) + content_suffix(version, content)
@@ -0,0 +1,321 @@
+"""
+Bedrock 호출 속도 제한 (모델별 AIMD 토큰 버킷 + 지터 백오프 + 요청 마감 시간)
+
+- 모델 id마다 토큰 버킷 하나를 컨테이너 전체(모든 요청/스레드)가 공유한다.
+  첫 ThrottlingException 전에는 제한하지 않고(초기값을 설정한 모델 제외), 스로틀링을 받으면
+  최근 1초 전송량(최소 BEDROCK_DEFAULT_RPS)의 절반에서 제한을 시작한다. 이후 성공하면 초당 허용량을 조금씩 올리고(additive increase), 스로틀링이면 절반으로 줄인다
+  (multiplicative decrease, cooldown 안의 연속 스로틀링은 한 번만 반영).
+- 토큰을 기다려야 하는 시간이 MAX_QUEUE_WAIT_MS나 요청 마감 시간을 넘으면 기다리지 않고
+  RateLimited(retry_after)를 던진다. 핸들러는 이를 429 + Retry-After로 바로 응답한다 (느린 타임아웃 대신 빠른 거절).
+- 요청 마감 시간은 app에서 context.get_remaining_time_in_millis() - DEADLINE_MARGIN_MS로 정하며,
+  contextvars로 전달되므로 tracing.in_context로 감싼 작업 스레드에서도 같은 마감 시간을 본다.
+- 마감 시간은 토큰 대기뿐 아니라 토큰을 받은 뒤의 호출에도 적용된다: call_timeout()으로 남은 시간 안의
+  읽기 제한 시간을 구해 클라이언트에 넘기므로(aws_clients.get_client(read_timeout=...)), 마감 직전에 토큰을 받은
+  요청은 Lambda 제한 시간까지 매달리지 않고 빨리 실패한다.
+- call_with_retry()는 한 모델만 쓰는 호출(Nova Canvas)에 full jitter 지수 백오프 재시도를 적용한다.
+  (칭찬 모델은 model_router가 스로틀링 시 다음 모델로 넘어가므로 재시도 대신 토큰만 받는다)
+
+botocore 자체 재시도는 bedrock-runtime 클라이언트에서 끄고(aws_clients), 재시도는 여기서만 한다.
+
+설정:
+- BEDROCK_RATE_LIMITS: 모델별 초기 초당 요청 수 JSON (없는 모델은 첫 스로틀링까지 제한 없음)
+- BEDROCK_DEFAULT_RPS: 제한 없이 보내다 첫 스로틀링을 받을 때 기준 속도의 최소값
+- BEDROCK_MIN_RPS / BEDROCK_MAX_RPS / BEDROCK_BURST
+- BEDROCK_MAX_ATTEMPTS, BEDROCK_BACKOFF_BASE_MS, BEDROCK_BACKOFF_CAP_MS
+- MAX_QUEUE_WAIT_MS, DEADLINE_MARGIN_MS, MIN_CALL_BUDGET_MS
+"""
+import contextvars
+import json
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from handlers.metrics import emit_metrics
+
+RATE_LIMITS = json.loads(os.environ.get('BEDROCK_RATE_LIMITS', '{}'))
+DEFAULT_RPS = float(os.environ.get('BEDROCK_DEFAULT_RPS', '10'))
+MIN_RPS = float(os.environ.get('BEDROCK_MIN_RPS', '0.5'))
+MAX_RPS = float(os.environ.get('BEDROCK_MAX_RPS', '50'))
+BURST = float(os.environ.get('BEDROCK_BURST', '5'))
+# 성공 1회당 증가량은 ADDITIVE_INCREASE / 현재 rps (최대 속도로 1초 동안 성공하면 약 ADDITIVE_INCREASE 증가)
+ADDITIVE_INCREASE = 1.0
+MULTIPLICATIVE_DECREASE = 0.5
+DECREASE_COOLDOWN_SECONDS = 1.0
+
+MAX_ATTEMPTS = int(os.environ.get('BEDROCK_MAX_ATTEMPTS', '3'))
+BACKOFF_BASE_MS = int(os.environ.get('BEDROCK_BACKOFF_BASE_MS', '200'))
+BACKOFF_CAP_MS = int(os.environ.get('BEDROCK_BACKOFF_CAP_MS', '2000'))
+
+# 토큰을 이보다 오래 기다려야 하면 바로 거절
+MAX_QUEUE_WAIT_MS = int(os.environ.get('MAX_QUEUE_WAIT_MS', '1000'))
+# 응답 작성/로그 출력용으로 남겨 둘 Lambda 실행 시간
+DEADLINE_MARGIN_MS = int(os.environ.get('DEADLINE_MARGIN_MS', '1000'))
+# 남은 시간이 이보다 적으면 모델을 호출하지 않음
+MIN_CALL_BUDGET_MS = int(os.environ.get('MIN_CALL_BUDGET_MS', '1000'))
+
+THROTTLE_ERRORS = ('ThrottlingException', 'TooManyRequestsException', 'ServiceQuotaExceededException')
+RETRYABLE_ERRORS = THROTTLE_ERRORS + ('ServiceUnavailableException', 'ModelNotReadyException', 'InternalServerException')
+
+_deadline = contextvars.ContextVar('deadline', default=None)
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+class RateLimited(Exception):
+    """스로틀링/부하 차단으로 요청을 처리하지 않음 (retry_after초 뒤 재시도 권장)"""
+
+    def __init__(self, message, retry_after=1, model_id=None):
+        super().__init__(message)
+        self.retry_after = max(1, int(math.ceil(retry_after)))
+        self.model_id = model_id
+
+
+def error_code(error):
+    """botocore ClientError면 오류 코드, 아니면 예외 클래스 이름 (app 콜드 스타트에 botocore를 끌어오지 않도록 덕 타이핑)"""
+    response = getattr(error, 'response', None)
+    if isinstance(response, dict) and 'Error' in response:
+        return response['Error'].get('Code', 'ClientError')
+    return type(error).__name__
+
+
+def is_throttle(error):
+    return isinstance(error, RateLimited) or error_code(error) in THROTTLE_ERRORS
+
+
+@contextmanager
+def request_deadline(context):
+    """Lambda context의 남은 실행 시간으로 요청 마감 시간 설정 (context가 없으면 마감 없음)"""
+    deadline = None
+    remaining = getattr(context, 'get_remaining_time_in_millis', None)
+    if callable(remaining):
+        deadline = time.monotonic() + (remaining() - DEADLINE_MARGIN_MS) / 1000
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def current_deadline():
+    """monotonic 기준 마감 시각 (없으면 None)"""
+    return _deadline.get()
+
+
+def remaining_seconds():
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def call_timeout(limit_seconds):
+    """호출 하나의 읽기 제한 시간 (정수 초): limit_seconds와 요청 마감까지 남은 시간 중 짧은 쪽, 최소 1초"""
+    timeout = math.ceil(limit_seconds)
+    remaining = remaining_seconds()
+    if remaining is not None:
+        timeout = min(timeout, int(remaining))
+    return max(timeout, 1)
+
+
+class AdaptiveRateLimiter:
+    """AIMD로 속도를 조절하는 토큰 버킷 (스레드 안전, rate가 None이면 첫 스로틀링까지 제한 없음)"""
+
+    def __init__(self, model_id, rate=None, min_rate=MIN_RPS, max_rate=MAX_RPS, burst=BURST,
+                 start_rate=DEFAULT_RPS, clock=time.monotonic, sleep=time.sleep):
+        self.model_id = model_id
+        self.rate = rate
+        self.start_rate = start_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = burst
+        self._updated = clock()
+        self._last_decrease = None
+        # 최근 1초 안에 토큰을 받은 시각 (제한 전 첫 스로틀링의 기준 속도)
+        self._sent = deque()
+        self._lock = threading.Lock()
+        self.stats = {'acquired': 0, 'waited_ms': 0.0, 'shed': 0, 'throttled': 0}
+
+    def _refill(self, now):
+        if self.rate is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _record_send(self, now):
+        self._sent.append(now)
+        while self._sent and self._sent[0] <= now - 1:
+            self._sent.popleft()
+
+    def retry_after(self):
+        """토큰 하나가 생길 때까지의 초"""
+        with self._lock:
+            if self.rate is None:
+                return 0.0
+            self._refill(self.clock())
+            return max((1 - self.tokens) / self.rate, 0.0)
+
+    def acquire(self, deadline=None):
+        """
+        토큰 하나를 받음 (필요하면 기다림)
+        기다릴 시간이 MAX_QUEUE_WAIT_MS 또는 마감 시간을 넘으면 RateLimited
+        """
+        now = self.clock()
+        max_wait = MAX_QUEUE_WAIT_MS / 1000
+        if deadline is not None:
+            budget = deadline - now - MIN_CALL_BUDGET_MS / 1000
+            if budget < 0:
+                self._shed('deadline')
+                raise RateLimited(f"{self.model_id}: not enough time left for the call", 1, self.model_id)
+            max_wait = min(max_wait, budget)
+
+        with self._lock:
+            self._record_send(now)
+            if self.rate is None:
+                self.stats['acquired'] += 1
+                return
+            self._refill(now)
+            wait = max((1 - self.tokens) / self.rate, 0.0)
+            if wait > max_wait:
+                retry_after = wait
+            else:
+                # 토큰을 미리 차감(음수 허용)해 기다리는 동안 다른 스레드가 가져가지 못하게 함
+                self.tokens -= 1
+                self.stats['acquired'] += 1
+                self.stats['waited_ms'] += wait * 1000
+                retry_after = None
+
+        if retry_after is not None:
+            self._shed('rate')
+            raise RateLimited(f"{self.model_id}: rate limit ({self.rate:.2f} rps)", retry_after, self.model_id)
+        if wait > 0:
+            self.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            if self.rate is not None:
+                self.rate = min(self.max_rate, self.rate + ADDITIVE_INCREASE / self.rate)
+
+    def on_throttle(self):
+        now = self.clock()
+        with self._lock:
+            self.stats['throttled'] += 1
+            if self._last_decrease is not None and now - self._last_decrease < DECREASE_COOLDOWN_SECONDS:
+                return
+            self._last_decrease = now
+            self._refill(now)
+            # 제한 전이면 최근 1초 전송량을 현재 속도로 보고 시작 (전송량이 적으면 start_rate, 재시도할 여유를 남김)
+            current = self.rate if self.rate is not None else min(self.max_rate, max(len(self._sent), self.start_rate))
+            self.rate = max(self.min_rate, current * MULTIPLICATIVE_DECREASE)
+            # 남은 버스트도 비워 이어지는 요청이 한꺼번에 나가지 않게 함
+            self.tokens = min(self.tokens, 0.0)
+            rate = self.rate
+        emit_metrics({'Model': self.model_id}, {'Throttled': (1, 'Count'), 'AllowedRps': (round(rate, 2), 'Count/Second')})
+
+    def _shed(self, reason):
+        with self._lock:
+            self.stats['shed'] += 1
+        emit_metrics({'Model': self.model_id}, {'Shed': (1, 'Count')}, {'Reason': reason})
+
+    def snapshot(self):
+        with self._lock:
+            self._refill(self.clock())
+            return {
+                **self.stats,
+                'rps': None if self.rate is None else round(self.rate, 2),
+                'tokens': round(self.tokens, 2)
+            }
+
+
+def get_limiter(model_id):
+    limiter = _limiters.get(model_id)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(model_id)
+            if limiter is None:
+                limiter = _limiters[model_id] = AdaptiveRateLimiter(model_id, rate=RATE_LIMITS.get(model_id))
+    return limiter
+
+
+def get_limiter_stats():
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.model_id: limiter.snapshot() for limiter in limiters}
+
+
+def reset_limiters():
+    """학습된 속도를 모두 버리고 초기 설정으로 (벤치마크 시나리오 격리용)"""
+    with _limiters_lock:
+        _limiters.clear()
+
+
+def limited_call(model_id, fn):
+    """토큰을 받아 fn() 한 번 호출하고 결과(성공/스로틀링)를 limiter에 반영"""
+    limiter = get_limiter(model_id)
+    limiter.acquire(current_deadline())
+    try:
+        result = fn()
+    except Exception as e:
+        if is_throttle(e):
+            limiter.on_throttle()
+        raise
+    limiter.on_success()
+    return result
+
+
+def backoff_seconds(attempt):
+    """full jitter: 0 ~ min(cap, base * 2^attempt)"""
+    return random.uniform(0, min(BACKOFF_CAP_MS, BACKOFF_BASE_MS * (2 ** attempt)) / 1000)
+
+
+def call_with_retry(model_id, fn, max_attempts=None):
+    """
+    limited_call + 재시도 가능한 오류(스로틀링, 일시적 서비스 오류)에 지터 백오프 재시도
+    재시도를 다 쓰거나 마감 시간 안에 다시 시도할 수 없으면,
+    스로틀링이었으면 RateLimited, 그 외에는 마지막 오류를 던진다.
+    """
+    max_attempts = max_attempts or MAX_ATTEMPTS
+    last_error = None
+    for attempt in range(max_attempts):
+        try:
+            return limited_call(model_id, fn)
+        except RateLimited:
+            raise
+        except Exception as e:
+            if error_code(e) not in RETRYABLE_ERRORS:
+                raise
+            last_error = e
+
+        delay = backoff_seconds(attempt)
+        deadline = current_deadline()
+        if attempt == max_attempts - 1 or (
+                deadline is not None and time.monotonic() + delay + MIN_CALL_BUDGET_MS / 1000 > deadline):
+            break
+        time.sleep(delay)
+
+    if is_throttle(last_error):
+        raise RateLimited(
+            f"{model_id}: throttled after {attempt + 1} attempts",
+            max(get_limiter(model_id).retry_after(), backoff_seconds(attempt + 1)),
+            model_id
+        ) from last_error
+    raise last_error
+
+
+def too_many_requests(headers, error):
+    """RateLimited -> 429 응답 (브라우저에서 Retry-After를 읽을 수 있도록 노출)"""
+    return {
+        'statusCode': 429,
+        'headers': {
+            **headers,
+            'Retry-After': str(error.retry_after),
+            'Access-Control-Expose-Headers': 'Retry-After'
+        },
+        'body': json.dumps({
+            'error': '요청이 많아 잠시 후 다시 시도해주세요',
+            'retry_after': error.retry_after
+        })
+    }
@@ -0,0 +1,208 @@
+"""
+칭찬 결과 의미 캐시 (거의 같은 일기 재사용)
+
+"오늘 피곤했다", "오늘 피곤했다ㅠㅠ" 처럼 짧고 정형화된 일기가 많으므로,
+정규화한 일기 내용 + 성격 유형 + 품질 등급(+ 프롬프트 버전)으로 이미 만든 칭찬을 재사용한다.
+
+- 정확 일치: 정규화 문자열(NFC, 소문자, 영숫자/한글만)의 해시
+- 근사 일치: 문자 2-gram 집합의 MinHash 서명을 LSH 밴드로 색인해 후보를 찾고,
+  실제 Jaccard 유사도가 similarity 이상인 가장 가까운 항목을 사용
+- TTL이 지난 항목은 조회 시 버리고, maxsize를 넘으면 가장 오래 안 쓴 항목부터 제거 (LRU)
+- variants > 1 이면 항목당 칭찬을 여러 개 모아 돌아가며 반환 (같은 문장 반복을 줄임)
+
+프로세스 내 캐시라 컨테이너마다 따로 쌓인다. numpy 없이 순수 파이썬으로 구현해 텍스트 경로 콜드 스타트에 영향이 없다.
+"""
+import random
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict
+
+from handlers.cache import content_hash
+
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERMUTATIONS // LSH_BANDS
+SHINGLE_SIZE = 2
+# 2^61 - 1 (메르센 소수) 기반 범용 해시 a*x + b mod p
+MINHASH_PRIME = (1 << 61) - 1
+MINHASH_SEED = 20240901
+
+NON_WORD_PATTERN = re.compile(r'[\W_]+')
+
+_rng = random.Random(MINHASH_SEED)
+MINHASH_PARAMS = [
+    (_rng.randrange(1, MINHASH_PRIME), _rng.randrange(0, MINHASH_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+
+def normalize_text(text):
+    """NFC 정규화, 소문자화, 공백/기호/이모지 제거"""
+    return NON_WORD_PATTERN.sub('', unicodedata.normalize('NFC', text).lower())
+
+
+def shingles(normalized):
+    """문자 n-gram 집합 (n보다 짧으면 문자열 자체)"""
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized}
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(shingle_set):
+    hashed = [zlib.crc32(shingle.encode('utf-8')) for shingle in shingle_set]
+    return tuple(
+        min((a * value + b) % MINHASH_PRIME for value in hashed)
+        for a, b in MINHASH_PARAMS
+    )
+
+
+def band_keys(signature):
+    return [(band, signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]) for band in range(LSH_BANDS)]
+
+
+def jaccard(left, right):
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+class SemanticCache:
+    """정확/근사 일치 + TTL/LRU 칭찬 캐시 (스레드 안전)"""
+
+    def __init__(self, maxsize=512, ttl_seconds=86400, similarity=0.7, variants=1, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.similarity = similarity
+        self.variants = variants
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._bands = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'exact_hits': 0,
+            'near_hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expired': 0,
+            'saved_ms': 0.0
+        }
+        # 미스 시 실제 생성 시간의 지수 이동 평균 (히트로 절약한 시간 추정용)
+        self._generation_ms = None
+
+    def _partition(self, user_type, quality_level, version):
+        return (user_type, quality_level, version)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        for band_key in band_keys(entry['signature']):
+            bucket = self._bands.get((entry['partition'], band_key))
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._bands[(entry['partition'], band_key)]
+
+    def _live(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if now - entry['created'] > self.ttl_seconds:
+            self._remove(key)
+            self._stats['expired'] += 1
+            return None
+        return entry
+
+    def _near_match(self, partition, shingle_set, signature, now):
+        candidates = set()
+        for band_key in band_keys(signature):
+            candidates.update(self._bands.get((partition, band_key), ()))
+
+        best_key, best_score = None, self.similarity
+        for key in candidates:
+            entry = self._live(key, now)
+            if entry is None:
+                continue
+            score = jaccard(shingle_set, entry['shingles'])
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def lookup(self, content, user_type, quality_level, version=None):
+        """캐시된 칭찬 반환, 없으면 None (variants를 다 모으지 못한 항목은 미스로 보고 새로 생성하게 함)"""
+        start = time.perf_counter()
+        normalized = normalize_text(content)
+        partition = self._partition(user_type, quality_level, version)
+        key = content_hash(normalized, *partition)
+
+        with self._lock:
+            now = self.clock()
+            entry = self._live(key, now)
+            hit_type = 'exact_hits'
+            if entry is None:
+                shingle_set = shingles(normalized)
+                near_key = self._near_match(partition, shingle_set, minhash_signature(shingle_set), now)
+                entry = self._entries.get(near_key) if near_key else None
+                hit_type = 'near_hits'
+
+            if entry is None or len(entry['compliments']) < self.variants:
+                self._stats['misses'] += 1
+                return None
+
+            self._entries.move_to_end(entry['key'])
+            compliment = entry['compliments'][entry['served'] % len(entry['compliments'])]
+            entry['served'] += 1
+
+            self._stats[hit_type] += 1
+            if self._generation_ms is not None:
+                lookup_ms = (time.perf_counter() - start) * 1000
+                self._stats['saved_ms'] += max(self._generation_ms - lookup_ms, 0.0)
+            return compliment
+
+    def store(self, content, user_type, quality_level, compliment, version=None, generation_ms=None):
+        """생성한 칭찬 저장 (같은 정규화 키가 있으면 variants 개수까지 추가)"""
+        normalized = normalize_text(content)
+        partition = self._partition(user_type, quality_level, version)
+        key = content_hash(normalized, *partition)
+
+        with self._lock:
+            if generation_ms is not None:
+                self._generation_ms = generation_ms if self._generation_ms is None \
+                    else 0.8 * self._generation_ms + 0.2 * generation_ms
+
+            entry = self._live(key, self.clock())
+            if entry is not None:
+                if compliment not in entry['compliments'] and len(entry['compliments']) < self.variants:
+                    entry['compliments'].append(compliment)
+                self._entries.move_to_end(key)
+                return
+
+            shingle_set = shingles(normalized)
+            signature = minhash_signature(shingle_set)
+            self._entries[key] = {
+                'key': key,
+                'partition': partition,
+                'shingles': shingle_set,
+                'signature': signature,
+                'compliments': [compliment],
+                'served': 0,
+                'created': self.clock()
+            }
+            for band_key in band_keys(signature):
+                self._bands.setdefault((partition, band_key), set()).add(key)
+
+            while len(self._entries) > self.maxsize:
+                self._remove(next(iter(self._entries)))
+                self._stats['evictions'] += 1
+
+    def stats(self):
+        with self._lock:
+            hits = self._stats['exact_hits'] + self._stats['near_hits']
+            lookups = hits + self._stats['misses']
+            return {
+                **self._stats,
+                'saved_ms': round(self._stats['saved_ms'], 1),
+                'size': len(self._entries),
+                'hit_rate': round(hits / lookups, 3) if lookups else 0.0
+            }
@@ -0,0 +1,127 @@
+"""
+쿼카 음성 합성용 사운드 뱅크
+
+sources/high/NN.padata(MP3) 20개를 빌드 시점에 하나의 raw PCM 파일(.pcm)과
+오프셋 인덱스(.json)로 변환해두고, 런타임에는 mmap으로 열어 자음별 클립을
+복사 없이(memoryview 슬라이스) 꺼내 쓴다. 런타임 로딩은 ffmpeg에 의존하지 않는다.
+
+빌드:
+    python src/handlers/sound_bank.py
+"""
+import json
+import mmap
+import os
+import shutil
+import subprocess
+import sys
+
+char_list = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ', ' ']
+
+# 모든 클립을 하나의 포맷으로 맞춰 저장 (16bit mono 44.1kHz)
+BANK_FORMAT = {
+    'frame_rate': 44100,
+    'channels': 1,
+    'sample_width': 2
+}
+BANK_VERSION = 1
+
+PADATA_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'sources', 'high')
+BANK_DIR = os.path.join(os.path.dirname(__file__), '..', 'sounds')
+BANK_NAME = 'high'
+
+
+def bank_paths(bank_dir=BANK_DIR, name=BANK_NAME):
+    """사운드 뱅크 PCM/인덱스 파일 경로 반환"""
+    return (
+        os.path.join(bank_dir, f'{name}.pcm'),
+        os.path.join(bank_dir, f'{name}.json')
+    )
+
+
+def decode_padata(path):
+    """
+    .padata(MP3) 파일을 ffmpeg로 디코딩하여 BANK_FORMAT의 raw PCM bytes로 반환
+    (빌드 시점 또는 뱅크가 없을 때의 폴백 경로에서만 사용)
+    """
+    ffmpeg = shutil.which('ffmpeg')
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg를 찾을 수 없습니다")
+
+    result = subprocess.run(
+        [
+            ffmpeg, '-nostdin', '-loglevel', 'error', '-i', path,
+            '-f', f"s{BANK_FORMAT['sample_width'] * 8}le",
+            '-ac', str(BANK_FORMAT['channels']),
+            '-ar', str(BANK_FORMAT['frame_rate']),
+            'pipe:1'
+        ],
+        capture_output=True,
+        check=True
+    )
+    return result.stdout
+
+
+def build_sound_bank(padata_dir=PADATA_DIR, bank_dir=BANK_DIR, name=BANK_NAME):
+    """
+    padata 파일들을 하나의 PCM blob + 오프셋 인덱스로 변환
+    인덱스의 clips는 char_list 문자 -> [offset, length] (byte 단위)
+    """
+    pcm_path, index_path = bank_paths(bank_dir, name)
+    os.makedirs(bank_dir, exist_ok=True)
+
+    clips = {}
+    offset = 0
+    with open(pcm_path, 'wb') as pcm_file:
+        for idx, item in enumerate(char_list):
+            padata_file = os.path.join(padata_dir, f'{idx + 1:02d}.padata')
+            if not os.path.exists(padata_file):
+                continue
+
+            raw_data = decode_padata(padata_file)
+            pcm_file.write(raw_data)
+            clips[item] = [offset, len(raw_data)]
+            offset += len(raw_data)
+
+    index = {
+        'version': BANK_VERSION,
+        'format': BANK_FORMAT,
+        'clips': clips
+    }
+    with open(index_path, 'w', encoding='utf-8') as index_file:
+        json.dump(index, index_file, ensure_ascii=False)
+
+    return index
+
+
+def load_sound_bank(bank_dir=BANK_DIR, name=BANK_NAME):
+    """
+    빌드된 사운드 뱅크를 mmap으로 열어 (format, {문자: memoryview}) 반환
+    뱅크 파일이 없거나 비어 있으면 None
+    """
+    pcm_path, index_path = bank_paths(bank_dir, name)
+    if not os.path.exists(pcm_path) or not os.path.exists(index_path):
+        return None
+
+    with open(index_path, encoding='utf-8') as index_file:
+        index = json.load(index_file)
+
+    if index.get('version') != BANK_VERSION or os.path.getsize(pcm_path) == 0:
+        return None
+
+    # mmap은 파일을 닫아도 유지되며, 컨테이너 수명 동안 재사용된다
+    with open(pcm_path, 'rb') as pcm_file:
+        bank = mmap.mmap(pcm_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(bank)
+    clips = {
+        item: view[offset:offset + length]
+        for item, (offset, length) in index['clips'].items()
+    }
+    return index['format'], clips
+
+
+if __name__ == '__main__':
+    result = build_sound_bank()
+    total = sum(length for _, length in result['clips'].values())
+    print(f"사운드 뱅크 생성 완료: {len(result['clips'])}개 클립, {total} bytes")
+    sys.exit(0 if result['clips'] else 1)
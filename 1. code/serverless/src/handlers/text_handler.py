@@ -1,104 +1,120 @@
 import json
-import boto3
-import uuid
 import os
-import re
-import html
-from datetime import datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
 from botocore.exceptions import ClientError
+from handlers.aws_clients import get_client
+from handlers.text_validation import validate_input
+from handlers.prompts import build_prompt_blocks, render_prompt, select_version
+from handlers.semantic_cache import SemanticCache
+from handlers.model_router import MODEL_CHAINS, model_chain, model_client, invoke_with_fallback
+from handlers.diary_store import new_diary_id, diary_key, diary_record
+from handlers.diary_writer import DiaryBatchWriter, flush_on_shutdown
+from handlers.tracing import stage, set_size, annotate, in_context
+from handlers.rate_limiter import RateLimited, too_many_requests
 
-bedrock_client = boto3.client('bedrock-runtime')
-s3_client = boto3.client('s3')
+# 배치 요청 한 번에 받을 최대 일기 수 / Bedrock 동시 호출 수
+MAX_BATCH_ENTRIES = int(os.environ.get('TEXT_BATCH_MAX_ENTRIES', '10'))
+BATCH_CONCURRENCY = int(os.environ.get('TEXT_BATCH_CONCURRENCY', '4'))
 
-# 간단하고 안전한 스팸 패턴
-SIMPLE_SPAM_CHECKS = ['ㅋㅋㅋㅋㅋ', '!!!!!!', '??????', 'ㅎㅎㅎㅎㅎ']
+# 거의 같은 일기의 칭찬 재사용 (선택, 기본 꺼짐)
+COMPLIMENT_CACHE_ENABLED = os.environ.get('COMPLIMENT_CACHE_ENABLED', 'false') == 'true'
+compliment_cache = SemanticCache(
+    maxsize=int(os.environ.get('COMPLIMENT_CACHE_SIZE', '512')),
+    ttl_seconds=int(os.environ.get('COMPLIMENT_CACHE_TTL', '86400')),
+    similarity=float(os.environ.get('COMPLIMENT_CACHE_SIMILARITY', '0.7')),
+    variants=int(os.environ.get('COMPLIMENT_CACHE_VARIANTS', '1'))
+) if COMPLIMENT_CACHE_ENABLED else None
 
-def analyze_content_quality(content):
-    """최적화된 안전한 품질 분석"""
-    
-    # 1. 기본 검증
-    if not content or not isinstance(content, str):
-        return "error", "잘못된 입력"
-    
-    content_clean = content.strip()
-    if not content_clean:
-        return "empty", "빈 내용"
-    
+# 일기 저장 방식: object(기본, 일기마다 put_object) / batch(버퍼에 모아 NDJSON gzip 배치로 백그라운드 업로드)
+DIARY_WRITE_MODE = os.environ.get('DIARY_WRITE_MODE', 'object')
+diary_writer = None
+if DIARY_WRITE_MODE == 'batch':
+    diary_writer = DiaryBatchWriter(
+        lambda: get_client('s3'),
+        os.environ.get('S3_BUCKET'),
+        max_records=int(os.environ.get('DIARY_BATCH_MAX_RECORDS', '100')),
+        max_bytes=int(os.environ.get('DIARY_BATCH_MAX_BYTES', str(1024 * 1024))),
+        max_age_seconds=float(os.environ.get('DIARY_BATCH_MAX_AGE_SECONDS', '30'))
+    )
+    flush_on_shutdown(diary_writer)
+
+def handle_generate_text(event, headers):
+    """
+    칭찬 텍스트 생성 API 핸들러
+    """
     try:
-        # 2. 간단한 문자 수 계산 (정규식 없이)
-        char_count = 0
-        for char in content_clean:
-            if ('가' <= char <= '힣') or char.isalnum():
-                char_count += 1
+        error_msg, user_type, cleaned_content, quality_level = parse_text_request(event.get('body', '{}'))
+        if error_msg:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({'error': error_msg})
+            }
         
-        # 3. 단순 문자열 스팸 검사
-        for spam_pattern in SIMPLE_SPAM_CHECKS:
-            if spam_pattern in content_clean:
-                return "spam", "무의미한 반복 패턴 감지"
+        diary_id = new_diary_id()
+        annotate(diary_id=diary_id, quality=quality_level)
+        
+        # 품질 분석 결과 로깅
+        print(f"품질 분석 결과 - diary_id: {diary_id}, quality: {quality_level}")
+        
+        # 품질 기반 Bedrock 칭찬 메시지 생성
+        compliment = generate_compliment(cleaned_content, user_type, quality_level)
+        
+        store_diary(diary_id, cleaned_content, user_type, compliment)
+        
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': json.dumps({
+                'diary_id': diary_id,
+                'compliment': compliment,
+                'quality_analysis': {
+                    'level': quality_level,
+                    'message': f"콘텐츠 품질: {quality_level}"
+                }
+            })
+        }
+        
+    except RateLimited as e:
+        print(f"Text generation rate limited: {str(e)}")
+        return too_many_requests(headers, e)
         
-        # 4. 길이 기반 등급
-        if char_count > 80:
-            return "high", "상세한 내용"
-        elif char_count > 30:
-            return "medium", "적당한 내용"
-        elif char_count < 10:
-            return "low", "내용이 너무 짧습니다"
-        else:
-            return "medium", "적당한 내용"
-            
     except Exception as e:
-        # 최종 안전망 - 기본값 반환
-        return "medium", "기본 품질"
-
-def validate_input(user_type, content):
-    """기본 입력 검증 함수"""
-    if not isinstance(user_type, str) or not isinstance(content, str):
-        return "입력값은 문자열이어야 합니다", None, None
-
-    if not user_type or user_type.lower() not in ['t', 'f']:
-        return "사용자 타입은 't' 또는 'f'여야 합니다", None, None
+        print(f"Text generation error: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': headers,
+            'body': json.dumps({'error': 'Internal server error'})
+        }
 
-    # 안전한 HTML 처리 (간단한 태그 제거)
+def parse_text_request(raw_body):
+    """
+    /generate/text 요청 본문 파싱 + 입력 검증/품질 분석 (일반/스트리밍 엔드포인트 공용)
+    반환: (에러 메시지 또는 None, 소문자 사용자 타입, 정리된 내용, 품질 등급)
+    """
     try:
-        content_clean = html.unescape(content)
-        content_clean = re.sub(r'<[^>]*?>', '', content_clean)
-        content_clean = re.sub(r'\s+', ' ', content_clean).strip()
-    except Exception:
-        content_clean = content.strip()
-
-    # 기본 길이 검증
-    if len(content_clean.replace(' ', '')) < 10:
-        return "일기 내용은 공백을 제외하고 최소 10자 이상이어야 합니다", None, None
-
-    if len(content_clean) > 1000:
-        return "일기 내용은 최대 1000자까지 입력 가능합니다", None, None
-
-    # 의미있는 내용 검증
-    if not re.search(r'[가-힣a-zA-Z]', content_clean):
-        return "의미있는 내용을 입력해주세요 (한글 또는 영문 포함)", None, None
-
-    # 간단한 개인정보 체크
-    if re.search(r'01[0-9][-\s]?\d{3,4}[-\s]?\d{4}', content_clean):
-        return "개인정보 보호를 위해 전화번호는 입력하지 말아주세요", None, None
+        body = json.loads(raw_body or '{}')
+    except json.JSONDecodeError:
+        return '잘못된 JSON 형식입니다', None, None, None
     
-    if re.search(r'\S+@\S+\.\S+', content_clean):
-        return "개인정보 보호를 위해 이메일은 입력하지 말아주세요", None, None
-
-    # 품질 분석 수행
-    quality_level, quality_reason = analyze_content_quality(content_clean)
+    user_type = body.get('type', '')
+    content = body.get('content', '')
     
-    # 스팸으로 판정된 경우 거부
-    if quality_level == "spam":
-        return quality_reason, None, None
+    with stage('validation'):
+        error_msg, cleaned_content, quality_level = validate_input(user_type, content)
+    if error_msg:
+        return error_msg, None, None, None
+    return None, user_type.lower(), cleaned_content, quality_level
 
-    return None, content_clean, quality_level
-
-def handle_generate_text(event, headers):
+def handle_generate_text_batch(event, headers):
     """
-    칭찬 텍스트 생성 API 핸들러
+    칭찬 텍스트 일괄 생성 API 핸들러 (오프라인에서 쌓인 일기 동기화용)
+    body: {"entries": [{"type": "t", "content": "..."}, ...]}
+    모든 항목을 먼저 검증하고, 통과한 항목만 BATCH_CONCURRENCY 개씩 동시에 Bedrock을 호출한 뒤
+    일기 저장을 한 번에 처리한다. 결과는 요청 순서대로 반환하며 실패한 항목은 error만 담는다.
     """
     try:
-        # JSON 파싱 예외 처리
         try:
             body = json.loads(event.get('body', '{}'))
         except json.JSONDecodeError:
@@ -108,185 +124,340 @@ def handle_generate_text(event, headers):
                 'body': json.dumps({'error': '잘못된 JSON 형식입니다'})
             }
         
-        user_type = body.get('type', '')
-        content = body.get('content', '')
+        entries = body.get('entries')
+        if not isinstance(entries, list) or not entries:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({'error': 'entries는 비어 있지 않은 배열이어야 합니다'})
+            }
         
-        # 입력 검증 및 품질 분석
-        validation_result = validate_input(user_type, content)
-        if len(validation_result) == 3:
-            error_msg, cleaned_content, quality_level = validation_result
-        else:
-            error_msg, cleaned_content = validation_result
-            quality_level = "medium"  # 기본값
-            
-        if error_msg:
+        if len(entries) > MAX_BATCH_ENTRIES:
             return {
                 'statusCode': 400,
                 'headers': headers,
-                'body': json.dumps({'error': error_msg})
+                'body': json.dumps({'error': f"한 번에 최대 {MAX_BATCH_ENTRIES}개까지 요청할 수 있습니다"})
             }
         
-        # diary_id 생성
-        timestamp = datetime.now().strftime('%Y%m%d')
-        diary_id = f"diary-{timestamp}-{str(uuid.uuid4())[:3]}"
+        results = [None] * len(entries)
+        pending = []
+        for index, entry in enumerate(entries):
+            if not isinstance(entry, dict):
+                results[index] = {'index': index, 'error': '항목은 객체여야 합니다'}
+                continue
+            
+            with stage('validation', index=index):
+                error_msg, cleaned_content, quality_level = validate_input(entry.get('type', ''), entry.get('content', ''))
+            if error_msg:
+                results[index] = {'index': index, 'error': error_msg}
+                continue
+            
+            pending.append({
+                'index': index,
+                'diary_id': new_diary_id(),
+                'content': cleaned_content,
+                'type': entry['type'].lower(),
+                'quality_level': quality_level
+            })
         
-        # 품질 기반 Bedrock 칭찬 메시지 생성
-        compliment = generate_compliment(cleaned_content, user_type.lower(), quality_level)
+        with ThreadPoolExecutor(max_workers=BATCH_CONCURRENCY) as executor:
+            futures = [
+                executor.submit(in_context(generate_compliment), item['content'], item['type'], item['quality_level'])
+                for item in pending
+            ]
+            
+            records = []
+            rate_limited = []
+            for item, future in zip(pending, futures):
+                try:
+                    item['compliment'] = future.result()
+                except RateLimited as e:
+                    print(f"Batch item {item['index']} rate limited: {str(e)}")
+                    rate_limited.append(e)
+                    results[item['index']] = {'index': item['index'], 'error': 'rate limited', 'retry_after': e.retry_after}
+                    continue
+                except Exception as e:
+                    print(f"Batch item {item['index']} generation error: {str(e)}")
+                    results[item['index']] = {'index': item['index'], 'error': 'compliment generation failed'}
+                    continue
+                records.append(item)
+            
+            stored = store_diaries(records, executor)
         
-        # 품질 분석 결과 로깅
-        print(f"품질 분석 결과 - diary_id: {diary_id}, quality: {quality_level}")
+        # 생성할 항목이 모두 스로틀링으로 막혔으면 배치 전체를 429로 (클라이언트가 통째로 다시 보내면 됨)
+        if pending and len(rate_limited) == len(pending):
+            return too_many_requests(headers, max(rate_limited, key=lambda e: e.retry_after))
+        
+        for item in records:
+            results[item['index']] = {
+                'index': item['index'],
+                'diary_id': item['diary_id'],
+                'compliment': item['compliment'],
+                'quality_analysis': {
+                    'level': item['quality_level'],
+                    'message': f"콘텐츠 품질: {item['quality_level']}"
+                },
+                'stored': stored[item['diary_id']]
+            }
         
-        # S3에 일기 데이터 저장 (로컬 환경에서는 스킵)
-        if os.environ.get('AWS_SAM_LOCAL') == 'true':
-            print(f"로컬 환경 - S3 저장 스킵: {diary_id}")
-        else:
-            bucket_name = os.environ.get('S3_BUCKET')
-            if bucket_name and bucket_name != 'ContentBucket':
-                save_diary_data(bucket_name, diary_id, cleaned_content, user_type.lower(), compliment)
+        print(f"배치 처리 결과 - 요청: {len(entries)}, 성공: {len(records)}")
         
         return {
             'statusCode': 200,
             'headers': headers,
             'body': json.dumps({
-                'diary_id': diary_id,
-                'compliment': compliment,
-                'quality_analysis': {
-                    'level': quality_level,
-                    'message': f"콘텐츠 품질: {quality_level}"
-                }
+                'results': results,
+                'succeeded': len(records),
+                'failed': len(entries) - len(records)
             })
         }
         
     except Exception as e:
-        print(f"Text generation error: {str(e)}")
+        print(f"Batch text generation error: {str(e)}")
         return {
             'statusCode': 500,
             'headers': headers,
             'body': json.dumps({'error': 'Internal server error'})
         }
 
+def warm_up():
+    """웜업 이벤트/프로비저닝된 동시성 초기화 때 Bedrock/S3 클라이언트를 미리 생성 (boto3 import + 엔드포인트 설정 비용)"""
+    for model_id in {model_id for chain in MODEL_CHAINS.values() for model_id in chain}:
+        model_client(model_id)
+    get_client('s3')
+    return {'clients': ['bedrock-runtime', 's3']}
+
 def get_quality_based_prompt(content, user_type, quality_level):
-    """쿼카적 사고(긍정적 리프레이밍)를 위한 품질별 맞춤 프롬프트 생성"""
+    """쿼카적 사고(긍정적 리프레이밍)를 위한 품질별 맞춤 프롬프트 (전체 문자열, 템플릿은 handlers.prompts)"""
+    return render_prompt(content, user_type, quality_level)
+
+# 기본(고품질) 모델 - 품질 등급별 모델 체인은 handlers.model_router
+COMPLIMENT_MODEL_ID = 'amazon.nova-pro-v1:0'
+
+def build_compliment_request(content, user_type, quality_level, prompt_version=None, model_id=COMPLIMENT_MODEL_ID):
+    """
+    칭찬 생성 요청 본문 (일반/스트리밍 호출 공용)
+    고정 지시문 뒤에 cachePoint를 두고 일기 내용을 마지막 블록으로 붙인다. 반환: (프롬프트 버전, 요청 본문)
+    """
+    version, blocks, inference_config = build_prompt_blocks(
+        content, user_type, quality_level, model_id, version=prompt_version
+    )
     
-    # 쿼카적 사고: 긍정적 리프레이밍 기반 성격 유형별 접근법
-    personality_approach = {
-        't': """실용적 해결사 쿼카로서 문제를 긍정적으로 리프레이밍해줘:
-- 문제나 상황을 단순하고 해결 가능한 것으로 재해석 ('그런 거 별거 아니야!', '충분히 해낼 수 있어!')
-- 구체적이고 실행 가능한 해결책을 밝고 낙관적으로 제시
-- 쿼카의 특유한 밝은 에너지로 '할 수 있다'는 자신감 전달
-- 복잡한 걸 간단하게, 무거운 걸 가볍게 만드는 쿼카의 마법""",
-        
-        'f': """따뜻한 위로자 쿼카로서 감정을 긍정적으로 리프레이밍해줘:
-- 힘든 감정을 먼저 인정하고 공감한 후, 그 속에서 강함과 희망 발견
-- 쿼카의 무한한 사랑과 따뜻함으로 마음을 감싸주기
-- 모든 경험을 성장과 배움의 기회로 긍정적 전환"""
+    return version, {
+        "messages": [
+            {
+                "role": "user",
+                "content": blocks
+            }
+        ],
+        "inferenceConfig": inference_config
     }
-    
-    base_instruction = f"""
-다음은 친구가 작성한 일기야:
 
-"{content}"
+def generate_compliment(content, user_type, quality_level="medium"):
+    """
+    Bedrock을 사용하여 품질 기반 칭찬 메시지 생성 (의미 캐시가 켜져 있으면 먼저 조회)
+    """
+    prompt_version = select_version(content)
+    cached = lookup_cached_compliment(content, user_type, quality_level, prompt_version)
+    if cached is not None:
+        return cached
+    
+    def invoke(model_id):
+        with stage('prompt_build'):
+            _, request_body = build_compliment_request(content, user_type, quality_level, prompt_version, model_id)
+        
+        with stage('bedrock_invoke', model=model_id):
+            response = model_client(model_id).invoke_model(
+                modelId=model_id,
+                body=json.dumps(request_body),
+                contentType='application/json'
+            )
+            response_body = json.loads(response['body'].read())
+        
+        log_prompt_usage(prompt_version, response_body.get('usage'), model_id)
+        return response_body['output']['message']['content'][0]['text'].strip()
+    
+    start = time.perf_counter()
+    try:
+        # 품질 등급별 모델 체인: 스로틀링/지연 시 다음 모델로 failover, 느리면 hedge
+        _, compliment = invoke_with_fallback(model_chain(quality_level), invoke, route=f"compliment-{quality_level}")
+    except ClientError as e:
+        raise Exception(f"Bedrock API error: {e}")
+    
+    store_cached_compliment(content, user_type, quality_level, compliment, prompt_version, start)
+    return compliment
 
-이 일기를 읽고 쿼카(quokka)가 '쿼카적 사고'로 상황을 긍정적으로 리프레이밍하며 친근한 반말로 응답해줘.
+def generate_compliment_stream(content, user_type, quality_level="medium"):
+    """
+    invoke_model_with_response_stream으로 칭찬 메시지를 토큰 단위로 생성 (제너레이터)
+    의미 캐시에 있으면 캐시된 칭찬을 한 조각으로 바로 내보낸다.
+    """
+    prompt_version = select_version(content)
+    cached = lookup_cached_compliment(content, user_type, quality_level, prompt_version)
+    if cached is not None:
+        yield cached
+        return
+    
+    def open_stream(model_id):
+        with stage('prompt_build'):
+            _, request_body = build_compliment_request(content, user_type, quality_level, prompt_version, model_id)
+        
+        with stage('bedrock_invoke', model=model_id, stream=True):
+            return model_client(model_id).invoke_model_with_response_stream(
+                modelId=model_id,
+                body=json.dumps(request_body),
+                contentType='application/json'
+            )
+    
+    start = time.perf_counter()
+    parts = []
+    try:
+        # 스트림은 연결 단계까지만 failover (토큰이 나가기 시작한 뒤에는 모델을 바꾸지 않음, hedge 없음)
+        model_id, response = invoke_with_fallback(
+            model_chain(quality_level), open_stream, hedge_delay_ms=0, route=f"compliment-stream-{quality_level}"
+        )
+        
+        for event in response['body']:
+            chunk = event.get('chunk')
+            if not chunk:
+                continue
+            
+            payload = json.loads(chunk['bytes'])
+            if 'metadata' in payload:
+                log_prompt_usage(prompt_version, payload['metadata'].get('usage'), model_id)
+            
+            delta = payload.get('contentBlockDelta', {}).get('delta', {})
+            if delta.get('text'):
+                parts.append(delta['text'])
+                yield delta['text']
+        
+    except ClientError as e:
+        raise Exception(f"Bedrock API error: {e}")
+    
+    store_cached_compliment(content, user_type, quality_level, ''.join(parts).strip(), prompt_version, start)
 
-{personality_approach[user_type]}
+def lookup_cached_compliment(content, user_type, quality_level, prompt_version):
+    """의미 캐시 조회 (꺼져 있으면 None)"""
+    if compliment_cache is None:
+        return None
+    
+    with stage('cache_lookup'):
+        compliment = compliment_cache.lookup(content, user_type, quality_level, prompt_version)
+    print(json.dumps({'event': 'compliment_cache', 'hit': compliment is not None, **compliment_cache.stats()}))
+    return compliment
 
-쿼카적 사고 원칙:
-- 모든 상황에서 긍정적 측면과 가능성 발견
-- 문제는 기회로, 실패는 배움으로, 힘든 감정은 성장으로 재해석
-- 쿼카의 천성적 밝음과 낙관주의로 희망과 용기 전달
-- 세상에서 가장 행복한 동물답게 무조건적 긍정 에너지
+def store_cached_compliment(content, user_type, quality_level, compliment, prompt_version, start):
+    """생성 결과를 의미 캐시에 저장 (생성 소요시간은 절약 시간 추정에 사용)"""
+    if compliment_cache is None or not compliment:
+        return
+    
+    generation_ms = (time.perf_counter() - start) * 1000
+    compliment_cache.store(content, user_type, quality_level, compliment, prompt_version, generation_ms)
 
-톤 요구사항:
-- 이모지 1-2개 포함
-- 쿼카답게 밝고 사랑스러운 친구 톤
-- "~야", "~네", "~구나" 같은 친근한 말투
-- 완전한 문장으로 마무리
-"""
+def log_prompt_usage(prompt_version, usage, model_id=COMPLIMENT_MODEL_ID):
+    """프롬프트 버전과 토큰 사용량(캐시 읽기/쓰기 포함) 로깅 - A/B 비교용"""
+    usage = usage or {}
+    print(json.dumps({
+        'event': 'compliment_usage',
+        'prompt_version': prompt_version,
+        'model_id': model_id,
+        'input_tokens': usage.get('inputTokens'),
+        'output_tokens': usage.get('outputTokens'),
+        'cache_read_tokens': usage.get('cacheReadInputTokenCount', 0),
+        'cache_write_tokens': usage.get('cacheWriteInputTokenCount', 0)
+    }))
 
-    # 품질별 길이 조정 (긍정적 리프레이밍 중심)
-    if quality_level == "low":
-        length_instruction = "- 20-30자 이내로 작성."
-    elif quality_level == "medium":
-        length_instruction = "- 30-40자 이내로 작성"
-    else:  # high
-        length_instruction = "- 40-50자 이내로 작성"
+def sse_event(event, data):
+    """Server-Sent Events 프레임 생성"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-    # 품질별 쿼카적 사고 접근법
-    if user_type == 't':
-        quality_instructions = {
-            "high": "- 일기 내용을 긍정 재해석하고 구체적 해결책을 밝게 제시\n- '이 정도면 충분히 해낼 수 있어!' 식의 자신감 부여",
-            "medium": "- 좋은 점을 찾아 '역시 잘하고 있네!' 하며 격려\n- 간단한 해결 방향을 쿼카답게 밝고 낙관적으로 제안",
-            "low": "- 가볍게 격려"
-        }
-    else:  # f type
-        quality_instructions = {
-            "high": "- 힘든 감정도 '성장의 신호'로 따뜻하게 리프레이밍하며 무조건적 사랑 전달",
-            "medium": "- '너는 충분히 괜찮은 사람이야' 식의 존재 긍정 메시지",
-            "low": "- 행복한 언급 메시지."
-        }
+def stream_generate_text(diary_id, cleaned_content, user_type, quality_level):
+    """
+    스트리밍 모드 응답 프레임 제너레이터
+    meta(diary_id) -> token(텍스트 조각)* -> done(전체 칭찬 + 품질 분석) 순서로 SSE 프레임 생성
+    API Gateway REST + Lambda는 응답을 모아서 보내므로 /generate/text에는 연결하지 않고,
+    stream_server.py(POST /generate/text/stream, Function URL RESPONSE_STREAM)가 프레임마다 흘려보낸다.
+    """
+    yield sse_event('meta', {'diary_id': diary_id})
     
-    additional_instruction = quality_instructions[quality_level]
+    parts = []
+    for text in generate_compliment_stream(cleaned_content, user_type, quality_level):
+        parts.append(text)
+        yield sse_event('token', {'text': text})
     
-    return f"{base_instruction}\n{length_instruction}\n{additional_instruction}\n\n쿼카적 사고로 긍정 리프레이밍한 메시지:"
-def generate_compliment(content, user_type, quality_level="medium"):
+    compliment = ''.join(parts).strip()
+    store_diary(diary_id, cleaned_content, user_type, compliment)
+    
+    yield sse_event('done', {
+        'diary_id': diary_id,
+        'compliment': compliment,
+        'quality_analysis': {
+            'level': quality_level,
+            'message': f"콘텐츠 품질: {quality_level}"
+        }
+    })
+
+def store_diary(diary_id, cleaned_content, user_type, compliment):
+    """S3에 일기 데이터 저장 (로컬 환경에서는 스킵)"""
+    if os.environ.get('AWS_SAM_LOCAL') == 'true':
+        print(f"로컬 환경 - S3 저장 스킵: {diary_id}")
+    else:
+        bucket_name = os.environ.get('S3_BUCKET')
+        if bucket_name and bucket_name != 'ContentBucket':
+            save_diary_data(bucket_name, diary_id, cleaned_content, user_type, compliment)
+
+def store_diaries(records, executor):
     """
-    Bedrock을 사용하여 품질 기반 칭찬 메시지 생성
+    일기 여러 건을 한 번에 저장 (저장 위치 확인은 한 번만)
+    object 모드: 일기마다 S3 객체 하나(read_diary/list_diary_keys로 조회)를 executor로 병렬 업로드
+    batch 모드: diary_writer 버퍼에 넣고 바로 반환 (NDJSON gzip 배치로 백그라운드 업로드)
+    records: [{'diary_id', 'content', 'type', 'compliment'}], 반환: {diary_id: 저장 성공 여부}
     """
-    try:
-        # 품질에 따른 맞춤 프롬프트 생성
-        prompt = get_quality_based_prompt(content, user_type, quality_level)
-        
-        request_body = {
-            "messages": [
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "text": prompt
-                        }
-                    ]
-                }
-            ],
-            "inferenceConfig": {
-                "max_new_tokens": 200,  # 한글 150자 + 충분한 여유분으로 잘림 방지
-                "temperature": 0.7,
-                "top_p": 0.9
-            }
-        }
-        
-        response = bedrock_client.invoke_model(
-            modelId='amazon.nova-pro-v1:0',
-            # modelId='anthropic.claude-3-5-sonnet-20241022-v2:0',
-            body=json.dumps(request_body),
-            contentType='application/json'
+    if os.environ.get('AWS_SAM_LOCAL') == 'true':
+        print(f"로컬 환경 - S3 저장 스킵: {len(records)}건")
+        return {record['diary_id']: False for record in records}
+    
+    bucket_name = os.environ.get('S3_BUCKET')
+    if not bucket_name or bucket_name == 'ContentBucket':
+        return {record['diary_id']: False for record in records}
+    
+    futures = {
+        record['diary_id']: executor.submit(
+            in_context(save_diary_data), bucket_name, record['diary_id'], record['content'], record['type'], record['compliment']
         )
-        
-        response_body = json.loads(response['body'].read())
-        return response_body['output']['message']['content'][0]['text'].strip()
-        
-    except ClientError as e:
-        raise Exception(f"Bedrock API error: {e}")
+        for record in records
+    }
+    
+    stored = {}
+    for diary_id, future in futures.items():
+        try:
+            future.result()
+            stored[diary_id] = True
+        except Exception as e:
+            print(f"Batch store error - diary_id: {diary_id}, {str(e)}")
+            stored[diary_id] = False
+    return stored
 
 def save_diary_data(bucket_name, diary_id, content, user_type, compliment):
     """
-    일기 데이터를 S3에 저장
+    일기 데이터를 S3에 저장 (batch 모드에서는 버퍼에 넣고 바로 반환)
     """
     try:
-        data = {
-            'diary_id': diary_id,
-            'timestamp': datetime.now().isoformat(),
-            'content': content,
-            'type': user_type,
-            'compliment': compliment
-        }
+        data = diary_record(diary_id, content, user_type, compliment)
         
-        s3_client.put_object(
-            Bucket=bucket_name,
-            Key=f"diaries/{diary_id}.json",
-            Body=json.dumps(data, ensure_ascii=False, indent=2),
-            ContentType='application/json'
-        )
+        if diary_writer is not None:
+            diary_writer.add(data)
+            return
+        
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        set_size('diary', len(payload.encode('utf-8')))
+        with stage('s3_upload', target='diary'):
+            get_client('s3').put_object(
+                Bucket=bucket_name,
+                Key=diary_key(diary_id),
+                Body=payload,
+                ContentType='application/json'
+            )
         
     except ClientError as e:
         raise Exception(f"S3 save error: {e}")
@@ -0,0 +1,140 @@
+"""
+일기 입력 검증 / 품질 분석
+
+패턴은 모듈 로드 시 한 번만 컴파일하고, 입력 한 건에 대해
+정리(HTML 제거, 공백 정리) → 의미 문자 수 → 개인정보 → 반복 패턴 검사를 C 수준 스캔 몇 번으로 끝낸다.
+- 보통 입력의 전체 스캔: split/join, 반복 패턴 2회(한 글자/두 글자), 의미 문자 수 1회
+  (두 반복 패턴을 하나의 대안(|) 패턴으로 합쳐도 위치마다 두 분기를 모두 시도해 빨라지지 않으므로 나눠 둠)
+- 공백 제외 길이는 한 번만 계산해 최소 길이 검사와 반복 비중 검사에 같이 쓴다
+- html.unescape / 태그 제거는 '&', '<'가 있을 때만 수행
+- 전화번호/이메일 정규식은 '01', '@'가 있을 때만 수행
+- 스팸은 고정 문자열 목록 대신 "같은 글자 / 두 글자 단위의 연속 반복이 내용 대부분을 차지하거나 아주 긴 경우" 규칙 하나로 검사
+  (일기에 흔한 ㅠㅠㅠㅠㅠ, ㅋㅋㅋㅋㅋ, 하하하하하, !!!!! 같은 짧은 감정 표현은 허용)
+"""
+import html
+import re
+
+MIN_CONTENT_CHARS = 10
+MAX_CONTENT_CHARS = 1000
+# 같은 글자(또는 두 글자 단위)가 이 횟수 이상 이어지고 그 반복이 공백 제외 내용의 절반을 넘으면 스팸
+# (하하하하하하하하하하 -> 스팸, "오늘 너무 웃겼다 하하하하하" -> 허용)
+SPAM_REPEAT_MIN = 5
+# 내용 비중과 관계없이 스팸으로 보는 연속 반복 길이 (글자 수)
+SPAM_LONG_RUN_CHARS = 20
+# 말줄임/물결 등 일기에서 흔히 길게 늘여 쓰는 기호는 반복 검사에서 제외
+SPAM_REPEAT_EXEMPT = '.~-=^♡♥'
+
+TAG_PATTERN = re.compile(r'<[^>]*?>')
+MEANINGFUL_PATTERN = re.compile(r'[가-힣a-zA-Z]')
+# str.isalnum()이 아닌 문자 ([^\W_]가 isalnum과 같은 집합)
+NON_ALNUM_PATTERN = re.compile(r'[\W_]')
+PHONE_PATTERN = re.compile(r'01[0-9][-\s]?\d{3,4}[-\s]?\d{4}')
+EMAIL_PATTERN = re.compile(r'\S+@\S+\.\S+')
+# 한 글자 / 두 글자 단위 반복 (문자 조건을 패턴에 넣으면 위치마다 분기가 늘어 느려지므로, 드문 매치만 뒤에서 거름)
+SINGLE_RUN_PATTERN = re.compile(r'(.)\1{%d,}' % (SPAM_REPEAT_MIN - 1))
+PAIR_RUN_PATTERN = re.compile(r'(..)\1{%d,}' % (SPAM_REPEAT_MIN - 1))
+
+
+def clean_content(content):
+    """HTML 엔티티/태그 제거 후 공백을 한 칸으로 정리"""
+    if '&' in content:
+        content = html.unescape(content)
+    if '<' in content:
+        content = TAG_PATTERN.sub('', content)
+    return ' '.join(content.split())
+
+
+def count_meaningful_chars(content):
+    """한글 음절/영숫자 등 str.isalnum()인 문자 수 (대부분이 의미 문자이므로 나머지를 세어 뺌)"""
+    return len(content) - len(NON_ALNUM_PATTERN.findall(content))
+
+
+def is_spam_char(char):
+    """반복 검사 대상 문자 (공백/숫자/허용 기호 제외)"""
+    return not (char.isspace() or char.isdigit() or char in SPAM_REPEAT_EXEMPT)
+
+
+def is_spam_run(run_chars, text_chars):
+    """연속 반복 길이가 SPAM_LONG_RUN_CHARS 이상이거나 공백 제외 내용(text_chars자)의 절반을 넘는지"""
+    return run_chars >= SPAM_LONG_RUN_CHARS or run_chars * 2 > text_chars
+
+
+def has_repeat_run(content, text_chars=None):
+    """
+    같은 글자 또는 서로 다른 두 글자 단위의 SPAM_REPEAT_MIN번 이상 연속 반복이 스팸 수준인지
+    text_chars: 공백 제외 글자 수 (호출 측이 이미 구했으면 넘겨서 다시 세지 않음)
+    """
+    if text_chars is None:
+        text_chars = len(content) - sum(char.isspace() for char in content)
+
+    for match in SINGLE_RUN_PATTERN.finditer(content):
+        if is_spam_char(match.group(1)) and is_spam_run(len(match.group(0)), text_chars):
+            return True
+
+    for match in PAIR_RUN_PATTERN.finditer(content):
+        first, second = match.group(1)
+        if first != second and is_spam_char(first) and is_spam_char(second) and is_spam_run(len(match.group(0)), text_chars):
+            return True
+
+    return False
+
+
+def grade_quality(char_count):
+    """의미 문자 수 기반 품질 등급"""
+    if char_count > 80:
+        return "high", "상세한 내용"
+    elif char_count > 30:
+        return "medium", "적당한 내용"
+    elif char_count < 10:
+        return "low", "내용이 너무 짧습니다"
+    else:
+        return "medium", "적당한 내용"
+
+
+def analyze_content_quality(content):
+    """품질 분석: (등급, 사유)"""
+    if not content or not isinstance(content, str):
+        return "error", "잘못된 입력"
+
+    content_clean = content.strip()
+    if not content_clean:
+        return "empty", "빈 내용"
+
+    if has_repeat_run(content_clean):
+        return "spam", "무의미한 반복 패턴 감지"
+
+    return grade_quality(count_meaningful_chars(content_clean))
+
+
+def validate_input(user_type, content):
+    """기본 입력 검증: (에러 메시지, 정리된 내용, 품질 등급)"""
+    if not isinstance(user_type, str) or not isinstance(content, str):
+        return "입력값은 문자열이어야 합니다", None, None
+
+    if not user_type or user_type.lower() not in ['t', 'f']:
+        return "사용자 타입은 't' 또는 'f'여야 합니다", None, None
+
+    content_clean = clean_content(content)
+
+    # 정리 후에는 공백이 ' '뿐이므로 개수만 빼면 됨
+    text_chars = len(content_clean) - content_clean.count(' ')
+    if text_chars < MIN_CONTENT_CHARS:
+        return "일기 내용은 공백을 제외하고 최소 10자 이상이어야 합니다", None, None
+
+    if len(content_clean) > MAX_CONTENT_CHARS:
+        return "일기 내용은 최대 1000자까지 입력 가능합니다", None, None
+
+    if not MEANINGFUL_PATTERN.search(content_clean):
+        return "의미있는 내용을 입력해주세요 (한글 또는 영문 포함)", None, None
+
+    if '01' in content_clean and PHONE_PATTERN.search(content_clean):
+        return "개인정보 보호를 위해 전화번호는 입력하지 말아주세요", None, None
+
+    if '@' in content_clean and EMAIL_PATTERN.search(content_clean):
+        return "개인정보 보호를 위해 이메일은 입력하지 말아주세요", None, None
+
+    if has_repeat_run(content_clean, text_chars):
+        return "무의미한 반복 패턴 감지", None, None
+
+    quality_level, _ = grade_quality(count_meaningful_chars(content_clean))
+    return None, content_clean, quality_level
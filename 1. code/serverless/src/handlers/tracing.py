@@ -0,0 +1,288 @@
+"""
+요청 단위 단계별 지연시간 추적
+
+app.lambda_handler가 요청마다 Trace를 시작하고, 핸들러 코드는 `with stage('bedrock_invoke'):`처럼
+단계를 감싸기만 하면 된다 (추적 중이 아니면 아무것도 하지 않음).
+요청이 끝나면 한 줄의 EMF 레코드로
+- 지표: TotalLatency, 단계별 {Stage}Latency(같은 단계가 여러 번이면 합계), ColdStart, 요청/응답/페이로드 크기(Bytes),
+  count()로 센 횟수(캐시 히트/미스 등, Count)
+- 속성: request_id, status, cold, 단계 목록(시작 오프셋/소요시간/속성/오류), 오류 원인
+을 남긴다. Logs Insights에서 `filter event = "request_trace"`로 느린 요청의 단계를 볼 수 있다.
+
+단계 이름: validation, prompt_build, cache_lookup, bedrock_invoke, image_generate, background_removal,
+audio_load, synthesis, encode, s3_upload
+
+Trace는 contextvars로 전달되므로 ThreadPoolExecutor에 넘기는 함수는 in_context(fn)으로 감싸야 같은 Trace에 기록된다.
+
+로컬 내보내기: TRACE_LOCAL_FILE을 지정하면 Trace 전체를 NDJSON으로 덧붙이고,
+`python -m handlers.tracing <파일>`로 라우트/단계별 p50/p95를 요약한다.
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from handlers.metrics import emit_metrics
+
+TRACE_LOCAL_FILE = os.environ.get('TRACE_LOCAL_FILE')
+
+_current = contextvars.ContextVar('trace', default=None)
+_exporters = []
+_invocations = 0
+_invocations_lock = threading.Lock()
+
+
+def metric_name(name, suffix):
+    """('bedrock_invoke', 'Latency') -> BedrockInvokeLatency"""
+    return ''.join(part.capitalize() for part in name.split('_')) + suffix
+
+
+def error_summary(error):
+    return f"{type(error).__name__}: {error}"
+
+
+class Trace:
+    """요청 하나의 단계 기록 (여러 스레드에서 기록할 수 있도록 잠금 사용)"""
+
+    def __init__(self, route, request_id=None, cold=False, clock=time.perf_counter):
+        self.route = route
+        self.request_id = request_id or str(uuid.uuid4())
+        self.cold = cold
+        self.clock = clock
+        self.started = clock()
+        self.stages = []
+        self.sizes = {}
+        self.counts = {}
+        self.fields = {}
+        self.errors = []
+        self.status = None
+        self.total_ms = None
+        self._lock = threading.Lock()
+
+    def _offset_ms(self, at):
+        return round((at - self.started) * 1000, 1)
+
+    def add_stage(self, name, start, end, error=None, **attrs):
+        record = {'name': name, 'start_ms': self._offset_ms(start), 'ms': round((end - start) * 1000, 1)}
+        if attrs:
+            record['attrs'] = attrs
+        if error is not None:
+            record['error'] = error_summary(error)
+        with self._lock:
+            # hedge로 버려진 호출 등 응답 이후에 끝난 단계는 기록하지 않음
+            if self.total_ms is None:
+                self.stages.append(record)
+
+    def set_size(self, name, size):
+        with self._lock:
+            self.sizes[name] = size
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    def annotate(self, **fields):
+        with self._lock:
+            self.fields.update(fields)
+
+    def record_error(self, error, where=None):
+        with self._lock:
+            self.errors.append({'where': where, 'error': error_summary(error)})
+
+    def stage_totals(self):
+        totals = {}
+        with self._lock:
+            for record in self.stages:
+                totals[record['name']] = totals.get(record['name'], 0.0) + record['ms']
+        return totals
+
+    def finish(self, status=None):
+        with self._lock:
+            if self.total_ms is None:
+                self.status = status
+                self.total_ms = round((self.clock() - self.started) * 1000, 1)
+        return self.to_dict()
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                'event': 'request_trace',
+                'route': self.route,
+                'request_id': self.request_id,
+                'status': self.status,
+                'cold': self.cold,
+                'total_ms': self.total_ms,
+                'stages': list(self.stages),
+                'sizes': dict(self.sizes),
+                'counts': dict(self.counts),
+                'errors': list(self.errors),
+                **self.fields
+            }
+
+
+def current_trace():
+    return _current.get()
+
+
+def next_invocation_is_cold():
+    """프로세스의 첫 요청이면 True (이후 호출은 warm)"""
+    global _invocations
+    with _invocations_lock:
+        _invocations += 1
+        return _invocations == 1
+
+
+@contextmanager
+def trace_request(route, request_id=None, request_bytes=None):
+    """요청 전체를 감싸 Trace를 시작하고, 끝나면 finish_trace로 내보냄 (상태는 trace.status로 지정)"""
+    trace = Trace(route, request_id, cold=next_invocation_is_cold())
+    if request_bytes is not None:
+        trace.set_size('request', request_bytes)
+    token = _current.set(trace)
+    try:
+        yield trace
+    except Exception as e:
+        trace.record_error(e, 'unhandled')
+        trace.status = trace.status or 500
+        raise
+    finally:
+        _current.reset(token)
+        finish_trace(trace, trace.status)
+
+
+@contextmanager
+def stage(name, **attrs):
+    """현재 Trace에 단계 소요시간 기록 (추적 중이 아니면 아무것도 하지 않음, 예외는 기록 후 다시 던짐)"""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = trace.clock()
+    try:
+        yield
+    except Exception as e:
+        trace.add_stage(name, start, trace.clock(), error=e, **attrs)
+        raise
+    trace.add_stage(name, start, trace.clock(), **attrs)
+
+
+def set_size(name, size):
+    trace = _current.get()
+    if trace is not None:
+        trace.set_size(name, size)
+
+
+def count(name, value=1):
+    """현재 Trace의 횟수 지표 증가 (voice_cache_hit -> VoiceCacheHit, Count)"""
+    trace = _current.get()
+    if trace is not None:
+        trace.count(name, value)
+
+
+def annotate(**fields):
+    trace = _current.get()
+    if trace is not None:
+        trace.annotate(**fields)
+
+
+def record_error(error, where=None):
+    """except 블록에서 삼킨 오류의 원인을 현재 Trace에 남김"""
+    trace = _current.get()
+    if trace is not None:
+        trace.record_error(error, where)
+
+
+def in_context(fn):
+    """현재 contextvars(Trace 포함)를 복사해 다른 스레드에서 fn을 실행하는 함수 반환 (submit마다 새로 감쌀 것)"""
+    return functools.partial(contextvars.copy_context().run, fn)
+
+
+def register_exporter(exporter):
+    """exporter(trace_dict) - 요청이 끝날 때마다 호출"""
+    _exporters.append(exporter)
+
+
+def file_exporter(path):
+    lock = threading.Lock()
+
+    def export(record):
+        line = json.dumps(record, ensure_ascii=False)
+        with lock, open(path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+    return export
+
+
+def finish_trace(trace, status=None):
+    """Trace를 마치고 EMF 레코드 + 등록된 exporter로 내보냄"""
+    record = trace.finish(status)
+
+    metrics = {
+        'TotalLatency': (record['total_ms'], 'Milliseconds'),
+        'ColdStart': (int(trace.cold), 'Count')
+    }
+    for name, total in trace.stage_totals().items():
+        metrics[metric_name(name, 'Latency')] = (round(total, 1), 'Milliseconds')
+    for name, size in record['sizes'].items():
+        metrics[metric_name(name, 'Bytes')] = (size, 'Bytes')
+    for name, value in record['counts'].items():
+        metrics[metric_name(name, '')] = (value, 'Count')
+
+    properties = {key: value for key, value in record.items() if key not in ('route', 'total_ms', 'sizes', 'counts')}
+    emit_metrics({'Route': trace.route}, metrics, properties)
+
+    for exporter in _exporters:
+        try:
+            exporter(record)
+        except Exception as e:
+            print(f"Trace export error: {error_summary(e)}")
+    return record
+
+
+if TRACE_LOCAL_FILE:
+    register_exporter(file_exporter(TRACE_LOCAL_FILE))
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def summarize(records):
+    """{route: {'requests', 'cold', 'total': (p50, p95), 'stages': {name: (p50, p95)}}}"""
+    routes = {}
+    for record in records:
+        summary = routes.setdefault(record['route'], {'requests': 0, 'cold': 0, 'total': [], 'stages': {}})
+        summary['requests'] += 1
+        summary['cold'] += int(record['cold'])
+        summary['total'].append(record['total_ms'])
+        totals = {}
+        for item in record['stages']:
+            totals[item['name']] = totals.get(item['name'], 0.0) + item['ms']
+        for name, total in totals.items():
+            summary['stages'].setdefault(name, []).append(total)
+
+    for summary in routes.values():
+        summary['total'] = (percentile(summary['total'], 0.5), percentile(summary['total'], 0.95))
+        summary['stages'] = {
+            name: (percentile(values, 0.5), percentile(values, 0.95))
+            for name, values in summary['stages'].items()
+        }
+    return routes
+
+
+if __name__ == '__main__':
+    import sys
+
+    with open(sys.argv[1], encoding='utf-8') as f:
+        traces = [json.loads(line) for line in f if line.strip()]
+
+    for route, summary in summarize(traces).items():
+        print(f"{route}  요청 {summary['requests']}건 (cold {summary['cold']})  "
+              f"p50 {summary['total'][0]:.1f} ms / p95 {summary['total'][1]:.1f} ms")
+        for name, (p50, p95) in sorted(summary['stages'].items(), key=lambda item: -item[1][1]):
+            print(f"  {name:20} p50 {p50:8.1f} ms  p95 {p95:8.1f} ms")
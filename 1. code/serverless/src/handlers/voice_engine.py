@@ -0,0 +1,98 @@
+"""
+쿼카 음성 조립 엔진
+
+자음 문자열을 (클립, 재생 샘플레이트) 세그먼트 목록으로 먼저 계획한 뒤,
+전체 길이만큼 미리 할당한 샘플 버퍼에 한 번에 써넣는다.
+AudioSegment.__add__를 반복하면 매번 전체 버퍼를 복사하므로 O(n^2)이지만,
+여기서는 각 세그먼트를 정확히 한 번만 복사하므로 O(n)이다.
+
+피치 변환은 클립마다 frame_rate를 바꾸는 대신 고정 출력 레이트로 실제 리샘플링하며,
+자음별로 양자화된 피치 변형(PITCH_STEPS단계)을 미리 만들어 두고 골라 쓴다.
+"""
+import hashlib
+import random
+
+import numpy as np
+
+SAMPLE_DTYPE = np.int16
+
+# 기존 random.uniform(0.96, 1.15) 옥타브 범위를 PITCH_STEPS 단계로 양자화
+PITCH_OCTAVE_RANGE = (0.96, 1.15)
+PITCH_STEPS = 16
+
+
+def clip_to_samples(clip):
+    """raw PCM(16bit) 클립을 복사 없이 numpy 배열로 변환"""
+    return np.frombuffer(clip, dtype=SAMPLE_DTYPE)
+
+
+def output_length(num_samples, src_rate, dst_rate):
+    """src_rate로 재생되는 클립을 dst_rate로 변환했을 때의 샘플 수"""
+    return int(num_samples * dst_rate / src_rate)
+
+
+def resample(samples, src_rate, dst_rate, length=None):
+    """
+    선형 보간 리샘플링 (벡터 연산)
+    src_rate로 재생되는 클립을 dst_rate 기준 샘플로 변환한다.
+    """
+    if length is None:
+        length = output_length(len(samples), src_rate, dst_rate)
+
+    if src_rate == dst_rate and length == len(samples):
+        return samples
+
+    positions = np.arange(length) * (src_rate / dst_rate)
+    return np.interp(positions, np.arange(len(samples)), samples)
+
+
+def assemble(segments, output_rate):
+    """
+    세그먼트 목록 [(samples, src_rate), ...]을 output_rate의 단일 버퍼로 조립
+
+    1단계: 세그먼트별 출력 길이를 모두 계산해 전체 버퍼를 한 번만 할당
+    2단계: 각 세그먼트를 리샘플링하여 버퍼의 자기 위치에 직접 기록
+    """
+    lengths = [output_length(len(samples), rate, output_rate) for samples, rate in segments]
+    result = np.empty(sum(lengths), dtype=SAMPLE_DTYPE)
+
+    position = 0
+    for (samples, rate), length in zip(segments, lengths):
+        result[position:position + length] = resample(samples, rate, output_rate, length)
+        position += length
+
+    return result
+
+
+def pitch_factors(steps=PITCH_STEPS):
+    """양자화된 피치 배율 목록 (2 ** (2 * octaves), 기존 피치 계산식과 동일)"""
+    octaves = np.linspace(PITCH_OCTAVE_RANGE[0], PITCH_OCTAVE_RANGE[1], steps)
+    return 2.0 ** (2 * octaves)
+
+
+def pitch_shift(samples, factor):
+    """
+    클립을 factor배 높은 피치로 변환 (같은 출력 레이트 유지, 길이는 1/factor)
+    다운샘플링 전에 박스 필터로 고역을 걸러 앨리어싱을 줄인다.
+    """
+    width = int(round(factor))
+    if width > 1:
+        samples = np.convolve(samples, np.ones(width) / width, mode='same')
+    length = int(len(samples) / factor)
+    return resample(samples, factor, 1, length).astype(SAMPLE_DTYPE)
+
+
+def build_pitch_variants(samples, steps=PITCH_STEPS):
+    """클립 하나에 대한 양자화 피치 변형 테이블 생성"""
+    return [pitch_shift(samples, factor) for factor in pitch_factors(steps)]
+
+
+def voice_seed(key):
+    """diary_id 등 문자열 키로부터 재현 가능한 난수 시드 생성 (프로세스와 무관하게 고정)"""
+    return int.from_bytes(hashlib.sha256(key.encode('utf-8')).digest()[:8], 'big')
+
+
+def plan_pitch_steps(length, seed=None, steps=PITCH_STEPS):
+    """글자 수만큼 피치 단계 인덱스를 seed 기반으로 선택"""
+    rng = random.Random(seed)
+    return [rng.randrange(steps) for _ in range(length)]
@@ -1,24 +1,30 @@
 import json
 import os
-import random
+import re
 from datetime import datetime
-from jamo import h2j, j2hcj
-import boto3
 from botocore.exceptions import ClientError
+from handlers.sound_bank import char_list, BANK_FORMAT, BANK_VERSION, PADATA_DIR, load_sound_bank, decode_padata
+from handlers.voice_engine import PITCH_STEPS, clip_to_samples, assemble, build_pitch_variants, plan_pitch_steps, voice_seed
+from handlers.audio_codec import AUDIO_FORMATS, DEFAULT_AUDIO_FORMAT, encode_audio, supported_formats
+from handlers.cache import LRUCache, content_hash, s3_object_exists
+from handlers.media import media_url, upload_media
+from handlers.aws_clients import get_client
+from handlers.tracing import stage, set_size, count, record_error, error_summary
 
-try:
-    from pydub import AudioSegment
-    PYDUB_AVAILABLE = True
-except ImportError:
-    PYDUB_AVAILABLE = False
-
-s3_client = boto3.client('s3', region_name='us-east-1')
+# 음성 버킷 리전
+S3_REGION = 'us-east-1'
 S3_BUCKET = os.environ.get('S3_BUCKET')
 
-char_list = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ', ' ']
 char_sounds_high = {}
+sound_format = dict(BANK_FORMAT)
+pitch_variants = {}
 sounds_loaded = False
 
+# 음성 결과 캐시: 컨테이너 내 LRU + S3 voices/by-hash/ 영속 계층
+# 요청별 히트/미스는 Trace 지표(VoiceCacheHit, VoiceCacheS3Hit, VoiceCacheMiss)로 남김
+VOICE_CACHE_PREFIX = 'voices/by-hash'
+voice_cache = LRUCache(int(os.environ.get('VOICE_CACHE_SIZE', '256')))
+
 CONSONANT_MAP = {
     'ㄱ': 'ㅋ', 'ㄲ': 'ㅋ', 'ㄴ': 'ㄴ', 'ㄷ': 'ㅌ', 'ㄸ': 'ㅌ',
     'ㄹ': 'ㄹ', 'ㅁ': 'ㅁ', 'ㅂ': 'ㅍ', 'ㅃ': 'ㅍ', 'ㅅ': 'ㅅ',
@@ -26,6 +32,19 @@ CONSONANT_MAP = {
     'ㅋ': 'ㅋ', 'ㅌ': 'ㅌ', 'ㅍ': 'ㅍ', 'ㅎ': 'ㅎ'
 }
 
+# 한글 음절은 산술적으로 분해된다: 초성 인덱스 = (code - 0xAC00) // (21 중성 * 28 종성)
+HANGUL_FIRST = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSEONG_STRIDE = 21 * 28
+CHOSEONG_LIST = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+
+# 11,172개 음절 전체 -> CONSONANT_MAP 결과 변환표 (str.translate 용)
+KK_TRANSLATION_TABLE = {
+    code: CONSONANT_MAP[CHOSEONG_LIST[(code - HANGUL_FIRST) // CHOSEONG_STRIDE]]
+    for code in range(HANGUL_FIRST, HANGUL_LAST + 1)
+}
+NON_HANGUL_PATTERN = re.compile(r'[^가-힣]+')
+
 def handle_generate_voice(event, headers):
     """
     칭찬 음성 생성 API 핸들러
@@ -34,6 +53,7 @@ def handle_generate_voice(event, headers):
         body = json.loads(event.get('body', '{}'))
         diary_id = body.get('diary_id', '')
         compliment = body.get('compliment', '')
+        audio_format = body.get('format', DEFAULT_AUDIO_FORMAT)
         
         if not diary_id or not compliment:
             return {
@@ -42,8 +62,15 @@ def handle_generate_voice(event, headers):
                 'body': json.dumps({'error': 'diary_id and compliment are required'})
             }
         
-        kk_sound = convert_to_kk_style(compliment)
-        voice_url = generate_voice_file(kk_sound, diary_id)
+        # 이 환경에서 인코딩할 수 있는 포맷만 받음 (ffmpeg가 없으면 wav만)
+        if audio_format not in supported_formats():
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({'error': f"format must be one of {', '.join(supported_formats())}"})
+            }
+        
+        voice_url = create_voice(diary_id, compliment, audio_format)
         
         return {
             'statusCode': 200,
@@ -54,99 +81,163 @@ def handle_generate_voice(event, headers):
         }
         
     except Exception as e:
-        print(f"Voice generation error: {str(e)}")
+        print(f"Voice generation error: {error_summary(e)}")
+        record_error(e, 'generate_voice')
         return {
             'statusCode': 500,
             'headers': headers,
             'body': json.dumps({'error': 'Internal server error'})
         }
 
+def create_voice(diary_id, compliment, audio_format=DEFAULT_AUDIO_FORMAT):
+    """칭찬 문장 -> 쿼카 자음 문자열 -> 음성 파일 URL"""
+    kk_sound = convert_to_kk_style(compliment)
+    return generate_voice_file(kk_sound, diary_id, audio_format)
+
 def convert_to_kk_style(text):
-    result = []
-    for char in text:
-        if '가' <= char <= '힣':
-            jamos = j2hcj(h2j(char))
-            if jamos and jamos[0] in CONSONANT_MAP:
-                result.append(CONSONANT_MAP[jamos[0]])
-    return ''.join(result)
+    """한글 음절 이외 문자를 제거한 뒤 변환표로 일괄 치환 (jamo 분해 없이)"""
+    return NON_HANGUL_PATTERN.sub('', text).translate(KK_TRANSLATION_TABLE)
 
 def load_padata_sounds():
-    global sounds_loaded, char_sounds_high
+    global sounds_loaded, char_sounds_high, sound_format
     
-    if sounds_loaded or not PYDUB_AVAILABLE:
+    if sounds_loaded:
         return sounds_loaded
     
     try:
-        high_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'sources', 'high')
+        # 1. 빌드된 사운드 뱅크 (mmap, ffmpeg 불필요)
+        bank = load_sound_bank()
+        if bank:
+            sound_format, char_sounds_high = bank
+            sounds_loaded = len(char_sounds_high) > 0
+            return sounds_loaded
         
-        if not os.path.exists(high_dir):
+        # 2. 뱅크가 없으면 padata(MP3)를 직접 디코딩 (ffmpeg 필요)
+        if not os.path.exists(PADATA_DIR):
             return False
         
         for idx, item in enumerate(char_list):
-            high_file = os.path.join(high_dir, f'{idx + 1:02d}.padata')
+            high_file = os.path.join(PADATA_DIR, f'{idx + 1:02d}.padata')
             if os.path.exists(high_file):
-                char_sounds_high[item] = AudioSegment.from_file(high_file)
+                char_sounds_high[item] = memoryview(decode_padata(high_file))
         
+        sound_format = dict(BANK_FORMAT)
         sounds_loaded = len(char_sounds_high) > 0
         return sounds_loaded
         
-    except Exception:
+    except Exception as e:
+        print(f"Sound load error: {error_summary(e)}")
+        record_error(e, 'audio_load')
         return False
 
-def generate_voice_file(kk_sound, diary_id):
+def warm_up():
+    """
+    웜업 이벤트/프로비저닝된 동시성 초기화 때 호출 (app.warm_up)
+    사운드 뱅크와 자음별 피치 변형 테이블, S3 클라이언트를 미리 올려 첫 요청이 audio_load/피치 계산 비용을 내지 않게 함
+    """
     if not load_padata_sounds():
-        return None
+        return {'sounds': 0}
+    for char in char_sounds_high:
+        get_pitch_variants(char)
+    get_client('s3', S3_REGION)
+    return {'sounds': len(char_sounds_high), 'pitch_tables': len(pitch_variants)}
+
+def get_pitch_variants(char):
+    """자음별 피치 변형 테이블 (처음 사용할 때 한 번만 계산하여 메모리에 유지)"""
+    variants = pitch_variants.get(char)
+    if variants is None:
+        variants = build_pitch_variants(clip_to_samples(char_sounds_high[char]))
+        pitch_variants[char] = variants
+    return variants
+
+def synthesize_voice(kk_sound, seed=None):
+    """
+    자음 문자열을 쿼카 음성 샘플로 합성하여 (samples, frame_rate) 반환
+    미리 계산된 피치 변형 중 seed 기반으로 골라 voice_engine.assemble로 한 번에 조립
+    """
+    frame_rate = sound_format['frame_rate']
+    chars = [char for char in kk_sound if char in char_sounds_high]
+    steps = plan_pitch_steps(len(chars), seed)
+    
+    segments = [
+        (get_pitch_variants(char)[step], frame_rate)
+        for char, step in zip(chars, steps)
+    ]
+    
+    if not segments:
+        return None, None
     
+    return assemble(segments, frame_rate), frame_rate
+
+def voice_cache_key(kk_sound, audio_format):
+    """자음 문자열 + 합성 파라미터로 만든 내용 기반 캐시 키"""
+    return content_hash(kk_sound, audio_format, BANK_VERSION, PITCH_STEPS)
+
+def generate_voice_file(kk_sound, diary_id, audio_format=DEFAULT_AUDIO_FORMAT):
     try:
-        result_sound = None
-        
-        for char in kk_sound:
-            if char in char_sounds_high:
-                char_sound = char_sounds_high[char]
-                octaves = 2 * random.uniform(0.96, 1.15)
-                new_sample_rate = int(char_sound.frame_rate * (2.0 ** octaves))
-                
-                pitch_char_sound = char_sound._spawn(
-                    char_sound.raw_data, 
-                    overrides={'frame_rate': new_sample_rate}
-                )
-                
-                result_sound = pitch_char_sound if result_sound is None else result_sound + pitch_char_sound
-        
-        if result_sound:
-            filename = f"{diary_id}.wav"
-            
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                result_sound.export(temp_file.name, format="wav")
-                
-                s3_key = f"voices/{filename}"
-                s3_url = upload_to_s3(temp_file.name, s3_key)
-                
-                os.unlink(temp_file.name)
-                
-                return s3_url
+        cache_key = voice_cache_key(kk_sound, audio_format)
         
-        return None
+        # 1. 컨테이너 내 LRU (URL은 만료될 수 있으므로 S3 키를 저장)
+        cached_key = voice_cache.get(cache_key)
+        if cached_key:
+            count('voice_cache_hit')
+            return media_url(get_client('s3', S3_REGION), cached_key)
+        
+        # 2. S3 영속 캐시 (같은 문장이면 이미 생성된 객체 재사용)
+        s3_key = f"{VOICE_CACHE_PREFIX}/{cache_key}.{AUDIO_FORMATS[audio_format]['extension']}"
+        with stage('cache_lookup'):
+            s3_hit = s3_object_exists(get_client('s3', S3_REGION), S3_BUCKET, s3_key)
+        if s3_hit:
+            count('voice_cache_hit')
+            count('voice_cache_s3_hit')
+            voice_cache.put(cache_key, s3_key)
+            return media_url(get_client('s3', S3_REGION), s3_key)
+        
+        count('voice_cache_miss')
+        
+        with stage('audio_load', warm=sounds_loaded):
+            loaded = load_padata_sounds()
+        if not loaded:
+            return None
         
-    except Exception:
+        # 같은 문장은 항상 같은 음성이 되도록 자음 문자열로 시드 고정
+        with stage('synthesis', chars=len(kk_sound)):
+            samples, output_rate = synthesize_voice(kk_sound, seed=voice_seed(kk_sound))
+        
+        if samples is None or not len(samples):
+            return None
+        
+        # 디스크(/tmp)를 거치지 않고 메모리 버퍼로 인코딩
+        with stage('encode', format=audio_format):
+            buffer, encoded_format = encode_audio(samples, output_rate, sound_format['channels'], audio_format)
+        set_size('audio', buffer.getbuffer().nbytes)
+        
+        # 인코딩이 wav로 대체됐으면 실제 포맷의 키로 저장해 다음 요청의 wav 캐시 조회와 맞춤
+        if encoded_format != audio_format:
+            cache_key = voice_cache_key(kk_sound, encoded_format)
+        s3_key = f"{VOICE_CACHE_PREFIX}/{cache_key}.{AUDIO_FORMATS[encoded_format]['extension']}"
+        with stage('s3_upload', target='voice'):
+            voice_url = upload_to_s3(buffer, s3_key, AUDIO_FORMATS[encoded_format]['content_type'])
+        if voice_url:
+            voice_cache.put(cache_key, s3_key)
+        
+        return voice_url
+        
+    except Exception as e:
+        # 음성 실패는 응답을 막지 않지만 원인은 로그/Trace에 남김
+        print(f"Voice file generation error: {error_summary(e)}")
+        record_error(e, 'voice_file')
         return None
 
-def upload_to_s3(file_path, s3_key):
+def upload_to_s3(fileobj, s3_key, content_type='audio/wav'):
     """
-    파일을 S3에 업로드하고 URL 반환
+    메모리 버퍼를 S3에 업로드하고 URL 반환
+    (upload_fileobj는 큰 객체를 자동으로 멀티파트 스트리밍 업로드, 내용 기반 키라 immutable 캐시)
     """
     try:
-        s3_client.upload_file(
-            file_path, 
-            S3_BUCKET, 
-            s3_key,
-            ExtraArgs={'ContentType': 'audio/wav'}
-        )
-        
-        s3_url = f"https://{S3_BUCKET}.s3.amazonaws.com/{s3_key}"
-        return s3_url
+        return upload_media(get_client('s3', S3_REGION), s3_key, fileobj, content_type)
         
     except ClientError as e:
         print(f"S3 업로드 실패: {e}")
-        return None
\ No newline at end of file
+        record_error(e, 's3_upload')
+        return None
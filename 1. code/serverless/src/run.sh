@@ -0,0 +1,3 @@
+#!/bin/sh
+# Lambda Web Adapter(AWS_LAMBDA_EXEC_WRAPPER=/opt/bootstrap)가 실행하는 스트리밍 서버 진입점 (TextStreamFunction)
+exec python3 stream_server.py
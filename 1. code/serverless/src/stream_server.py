@@ -0,0 +1,158 @@
+"""
+칭찬 텍스트 스트리밍 서버 (POST /generate/text/stream)
+
+API Gateway REST + Lambda(app.lambda_handler)는 응답 전체를 모아서 보내므로, 첫 토큰이 나오자마자 보내려면
+응답 스트리밍이 필요하다. Python 런타임은 핸들러에서 직접 스트리밍할 수 없으므로
+Lambda Web Adapter(레이어, AWS_LAMBDA_EXEC_WRAPPER=/opt/bootstrap)가 run.sh로 이 HTTP 서버를 띄우고,
+Function URL(InvokeMode: RESPONSE_STREAM)로 들어온 요청을 전달한다 (AWS_LWA_INVOKE_MODE=response_stream).
+
+- 요청 본문/검증은 /generate/text와 같고(text_handler.parse_text_request), 응답은 SSE 프레임
+  meta(diary_id) -> token(텍스트 조각)* -> done(전체 칭찬 + 품질 분석)을 chunked로 흘려보낸다.
+- 상태 코드는 첫 토큰을 받은 뒤에 보낸다: 스로틀링(429 + Retry-After)/모델 오류(500)는 일반 JSON으로 응답하고,
+  토큰이 나가기 시작한 뒤의 오류는 error 프레임으로 알린다.
+- 마감 시간은 어댑터가 넘기는 x-amzn-lambda-context 헤더의 deadline(epoch ms)으로 정한다.
+- 기존 JSON 응답(POST /generate/text)은 그대로 API Gateway 경로에서 제공한다.
+
+로컬 실행:
+    cd src && PORT=8080 python stream_server.py
+    curl -N -X POST localhost:8080/generate/text/stream -d '{"type": "f", "content": "..."}'
+"""
+import json
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+from handlers.diary_store import new_diary_id
+from handlers.rate_limiter import RateLimited, request_deadline, too_many_requests
+from handlers.tracing import annotate, error_summary, record_error, trace_request
+from handlers.text_handler import parse_text_request, sse_event, stream_generate_text
+
+STREAM_PATH = '/generate/text/stream'
+# 어댑터의 준비 상태 확인 경로 (AWS_LWA_READINESS_CHECK_PATH 기본값)
+HEALTH_PATH = '/'
+PORT = int(os.environ.get('AWS_LWA_PORT') or os.environ.get('PORT', '8080'))
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Headers': 'Content-Type,X-Amz-Date,Authorization,X-Api-Key,X-Amz-Security-Token',
+    'Access-Control-Allow-Methods': 'POST,OPTIONS'
+}
+
+
+def lambda_context(headers):
+    """어댑터가 넘긴 x-amzn-lambda-context 헤더로 request_deadline용 context 생성 (없으면 마감 없음)"""
+    try:
+        data = json.loads(headers.get('x-amzn-lambda-context') or '{}')
+    except json.JSONDecodeError:
+        data = {}
+    context = SimpleNamespace(aws_request_id=data.get('request_id'))
+    if data.get('deadline'):
+        context.get_remaining_time_in_millis = lambda: data['deadline'] - time.time() * 1000
+    return context
+
+
+class StreamRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        # 요청 로그는 Trace(request_trace EMF)로 남기므로 기본 접근 로그는 끔
+        pass
+
+    def send_json(self, status, body, headers=None):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        for name, value in {**CORS_HEADERS, **(headers or {}), 'Content-Type': 'application/json'}.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        return len(payload)
+
+    def write_chunk(self, text):
+        data = text.encode('utf-8')
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b'\r\n')
+        self.wfile.flush()
+        return len(data)
+
+    def do_GET(self):
+        if self.path == HEALTH_PATH:
+            self.send_json(200, {'status': 'ok'})
+        else:
+            self.send_json(404, {'error': 'Not Found'})
+
+    def do_OPTIONS(self):
+        self.send_json(200, {'message': 'OK'})
+
+    def do_POST(self):
+        if self.path.split('?')[0] != STREAM_PATH:
+            self.send_json(404, {'error': 'Not Found'})
+            return
+
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0)).decode('utf-8')
+        context = lambda_context(self.headers)
+        with trace_request(STREAM_PATH, request_id=context.aws_request_id, request_bytes=len(body)) as trace, \
+                request_deadline(context):
+            trace.status, response_bytes = self.stream_text(body)
+            trace.set_size('response', response_bytes)
+
+    def stream_text(self, body):
+        """검증 -> 첫 토큰까지 받은 뒤 200 + SSE 프레임 전송, 반환: (상태 코드, 응답 크기)"""
+        error_msg, user_type, cleaned_content, quality_level = parse_text_request(body)
+        if error_msg:
+            return 400, self.send_json(400, {'error': error_msg})
+
+        diary_id = new_diary_id()
+        annotate(diary_id=diary_id, quality=quality_level, stream=True)
+        frames = stream_generate_text(diary_id, cleaned_content, user_type, quality_level)
+
+        try:
+            # meta + 첫 토큰(또는 done)까지 받아야 상태 코드를 정할 수 있음 - 첫 바이트 시각은 그대로 첫 토큰 시각
+            head = [next(frames), next(frames)]
+        except RateLimited as e:
+            print(f"Text stream rate limited: {str(e)}")
+            response = too_many_requests({}, e)
+            return 429, self.send_json(429, json.loads(response['body']), response['headers'])
+        except Exception as e:
+            print(f"Text stream error: {error_summary(e)}")
+            record_error(e, 'text_stream')
+            return 500, self.send_json(500, {'error': 'Internal server error'})
+
+        self.send_response(200)
+        for name, value in CORS_HEADERS.items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        sent = 0
+        try:
+            for frame in head:
+                sent += self.write_chunk(frame)
+            try:
+                for frame in frames:
+                    sent += self.write_chunk(frame)
+            except (BrokenPipeError, ConnectionResetError):
+                raise
+            except Exception as e:
+                # 헤더를 이미 보냈으므로 상태 코드 대신 error 프레임으로 알림
+                print(f"Text stream error: {error_summary(e)}")
+                record_error(e, 'text_stream')
+                sent += self.write_chunk(sse_event('error', {'error': 'Internal server error'}))
+            self.wfile.write(b'0\r\n\r\n')
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            print(f"Text stream client disconnected - diary_id: {diary_id}")
+            self.close_connection = True
+        return 200, sent
+
+
+def make_server(port=PORT, host='127.0.0.1'):
+    return ThreadingHTTPServer((host, port), StreamRequestHandler)
+
+
+if __name__ == '__main__':
+    server = make_server()
+    print(json.dumps({'event': 'stream_server_start', 'port': server.server_address[1]}))
+    server.serve_forever()
@@ -0,0 +1,50 @@
+"""
+pytest 공통 설정
+
+핸들러 모듈은 import 시점에 환경 변수를 읽으므로 여기서 먼저 설정하고,
+AWS 클라이언트는 benchmarks/fake_aws.py의 가짜 클라이언트를 register_client()로 끼워 넣는다.
+
+실행 (1. code/serverless에서):
+    python -m pytest -q tests
+"""
+import os
+import sys
+
+SERVERLESS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(SERVERLESS_DIR, 'src'))
+sys.path.insert(0, os.path.join(SERVERLESS_DIR, 'benchmarks'))
+
+os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+os.environ.setdefault('S3_BUCKET', 'test-bucket')
+os.environ.setdefault('METRICS_NAMESPACE', 'QuokkaDiaryTest')
+os.environ.setdefault('COLD_START_PROFILE', '0')
+os.environ.setdefault('BEDROCK_BACKOFF_BASE_MS', '1')
+
+import pytest  # noqa: E402
+
+from fake_aws import FakeBedrockRuntime, FakeS3  # noqa: E402
+from handlers.aws_clients import register_client, reset_clients  # noqa: E402
+from handlers.rate_limiter import reset_limiters  # noqa: E402
+
+
+class FakeAWS:
+    """테스트 하나에서 쓰는 가짜 Bedrock/S3 (기본 리전과 us-east-1 모두 등록)"""
+
+    def __init__(self):
+        self.install(FakeBedrockRuntime(), FakeS3())
+
+    def install(self, bedrock=None, s3=None):
+        self.bedrock = bedrock or self.bedrock
+        self.s3 = s3 or self.s3
+        for region in (None, 'us-east-1'):
+            register_client('bedrock-runtime', self.bedrock, region)
+            register_client('s3', self.s3, region)
+        reset_limiters()
+        return self
+
+
+@pytest.fixture
+def fake_aws():
+    yield FakeAWS()
+    reset_clients()
+    reset_limiters()
@@ -0,0 +1,77 @@
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+
+np = pytest.importorskip('numpy')
+Image = pytest.importorskip('PIL.Image')
+
+from handlers import image_handler  # noqa: E402
+from handlers.background_removal import remove_background_local  # noqa: E402
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+
+def png(rgb):
+    buffer = io.BytesIO()
+    Image.fromarray(rgb.astype(np.uint8), 'RGB').save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def quokka_on_plain_background(size=64):
+    """밝은 단색 배경 가운데에 갈색 사각형(전경)"""
+    rgb = np.full((size, size, 3), 240)
+    rgb[16:48, 16:48] = (150, 100, 60)
+    return rgb
+
+
+def alpha_of(png_bytes):
+    image = Image.open(io.BytesIO(png_bytes))
+    assert image.mode == 'RGBA'
+    return np.asarray(image)[:, :, 3]
+
+
+def test_border_becomes_transparent_and_foreground_stays_opaque():
+    result, quality = remove_background_local(png(quokka_on_plain_background()), 0.9)
+
+    assert result is not None
+    alpha = alpha_of(result)
+    assert (alpha[0] == 0).all() and (alpha[-1] == 0).all() and (alpha[:, 0] == 0).all() and (alpha[:, -1] == 0).all()
+    assert (alpha[16:48, 16:48] == 255).all()
+    assert quality['confidence'] == 1.0 and quality['foreground_ratio'] == 0.25
+
+
+def test_enclosed_background_colored_pixels_stay_opaque():
+    rgb = quokka_on_plain_background()
+    rgb[30:34, 30:34] = 240  # 전경 안쪽의 배경색 (테두리와 연결되지 않음)
+
+    result, _ = remove_background_local(png(rgb), 0.9)
+    assert (alpha_of(result)[30:34, 30:34] == 255).all()
+
+
+def test_noisy_border_returns_low_confidence():
+    rgb = quokka_on_plain_background()
+    rgb[0] = np.random.default_rng(0).integers(0, 256, size=(64, 3))
+    rgb[:, 0] = np.random.default_rng(1).integers(0, 256, size=(64, 3))
+
+    result, quality = remove_background_local(png(rgb), 0.9)
+    assert result is None
+    assert 0.0 < quality['confidence'] < 0.9 and quality['border_uniformity'] == quality['confidence']
+
+
+def test_local_engine_skips_nova_canvas(fake_aws, monkeypatch):
+    monkeypatch.setattr(image_handler, 'LOCAL_BG_MIN_CONFIDENCE', 0.9)
+    result, report = image_handler.remove_background_with_report(png(quokka_on_plain_background()), engine='local')
+
+    assert report['engine'] == 'local' and not report['fallback'] and report['local']['confidence'] == 1.0
+    assert alpha_of(result)[0, 0] == 0
+    assert fake_aws.bedrock.calls == []
+
+
+def test_image_handler_import_does_not_load_numpy_or_pillow():
+    code = 'import sys; import handlers.image_handler; print("numpy" in sys.modules, "PIL" in sys.modules)'
+    completed = subprocess.run([sys.executable, '-c', code], cwd=SRC_DIR, capture_output=True, text=True, timeout=60)
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.split()[-2:] == ['False', 'False']
@@ -0,0 +1,90 @@
+import json
+from datetime import date, datetime, timezone
+
+import pytest
+
+from fake_aws import FakeS3
+from handlers.diary_store import (
+    diary_date, diary_key, legacy_diary_key, list_diary_keys, migrate_legacy_diaries, new_diary_id, new_ulid,
+    read_diary
+)
+
+BUCKET = 'test-bucket'
+
+
+def put_json(s3, key, data):
+    s3.put_object(Bucket=BUCKET, Key=key, Body=json.dumps(data, ensure_ascii=False), ContentType='application/json')
+
+
+def ulid_diary_id(day):
+    timestamp_ms = int(datetime(day.year, day.month, day.day, 12, tzinfo=timezone.utc).timestamp() * 1000)
+    return f"diary-{new_ulid(timestamp_ms)}"
+
+
+def test_new_ids_are_unique_and_time_sortable():
+    ids = [ulid_diary_id(date(2024, 9, day)) for day in (1, 2, 3)]
+    ids += [new_diary_id() for _ in range(2000)]
+
+    assert len(set(ids)) == len(ids)
+    assert ids[:3] == sorted(ids[:3])
+    assert ids[2] < ids[3]
+
+
+def test_keys_are_partitioned_by_date_and_hash():
+    diary_id = ulid_diary_id(date(2024, 9, 1))
+    key = diary_key(diary_id)
+
+    assert key.startswith('diaries/dt=2024-09-01/h=') and key.endswith(f"/{diary_id}.json")
+    assert diary_date('diary-20240901-abc') == date(2024, 9, 1)
+    assert diary_key('diary-20240901-abc').startswith('diaries/dt=2024-09-01/h=')
+    with pytest.raises(Exception, match='Invalid diary_id'):
+        diary_key('diary-unknown')
+
+
+def test_read_diary_prefers_new_key_and_falls_back_to_legacy_key():
+    s3 = FakeS3()
+    put_json(s3, legacy_diary_key('diary-20240901-abc'), {'diary_id': 'diary-20240901-abc', 'content': 'legacy'})
+    new_id = ulid_diary_id(date(2024, 9, 1))
+    put_json(s3, diary_key(new_id), {'diary_id': new_id, 'content': 'new'})
+
+    assert read_diary(s3, BUCKET, 'diary-20240901-abc')['content'] == 'legacy'
+    assert read_diary(s3, BUCKET, new_id)['content'] == 'new'
+    assert read_diary(s3, BUCKET, 'diary-20240902-fff') is None
+
+    put_json(s3, diary_key('diary-20240901-abc'), {'diary_id': 'diary-20240901-abc', 'content': 'migrated'})
+    assert read_diary(s3, BUCKET, 'diary-20240901-abc')['content'] == 'migrated'
+
+
+def test_list_diary_keys_only_lists_requested_dates():
+    s3 = FakeS3()
+    in_range = [ulid_diary_id(date(2024, 9, day)) for day in (1, 2)]
+    out_of_range = ulid_diary_id(date(2024, 9, 5))
+    for diary_id in in_range + [out_of_range]:
+        put_json(s3, diary_key(diary_id), {'diary_id': diary_id})
+    put_json(s3, legacy_diary_key('diary-20240902-abc'), {})
+    put_json(s3, legacy_diary_key('diary-20240905-abc'), {})
+
+    keys = list(list_diary_keys(s3, BUCKET, date(2024, 9, 1), date(2024, 9, 2)))
+    assert keys == [diary_key(diary_id) for diary_id in in_range]
+
+    keys = list(list_diary_keys(s3, BUCKET, date(2024, 9, 1), date(2024, 9, 2), include_legacy=True))
+    assert legacy_diary_key('diary-20240902-abc') in keys
+    assert legacy_diary_key('diary-20240905-abc') not in keys
+
+
+def test_migrate_legacy_diaries_dry_run_then_apply():
+    s3 = FakeS3()
+    legacy_ids = ['diary-20240901-abc', 'diary-20240901-fff', 'diary-20240903-123']
+    for diary_id in legacy_ids:
+        put_json(s3, legacy_diary_key(diary_id), {'diary_id': diary_id, 'content': diary_id})
+
+    planned = migrate_legacy_diaries(s3, BUCKET, date(2024, 9, 1), date(2024, 9, 2))
+    assert planned == [(legacy_diary_key(i), diary_key(i)) for i in legacy_ids[:2]]
+    assert len(s3.objects) == 3
+
+    moved = migrate_legacy_diaries(s3, BUCKET, date(2024, 9, 1), date(2024, 9, 2), dry_run=False)
+    assert moved == planned
+    for diary_id in legacy_ids[:2]:
+        assert (BUCKET, legacy_diary_key(diary_id)) in s3.objects
+        assert json.loads(s3.objects[(BUCKET, diary_key(diary_id))]['Body'])['content'] == diary_id
+    assert (BUCKET, diary_key(legacy_ids[2])) not in s3.objects
@@ -0,0 +1,210 @@
+import gzip
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+import pytest
+
+from fake_aws import FakeS3
+from handlers import text_handler
+from handlers.diary_store import (
+    BATCH_PREFIX, diary_key, diary_record, iter_batch_records, list_diary_keys, new_diary_id, read_diary
+)
+from handlers.diary_writer import DiaryBatchWriter
+
+BUCKET = 'test-bucket'
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def records(count):
+    return [diary_record(new_diary_id(), f'오늘의 일기 {i}번째, 산책을 했다', 'f', '멋져요 🌷') for i in range(count)]
+
+
+def stored_records(s3):
+    today = date.today()
+    return list(iter_batch_records(s3, BUCKET, today - timedelta(days=1), today + timedelta(days=1)))
+
+
+def batch_objects(s3):
+    return {key: obj for (bucket, key), obj in s3.objects.items() if key.startswith(BATCH_PREFIX)}
+
+
+def wait_until(predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_flush_writes_one_compact_ndjson_gzip_object():
+    s3 = FakeS3()
+    writer = DiaryBatchWriter(s3, BUCKET, max_records=100, max_age_seconds=60)
+    added = records(5)
+    for record in added:
+        writer.add(record)
+
+    assert s3.puts == 0 and writer.pending() == 5
+    assert writer.flush() == 5
+
+    (key, obj), = batch_objects(s3).items()
+    assert key.endswith('.ndjson.gz') and obj['ContentType'] == 'application/x-ndjson'
+    lines = gzip.decompress(obj['Body']).decode('utf-8').splitlines()
+    assert [json.loads(line) for line in lines] == added
+    assert all(': ' not in line for line in lines)
+    assert writer.pending() == 0
+
+
+def test_size_limit_triggers_background_flush():
+    s3 = FakeS3()
+    writer = DiaryBatchWriter(s3, BUCKET, max_records=10, max_age_seconds=60)
+    for record in records(25):
+        writer.add(record)
+
+    assert wait_until(lambda: writer.stats()['flushed'] >= 20), writer.stats()
+    writer.close()
+    assert writer.stats()['flushed'] == 25
+    assert len(stored_records(s3)) == 25
+
+
+def test_age_limit_triggers_background_flush():
+    s3 = FakeS3()
+    writer = DiaryBatchWriter(s3, BUCKET, max_records=100, max_age_seconds=0.1)
+    for record in records(3):
+        writer.add(record)
+
+    assert writer.pending() == 3
+    assert wait_until(lambda: writer.stats()['flushed'] == 3), writer.stats()
+    writer.close()
+
+
+def test_failed_upload_keeps_records_for_retry():
+    s3 = FakeS3(fail_puts=1)
+    clock = FakeClock()
+    writer = DiaryBatchWriter(s3, BUCKET, max_records=100, max_age_seconds=60, retry_seconds=5, clock=clock)
+    for record in records(4):
+        writer.add(record)
+
+    assert writer.flush() == 0
+    assert writer.pending() == 4 and writer.stats()['failed_flushes'] == 1
+    assert not writer._due()
+    clock.now += 5
+
+    assert writer.flush() == 4
+    assert len(stored_records(s3)) == 4
+
+
+def test_lost_ack_duplicates_are_removed_on_read():
+    s3 = FakeS3(lose_acks=1)
+    writer = DiaryBatchWriter(s3, BUCKET, max_records=100, max_age_seconds=60)
+    added = records(3)
+    for record in added:
+        writer.add(record)
+
+    assert writer.flush() == 0
+    assert writer.flush() == 3
+
+    assert len(batch_objects(s3)) == 2
+    assert sorted(r['diary_id'] for r in stored_records(s3)) == sorted(r['diary_id'] for r in added)
+
+
+def test_close_flushes_pending_records_and_rejects_new_ones():
+    s3 = FakeS3()
+    writer = DiaryBatchWriter(s3, BUCKET, max_records=100, max_age_seconds=60)
+    for record in records(2):
+        writer.add(record)
+    writer.close()
+
+    assert len(stored_records(s3)) == 2
+    with pytest.raises(Exception, match='closed'):
+        writer.add(records(1)[0])
+
+
+SHUTDOWN_SCRIPT = """
+import atexit, os, signal, sys
+sys.path[:0] = [{tests!r} + '/../benchmarks', {tests!r} + '/../src']
+from fake_aws import FakeS3
+from handlers.diary_store import diary_record, new_diary_id
+from handlers.diary_writer import DiaryBatchWriter, flush_on_shutdown
+s3 = FakeS3()
+atexit.register(lambda: print(len(s3.objects), s3.puts))
+writer = DiaryBatchWriter(s3, 'b', max_records=100, max_age_seconds=60)
+flush_on_shutdown(writer)
+for i in range(7):
+    writer.add(diary_record(new_diary_id(), 'x', 'f', 'y'))
+os.kill(os.getpid(), signal.SIGTERM)
+"""
+
+
+def test_sigterm_flushes_before_exit():
+    completed = subprocess.run(
+        [sys.executable, '-c', SHUTDOWN_SCRIPT.format(tests=TESTS_DIR)],
+        capture_output=True, text=True, timeout=30
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.split() == ['1', '1']
+
+
+def test_batch_mode_save_returns_before_upload(fake_aws, monkeypatch):
+    writer = DiaryBatchWriter(fake_aws.s3, BUCKET, max_records=100, max_age_seconds=60)
+    monkeypatch.setattr(text_handler, 'diary_writer', writer)
+    record = records(1)[0]
+
+    text_handler.save_diary_data(BUCKET, record['diary_id'], record['content'], record['type'], record['compliment'])
+    assert fake_aws.s3.puts == 0 and writer.pending() == 1
+
+    writer.close()
+    assert [r['diary_id'] for r in stored_records(fake_aws.s3)] == [record['diary_id']]
+
+
+def test_store_diaries_writes_one_readable_object_per_diary(fake_aws):
+    added = records(3)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        stored = text_handler.store_diaries(added, executor)
+    assert stored == {record['diary_id']: True for record in added}
+    assert batch_objects(fake_aws.s3) == {}
+
+    for record in added:
+        stored_diary = read_diary(fake_aws.s3, BUCKET, record['diary_id'])
+        assert {k: stored_diary[k] for k in ('diary_id', 'content', 'compliment')} == \
+            {k: record[k] for k in ('diary_id', 'content', 'compliment')}
+    today = date.today()
+    keys = list(list_diary_keys(fake_aws.s3, BUCKET, today - timedelta(days=1), today + timedelta(days=1)))
+    assert sorted(keys) == sorted(diary_key(record['diary_id']) for record in added)
+
+
+def test_store_diaries_reports_failed_upload(fake_aws):
+    fake_aws.s3.fail_puts = 1
+    added = records(3)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        stored = text_handler.store_diaries(added, executor)
+    assert list(stored.values()).count(False) == 1 and list(stored.values()).count(True) == 2
+
+
+def test_store_diaries_in_batch_mode_buffers_records(fake_aws, monkeypatch):
+    writer = DiaryBatchWriter(fake_aws.s3, BUCKET, max_records=100, max_age_seconds=60)
+    monkeypatch.setattr(text_handler, 'diary_writer', writer)
+    added = records(3)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        stored = text_handler.store_diaries(added, executor)
+    assert stored == {record['diary_id']: True for record in added}
+    assert fake_aws.s3.puts == 0 and writer.pending() == 3
+
+    writer.close()
+    assert sorted(r['diary_id'] for r in stored_records(fake_aws.s3)) == sorted(stored)
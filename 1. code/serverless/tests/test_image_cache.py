@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from fake_aws import client_error
+from handlers import image_handler
+from handlers.cache import LRUCache
+from handlers.media import DEFAULT_CACHE_CONTROL
+from handlers.tracing import trace_request
+
+COMPLIMENT = '정말 멋진 하루'
+
+
+@pytest.fixture
+def image(fake_aws, monkeypatch):
+    monkeypatch.setattr(image_handler, 'image_cache', LRUCache())
+    monkeypatch.setattr(image_handler, 'BACKGROUND_REMOVAL_ENGINE', 'remote')
+    return fake_aws
+
+
+def create_image(diary_id, compliment=COMPLIMENT):
+    """요청 하나를 Trace로 감싸 (URL, 캐시 횟수 지표) 반환"""
+    with trace_request('/generate/image') as trace:
+        url = image_handler.create_quokka_image(diary_id, compliment)
+        trace.status = 200
+    return url, trace.counts
+
+
+def uploaded_keys(s3):
+    return sorted(key for (bucket, key) in s3.objects)
+
+
+def fail_background_removal(bedrock):
+    """이미지 생성은 통과시키고 배경 제거 요청만 ValidationException으로 실패"""
+    invoke_model = bedrock.invoke_model
+
+    def invoke(**kwargs):
+        if json.loads(kwargs['body'])['taskType'] == 'BACKGROUND_REMOVAL':
+            raise client_error('ValidationException', 'InvokeModel', 400, 'bad image')
+        return invoke_model(**kwargs)
+    bedrock.invoke_model = invoke
+
+
+def test_miss_then_memory_hit(image):
+    url, counts = create_image('diary-1')
+    assert counts == {'image_cache_miss': 1}
+    assert f"{image_handler.IMAGE_CACHE_PREFIX}/" in url
+    calls = len(image.bedrock.calls)
+
+    again, counts = create_image('diary-1')
+    assert again == url and counts == {'image_cache_hit': 1}
+    assert len(image.bedrock.calls) == calls and image.s3.puts == 1
+
+
+def test_s3_hit_after_container_restart(image, monkeypatch):
+    url, _ = create_image('diary-1')
+    monkeypatch.setattr(image_handler, 'image_cache', LRUCache())
+
+    again, counts = create_image('diary-1')
+    assert again == url and counts == {'image_cache_hit': 1, 'image_cache_s3_hit': 1}
+    assert image.s3.puts == 1
+
+
+def test_key_depends_on_diary_and_compliment(image):
+    create_image('diary-1')
+    _, counts = create_image('diary-2')
+    assert counts == {'image_cache_miss': 1}
+    _, counts = create_image('diary-1', '내일도 화이팅')
+    assert counts == {'image_cache_miss': 1}
+    assert image.s3.puts == 3
+
+
+def test_background_removal_failure_is_not_cached(image):
+    fail_background_removal(image.bedrock)
+
+    url, counts = create_image('diary-1')
+    assert f"{image_handler.IMAGE_FALLBACK_PREFIX}/" in url
+    assert all(key.startswith(image_handler.IMAGE_FALLBACK_PREFIX) for key in uploaded_keys(image.s3))
+    (obj,) = image.s3.objects.values()
+    assert obj['CacheControl'] == DEFAULT_CACHE_CONTROL
+
+    # 같은 요청은 캐시 히트 없이 다시 생성
+    _, counts = create_image('diary-1')
+    assert counts == {'image_cache_miss': 1}
+    assert image_handler.find_cached_image('diary-1', COMPLIMENT) is None
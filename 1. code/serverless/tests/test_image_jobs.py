@@ -0,0 +1,153 @@
+import json
+import time
+
+import pytest
+
+from fake_aws import FakeBedrockRuntime, ModelBehavior, client_error
+from handlers import image_handler, jobs
+from handlers.cache import LRUCache
+from handlers.jobs import InMemoryJobQueue, InMemoryJobStore, JobQueue, JobStore, set_job_backend
+
+HEADERS = {'Content-Type': 'application/json'}
+
+
+class RecordingJobStore(InMemoryJobStore):
+    """상태/단계 변경 이력을 history에 남기는 메모리 저장소"""
+
+    def __init__(self):
+        super().__init__()
+        self.history = []
+
+    def put(self, job):
+        self.history.append((job['status'], job.get('stage')))
+        super().put(job)
+
+
+@pytest.fixture
+def job_backend(fake_aws, monkeypatch):
+    """큐에 들어온 메시지를 pending에 모아 두고 테스트가 직접 워커를 실행"""
+    monkeypatch.setattr(image_handler, 'image_cache', LRUCache())
+    store = RecordingJobStore()
+    pending = []
+    set_job_backend(store, InMemoryJobQueue(pending.append, synchronous=True))
+    yield store, pending
+    set_job_backend(None, None)
+
+
+def submit(body):
+    response = image_handler.handle_generate_image({'body': json.dumps(body, ensure_ascii=False)}, HEADERS)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def job_status(job_id):
+    response = image_handler.handle_image_job_status({'queryStringParameters': {'job_id': job_id}}, HEADERS)
+    return response['statusCode'], json.loads(response['body'])
+
+
+def test_async_job_lifecycle(job_backend):
+    store, pending = job_backend
+
+    status, body = submit({'diary_id': 'diary-1', 'compliment': '정말 멋진 하루', 'async': True})
+    assert status == 202 and body['status'] == jobs.STATUS_QUEUED
+    assert body['status_url'] == f"/generate/image/status?job_id={body['job_id']}"
+    assert pending == [{'job_id': body['job_id'], 'type': 'image'}]
+    assert job_status(body['job_id']) == (200, {
+        'job_id': body['job_id'], 'status': 'queued', 'stage': None, 'image_url': None, 'error': None
+    })
+
+    job = jobs.run_job(pending.pop(), image_handler.JOB_RUNNERS)
+    assert job['status'] == jobs.STATUS_SUCCEEDED
+
+    status, result = job_status(body['job_id'])
+    assert status == 200 and result['status'] == 'succeeded' and result['stage'] == 'done'
+    assert f"{image_handler.IMAGE_CACHE_PREFIX}/" in result['image_url']
+    assert store.history == [
+        ('queued', None),
+        ('running', 'started'),
+        ('running', 'cache_lookup'),
+        ('running', 'generating'),
+        ('running', 'removing_background'),
+        ('running', 'uploading'),
+        ('succeeded', 'done'),
+    ]
+
+
+def test_failed_job_reports_error(job_backend, fake_aws):
+    store, pending = job_backend
+    bedrock = fake_aws.install(bedrock=FakeBedrockRuntime(default=ModelBehavior(latency=0.0))).bedrock
+
+    def invalid(**kwargs):
+        raise client_error('ValidationException', 'InvokeModel', 400, 'bad prompt')
+    bedrock.invoke_model = invalid
+
+    _, body = submit({'diary_id': 'diary-2', 'compliment': '정말 멋진 하루', 'async': True})
+    jobs.run_job(pending.pop(), image_handler.JOB_RUNNERS)
+
+    status, result = job_status(body['job_id'])
+    assert status == 200 and result['status'] == 'failed'
+    assert result['error'] == jobs.ERROR_GENERATION_FAILED and result['image_url'] is None
+    assert 'ValidationException' not in json.dumps(result) and 'bad prompt' not in json.dumps(result)
+
+
+def test_throttled_job_reports_rate_limited(job_backend, fake_aws):
+    _, pending = job_backend
+    bedrock = fake_aws.install(bedrock=FakeBedrockRuntime(default=ModelBehavior(latency=0.0))).bedrock
+
+    def throttled(**kwargs):
+        raise client_error('ThrottlingException', 'InvokeModel', 429, 'slow down')
+    bedrock.invoke_model = throttled
+
+    _, body = submit({'diary_id': 'diary-5', 'compliment': '정말 멋진 하루', 'async': True})
+    jobs.run_job(pending.pop(), image_handler.JOB_RUNNERS)
+
+    _, result = job_status(body['job_id'])
+    assert result['status'] == 'failed' and result['error'] == jobs.ERROR_RATE_LIMITED
+
+
+def test_incomplete_backend_fails_on_creation():
+    class NoGet(JobStore):
+        def put(self, job):
+            pass
+
+    with pytest.raises(TypeError):
+        NoGet()
+    with pytest.raises(TypeError):
+        JobQueue()
+
+
+def test_async_request_for_existing_image_skips_the_queue(job_backend):
+    _, pending = job_backend
+    image_url = image_handler.create_quokka_image('diary-3', '정말 멋진 하루')
+
+    status, body = submit({'diary_id': 'diary-3', 'compliment': '정말 멋진 하루', 'async': True})
+    assert (status, body) == (200, {'image_url': image_url})
+    assert pending == []
+
+
+def test_status_requires_known_image_job(job_backend):
+    store, _ = job_backend
+    other = jobs.new_job('other', {})
+    store.put(other)
+
+    assert job_status('missing')[0] == 404
+    assert job_status(other['job_id'])[0] == 404
+    response = image_handler.handle_image_job_status({'queryStringParameters': None}, HEADERS)
+    assert response['statusCode'] == 400
+
+
+def test_worker_event_through_app_runs_job_in_background_queue(fake_aws, monkeypatch):
+    import app
+
+    monkeypatch.setattr(image_handler, 'image_cache', LRUCache())
+    store = InMemoryJobStore()
+    set_job_backend(store, InMemoryJobQueue(lambda message: app.lambda_handler({'job': message}, None)))
+    try:
+        _, body = submit({'diary_id': 'diary-4', 'compliment': '정말 멋진 하루', 'async': True})
+        for _ in range(100):
+            if store.get(body['job_id'])['status'] == jobs.STATUS_SUCCEEDED:
+                break
+            time.sleep(0.02)
+        status, result = job_status(body['job_id'])
+        assert status == 200 and result['status'] == 'succeeded' and result['image_url']
+    finally:
+        set_job_backend(None, None)
@@ -0,0 +1,60 @@
+import json
+import os
+import subprocess
+import sys
+import unicodedata
+
+import pytest
+
+from handlers.voice_handler import CHOSEONG_LIST, CONSONANT_MAP, HANGUL_FIRST, HANGUL_LAST, convert_to_kk_style
+
+SERVERLESS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SYLLABLES = ''.join(chr(code) for code in range(HANGUL_FIRST, HANGUL_LAST + 1))
+
+
+def nfd_convert(text):
+    """표준 라이브러리 NFD 분해로 구한 기대값 (첫 자모 U+1100 + 초성 인덱스)"""
+    return ''.join(
+        CONSONANT_MAP[CHOSEONG_LIST[ord(unicodedata.normalize('NFD', char)[0]) - 0x1100]]
+        for char in text if HANGUL_FIRST <= ord(char) <= HANGUL_LAST
+    )
+
+
+def test_matches_nfd_decomposition_for_every_syllable():
+    assert len(SYLLABLES) == 11172
+    assert convert_to_kk_style(SYLLABLES) == nfd_convert(SYLLABLES)
+
+
+def test_matches_jamo_implementation_for_every_syllable():
+    jamo = pytest.importorskip('jamo')
+    expected = ''.join(CONSONANT_MAP[jamo.j2hcj(jamo.h2j(char))[0]] for char in SYLLABLES)
+    assert convert_to_kk_style(SYLLABLES) == expected
+
+
+def test_choseong_order_matches_korean_syllable_data():
+    data_dir = os.path.join(SERVERLESS_DIR, 'data', 'KoreanSyllableData')
+    with open(os.path.join(data_dir, 'U+11xx.json'), encoding='utf-8') as f:
+        choseong = json.load(f)
+    with open(os.path.join(data_dir, 'U+31xx.json'), encoding='utf-8') as f:
+        letter_by_name = {name: char for char, name in json.load(f).items()}
+
+    expected = ''.join(
+        letter_by_name[choseong[chr(0x1100 + index)].replace('CHOSEONG', 'LETTER')]
+        for index in range(len(CHOSEONG_LIST))
+    )
+    assert expected == CHOSEONG_LIST
+
+
+def test_drops_non_syllable_characters():
+    assert convert_to_kk_style('정말 멋져요 💚 ok! ㅋㅋ 123') == nfd_convert('정말멋져요')
+    assert convert_to_kk_style('') == ''
+
+
+def test_voice_handler_import_does_not_load_jamo():
+    code = 'import sys; import handlers.voice_handler; print("jamo" in sys.modules)'
+    completed = subprocess.run(
+        [sys.executable, '-c', code], cwd=os.path.join(SERVERLESS_DIR, 'src'),
+        capture_output=True, text=True, timeout=60
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == 'False'
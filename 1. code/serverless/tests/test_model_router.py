@@ -0,0 +1,187 @@
+import json
+import time
+
+import pytest
+
+from fake_aws import FakeBedrockRuntime, ModelBehavior, client_error
+from handlers import model_router, text_handler
+from handlers.model_router import NOVA_LITE, NOVA_MICRO, NOVA_PRO, ModelTimeout, invoke_with_fallback
+from handlers.rate_limiter import RateLimited
+
+CONTENT = '오늘은 발표가 있었는데 생각보다 잘 끝나서 뿌듯했다. 준비한 만큼 결과가 나온 것 같다.'
+
+
+@pytest.fixture
+def short_timeouts(monkeypatch):
+    monkeypatch.setitem(model_router.MODEL_TIMEOUTS, NOVA_MICRO, 0.3)
+    monkeypatch.setitem(model_router.MODEL_TIMEOUTS, NOVA_LITE, 0.3)
+    monkeypatch.setitem(model_router.MODEL_TIMEOUTS, NOVA_PRO, 0.3)
+
+
+def fake_invoke(behaviors):
+    """model_id -> (지연 초, 예외 또는 None) 로 동작하는 invoke, 호출 순서를 calls에 기록"""
+    calls = []
+
+    def invoke(model_id):
+        calls.append(model_id)
+        delay, error = behaviors.get(model_id, (0.0, None))
+        time.sleep(delay)
+        if error is not None:
+            raise error
+        return f"from {model_id}"
+    return invoke, calls
+
+
+@pytest.mark.parametrize('quality_level, first_model', [('low', NOVA_MICRO), ('medium', NOVA_LITE), ('high', NOVA_PRO)])
+def test_routes_quality_level_to_first_model_in_chain(fake_aws, quality_level, first_model):
+    fake_aws.install(bedrock=FakeBedrockRuntime(default=ModelBehavior(latency=0.0)))
+
+    assert text_handler.generate_compliment(CONTENT, 'f', quality_level)
+    assert fake_aws.bedrock.calls == [first_model]
+
+
+def test_fails_over_to_next_model_on_throttle(fake_aws):
+    fake_aws.install(bedrock=FakeBedrockRuntime({NOVA_LITE: ModelBehavior(latency=0.0, throttle_rate=1.0)},
+                                                default=ModelBehavior(latency=0.0)))
+
+    assert text_handler.generate_compliment(CONTENT, 'f', 'medium')
+    assert fake_aws.bedrock.calls == [NOVA_LITE, NOVA_PRO]
+
+
+def test_fails_over_on_service_error(fake_aws):
+    invoke, calls = fake_invoke({NOVA_MICRO: (0.0, client_error('ServiceUnavailableException', 'InvokeModel', 503))})
+
+    assert invoke_with_fallback([NOVA_MICRO, NOVA_LITE], invoke, hedge_delay_ms=0) == (NOVA_LITE, f"from {NOVA_LITE}")
+    assert calls == [NOVA_MICRO, NOVA_LITE]
+
+
+def test_validation_error_does_not_fail_over(fake_aws):
+    invoke, calls = fake_invoke({NOVA_MICRO: (0.0, client_error('ValidationException', 'InvokeModel'))})
+
+    with pytest.raises(Exception) as raised:
+        invoke_with_fallback([NOVA_MICRO, NOVA_LITE], invoke, hedge_delay_ms=0)
+    assert raised.value.response['Error']['Code'] == 'ValidationException'
+    assert calls == [NOVA_MICRO]
+
+
+def test_hedges_slow_model_and_uses_first_response(fake_aws, short_timeouts):
+    invoke, calls = fake_invoke({NOVA_PRO: (0.25, None)})
+
+    start = time.perf_counter()
+    model_id, result = invoke_with_fallback([NOVA_PRO, NOVA_LITE], invoke, hedge_delay_ms=50)
+    elapsed = time.perf_counter() - start
+
+    assert (model_id, result) == (NOVA_LITE, f"from {NOVA_LITE}")
+    assert calls == [NOVA_PRO, NOVA_LITE]
+    assert elapsed < 0.2
+
+
+def test_no_hedge_when_first_model_answers_in_time(fake_aws):
+    invoke, calls = fake_invoke({NOVA_PRO: (0.01, None)})
+
+    assert invoke_with_fallback([NOVA_PRO, NOVA_LITE], invoke, hedge_delay_ms=200)[0] == NOVA_PRO
+    assert calls == [NOVA_PRO]
+
+
+def test_times_out_slow_model_and_fails_over(fake_aws, short_timeouts):
+    invoke, calls = fake_invoke({NOVA_MICRO: (1.0, None)})
+
+    start = time.perf_counter()
+    model_id, _ = invoke_with_fallback([NOVA_MICRO, NOVA_LITE], invoke, hedge_delay_ms=0)
+
+    assert model_id == NOVA_LITE
+    assert calls == [NOVA_MICRO, NOVA_LITE]
+    assert 0.3 <= time.perf_counter() - start < 0.9
+
+
+def test_raises_timeout_when_every_model_is_slow(fake_aws, short_timeouts):
+    invoke, calls = fake_invoke({NOVA_LITE: (1.0, None), NOVA_PRO: (1.0, None)})
+
+    with pytest.raises(ModelTimeout):
+        invoke_with_fallback([NOVA_LITE, NOVA_PRO], invoke, hedge_delay_ms=0)
+    assert calls == [NOVA_LITE, NOVA_PRO]
+
+
+def test_all_models_throttled_raises_rate_limited(fake_aws):
+    fake_aws.install(bedrock=FakeBedrockRuntime(default=ModelBehavior(latency=0.0, throttle_rate=1.0)))
+
+    with pytest.raises(RateLimited) as raised:
+        text_handler.generate_compliment(CONTENT, 'f', 'medium')
+    assert raised.value.retry_after >= 1
+    assert fake_aws.bedrock.calls == [NOVA_LITE, NOVA_PRO]
+
+
+def test_emits_route_decision_and_model_latency_metrics(fake_aws, capsys):
+    invoke, _ = fake_invoke({NOVA_MICRO: (0.0, client_error('ThrottlingException', 'InvokeModel', 429))})
+    invoke_with_fallback([NOVA_MICRO, NOVA_LITE], invoke, hedge_delay_ms=0, route='compliment-low')
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith('{')]
+    # 앞 테스트에서 버려진 느린 호출이 늦게 끝나며 남기는 지표가 섞일 수 있으므로 포함 여부만 확인
+    calls = [(r['Model'], r['Outcome']) for r in records if 'ModelLatency' in r]
+    assert (NOVA_MICRO, 'ThrottlingException') in calls and (NOVA_LITE, 'success') in calls
+    decision = next(r for r in records if 'RouteDecision' in r)
+    assert decision['Route'] == 'compliment-low'
+    assert (decision['Model'], decision['Failover'], decision['Hedged']) == (NOVA_LITE, 1, 0)
+
+
+def test_bedrock_clients_read_timeout_stays_inside_lambda_timeout():
+    pytest.importorskip('boto3')
+    from handlers.aws_clients import BEDROCK_READ_TIMEOUT, get_client, reset_clients
+
+    try:
+        assert get_client('bedrock-runtime', 'us-east-1').meta.config.read_timeout == BEDROCK_READ_TIMEOUT < 30
+        for model_id, timeout in model_router.DEFAULT_MODEL_TIMEOUTS.items():
+            config = model_router.model_client(model_id, 'us-east-1').meta.config
+            assert (config.read_timeout, config.connect_timeout) == (timeout, min(5, timeout))
+        assert model_router.model_client(NOVA_LITE, 'us-east-1') is model_router.model_client(NOVA_LITE, 'us-east-1')
+        assert get_client('s3', 'us-east-1').meta.config.read_timeout == 60
+    finally:
+        reset_clients()
+
+
+def test_registered_client_is_used_for_every_read_timeout(fake_aws):
+    assert model_router.model_client(NOVA_PRO) is fake_aws.bedrock
+    assert model_router.model_client(NOVA_MICRO, 'us-east-1') is fake_aws.bedrock
+
+
+class LambdaContext:
+    def __init__(self, remaining_ms):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+def test_call_timeout_is_bounded_by_the_request_deadline():
+    from handlers.rate_limiter import call_timeout, request_deadline
+
+    assert call_timeout(12) == 12 and call_timeout(0.3) == 1
+    # 마감 = 남은 시간 - DEADLINE_MARGIN_MS(1초)
+    with request_deadline(LambdaContext(3500)):
+        assert call_timeout(12) == 2
+        assert call_timeout(1) == 1
+    with request_deadline(LambdaContext(1200)):
+        assert call_timeout(12) == 1
+
+
+def test_client_near_the_deadline_gets_a_short_read_timeout():
+    pytest.importorskip('boto3')
+    from handlers.aws_clients import reset_clients
+    from handlers.rate_limiter import request_deadline
+
+    try:
+        with request_deadline(LambdaContext(4500)):
+            assert model_router.model_client(NOVA_PRO, 'us-east-1').meta.config.read_timeout == 3
+        assert model_router.model_client(NOVA_PRO, 'us-east-1').meta.config.read_timeout == 12
+    finally:
+        reset_clients()
+
+
+def test_no_call_is_made_without_budget_left(fake_aws):
+    from handlers.rate_limiter import limited_call, request_deadline
+
+    calls = []
+    with request_deadline(LambdaContext(1500)):
+        with pytest.raises(RateLimited):
+            limited_call(NOVA_PRO, lambda: calls.append(NOVA_PRO))
+    assert calls == []
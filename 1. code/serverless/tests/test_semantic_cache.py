@@ -0,0 +1,90 @@
+from handlers.semantic_cache import SemanticCache, jaccard, normalize_text, shingles
+
+DIARY = '오늘은 회사에서 프로젝트 발표를 했는데 생각보다 잘 끝나서 기분이 좋았다'
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def similarity(left, right):
+    return jaccard(shingles(normalize_text(left)), shingles(normalize_text(right)))
+
+
+def test_exact_hit_ignores_spacing_case_and_symbols():
+    cache = SemanticCache()
+    cache.store(DIARY, 'f', 'high', '멋져요')
+
+    assert cache.lookup(DIARY, 'f', 'high') == '멋져요'
+    assert cache.lookup(f"  {DIARY}!! 😊", 'f', 'high') == '멋져요'
+    assert cache.stats()['exact_hits'] == 2 and cache.stats()['near_hits'] == 0
+
+
+def test_partition_by_type_quality_and_prompt_version():
+    cache = SemanticCache()
+    cache.store(DIARY, 'f', 'high', '멋져요', version='v1')
+
+    assert cache.lookup(DIARY, 't', 'high', 'v1') is None
+    assert cache.lookup(DIARY, 'f', 'low', 'v1') is None
+    assert cache.lookup(DIARY, 'f', 'high', 'v2') is None
+    assert cache.stats()['misses'] == 3
+
+
+def test_near_duplicate_hits_above_threshold_and_misses_below():
+    cache = SemanticCache(similarity=0.7)
+    cache.store(DIARY, 'f', 'high', '멋져요')
+
+    near = DIARY.replace('기분이 좋았다', '기분이 좋았어')
+    assert similarity(DIARY, near) >= 0.7
+    assert cache.lookup(near, 'f', 'high') == '멋져요'
+    assert cache.stats()['near_hits'] == 1
+
+    far = '오늘은 회사에서 프로젝트 회의를 길게 해서 너무 피곤하고 힘들었다'
+    assert similarity(DIARY, far) < 0.7
+    assert cache.lookup(far, 'f', 'high') is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = SemanticCache(ttl_seconds=60, clock=clock)
+    cache.store(DIARY, 'f', 'high', '멋져요')
+
+    clock.now = 60
+    assert cache.lookup(DIARY, 'f', 'high') == '멋져요'
+    clock.now = 61
+    assert cache.lookup(DIARY, 'f', 'high') is None
+    assert cache.stats()['expired'] == 1 and cache.stats()['size'] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SemanticCache(maxsize=2)
+    diaries = ['아침에 공원을 한 시간 산책했다', '친구와 저녁으로 파스타를 먹었다', '밤새 보고서를 쓰느라 잠을 못 잤다']
+    cache.store(diaries[0], 'f', 'high', 'a')
+    cache.store(diaries[1], 'f', 'high', 'b')
+    assert cache.lookup(diaries[0], 'f', 'high') == 'a'
+
+    cache.store(diaries[2], 'f', 'high', 'c')
+    assert cache.stats()['evictions'] == 1
+    assert cache.lookup(diaries[1], 'f', 'high') is None
+    assert cache.lookup(diaries[0], 'f', 'high') == 'a'
+    assert cache.lookup(diaries[2], 'f', 'high') == 'c'
+
+
+def test_variants_are_collected_then_served_in_rotation():
+    cache = SemanticCache(variants=2)
+    cache.store(DIARY, 'f', 'high', '멋져요')
+    # variants를 다 모으기 전에는 미스로 보고 새로 생성하게 함
+    assert cache.lookup(DIARY, 'f', 'high') is None
+
+    cache.store(DIARY, 'f', 'high', '멋져요')
+    assert cache.lookup(DIARY, 'f', 'high') is None
+    cache.store(DIARY, 'f', 'high', '대단해요')
+    cache.store(DIARY, 'f', 'high', '세 번째')
+
+    served = [cache.lookup(DIARY, 'f', 'high') for _ in range(4)]
+    assert served == ['멋져요', '대단해요', '멋져요', '대단해요']
@@ -0,0 +1,163 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+import stream_server
+from fake_aws import FakeBedrockRuntime, ModelBehavior
+from handlers.diary_store import new_diary_id
+from handlers.text_handler import handle_generate_text, stream_generate_text
+
+HEADERS = {'Content-Type': 'application/json'}
+CONTENT = '오늘은 발표가 있었는데 생각보다 잘 끝나서 뿌듯했다. 준비한 만큼 결과가 나온 것 같다.'
+
+
+class LazyStreamBedrock(FakeBedrockRuntime):
+    """응답 스트림 청크를 소비되는 만큼만 만들어 내는 가짜 Bedrock (sent: 지금까지 내보낸 청크 수)"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.sent = 0
+        self.total = 0
+
+    def invoke_model_with_response_stream(self, modelId, body, contentType=None, accept=None):
+        events = super().invoke_model_with_response_stream(modelId, body, contentType, accept)['body']
+        self.total = len(events)
+
+        def lazy():
+            for event in events:
+                self.sent += 1
+                yield event
+
+        return {'body': lazy()}
+
+
+class GatedStreamBedrock(LazyStreamBedrock):
+    """첫 청크를 내보낸 뒤 release가 설정될 때까지 다음 청크를 멈춰 두는 가짜 Bedrock"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.release = threading.Event()
+
+    def invoke_model_with_response_stream(self, modelId, body, contentType=None, accept=None):
+        events = super().invoke_model_with_response_stream(modelId, body, contentType, accept)['body']
+
+        def gated():
+            yield next(events)
+            assert self.release.wait(5)
+            yield from events
+
+        return {'body': gated()}
+
+
+@pytest.fixture
+def server(fake_aws):
+    server = stream_server.make_server(port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def post_stream(server, body):
+    conn = http.client.HTTPConnection(*server.server_address, timeout=5)
+    conn.request('POST', stream_server.STREAM_PATH, json.dumps(body, ensure_ascii=False).encode('utf-8'), HEADERS)
+    return conn.getresponse()
+
+
+def read_frame(response):
+    """SSE 프레임 하나(빈 줄까지)를 읽어 (event, data) 반환"""
+    lines = []
+    while True:
+        line = response.readline().decode('utf-8')
+        if line in ('\n', ''):
+            return parse_frame(''.join(lines))
+        lines.append(line)
+
+
+def parse_frame(frame):
+    event, data = frame.strip().split('\n')
+    return event[len('event: '):], json.loads(data[len('data: '):])
+
+
+def test_stream_yields_tokens_before_model_stream_finishes(fake_aws):
+    bedrock = fake_aws.install(bedrock=LazyStreamBedrock()).bedrock
+    diary_id = new_diary_id()
+    frames = stream_generate_text(diary_id, CONTENT, 'f', 'high')
+
+    assert parse_frame(next(frames)) == ('meta', {'diary_id': diary_id})
+    event, data = parse_frame(next(frames))
+    assert event == 'token' and data['text']
+    assert bedrock.sent == 1 < bedrock.total
+
+    rest = [parse_frame(frame) for frame in frames]
+    assert bedrock.sent == bedrock.total
+    event, done = rest[-1]
+    assert event == 'done'
+    assert done['compliment'] == data['text'] + ''.join(d['text'] for e, d in rest[:-1])
+
+
+def test_stream_saves_diary_after_done(fake_aws):
+    fake_aws.install(bedrock=LazyStreamBedrock())
+    frames = stream_generate_text(new_diary_id(), CONTENT, 'f', 'high')
+    next(frames)
+    next(frames)
+    assert fake_aws.s3.puts == 0
+
+    list(frames)
+    assert fake_aws.s3.puts == 1
+
+
+def test_generate_text_ignores_stream_flag_on_buffered_endpoint(fake_aws):
+    event = {'body': json.dumps({'type': 'F', 'content': CONTENT, 'stream': True}, ensure_ascii=False)}
+    response = handle_generate_text(event, HEADERS)
+
+    assert response['statusCode'] == 200
+    assert response['headers']['Content-Type'] == 'application/json'
+    body = json.loads(response['body'])
+    assert body['compliment'] and body['diary_id']
+
+
+def test_stream_endpoint_sends_first_token_while_model_is_still_streaming(server, fake_aws):
+    bedrock = fake_aws.install(bedrock=GatedStreamBedrock()).bedrock
+    response = post_stream(server, {'type': 'F', 'content': CONTENT})
+
+    assert response.status == 200
+    assert response.getheader('Content-Type').startswith('text/event-stream')
+    assert response.getheader('Transfer-Encoding') == 'chunked'
+    event, meta = read_frame(response)
+    assert event == 'meta' and meta['diary_id']
+    event, first = read_frame(response)
+    assert event == 'token' and first['text']
+    # 모델 스트림은 아직 첫 청크에서 멈춰 있음
+    assert bedrock.sent == 1 < bedrock.total
+
+    bedrock.release.set()
+    frames = []
+    while not frames or frames[-1][0] != 'done':
+        frames.append(read_frame(response))
+    assert response.read() == b''
+    done = frames[-1][1]
+    assert done['compliment'] == first['text'] + ''.join(d['text'] for e, d in frames[:-1])
+    assert fake_aws.s3.puts == 1
+
+
+def test_stream_endpoint_rejects_invalid_input(server, fake_aws):
+    response = post_stream(server, {'type': 'F', 'content': ''})
+
+    assert response.status == 400
+    assert response.getheader('Content-Type') == 'application/json'
+    assert json.loads(response.read())['error']
+    assert fake_aws.bedrock.calls == []
+
+
+def test_stream_endpoint_returns_429_before_streaming_when_throttled(server, fake_aws):
+    fake_aws.install(bedrock=FakeBedrockRuntime(default=ModelBehavior(latency=0.0, throttle_rate=1.0)))
+    response = post_stream(server, {'type': 'F', 'content': CONTENT})
+
+    assert response.status == 429
+    assert int(response.getheader('Retry-After')) >= 1
+    assert json.loads(response.read())['retry_after'] >= 1
+    assert fake_aws.s3.puts == 0
@@ -0,0 +1,34 @@
+import pytest
+
+from handlers.text_validation import validate_input
+
+SPAM_ERROR = '무의미한 반복 패턴 감지'
+
+
+@pytest.mark.parametrize('content', [
+    '오늘 시험 망쳤다 ㅠㅠㅠㅠㅠ 그래도 내일은 잘할 거야',
+    '강아지가 너무 보고 싶어 ㅜㅜㅜㅜㅜ 주말에 보러 가야지',
+    'ㅋㅋㅋㅋㅋ 오늘 동생이랑 게임하다가 엄청 웃었다',
+    '친구가 해준 농담이 너무 웃겼다 하하하하하',
+    '드디어 합격했다!!!!! 너무 기쁘다 정말로',
+    'ㅋㅎㅋㅎㅋㅎ 아 오늘 너무 웃겼다 진짜로 최고의 하루',
+    '오늘은 조용히 책을 읽었다...... 마음이 편안했다~~~~~~',
+    '적금 1000000원을 모았다 뿌듯한 하루였다',
+])
+def test_accepts_short_emotional_runs(content):
+    error, cleaned, quality = validate_input('F', content)
+    assert error is None, content
+    assert cleaned and quality
+
+
+@pytest.mark.parametrize('content', [
+    '하하하하하하하하하하하',
+    '아아아아아아아아아 배고파',
+    'ㅋㅎㅋㅎㅋㅎㅋㅎㅋㅎㅋㅎ 웃김',
+    '오늘 ' + 'ㅋ' * 20 + ' 일기 끝 정말 재밌는 하루였다 내일도 좋은 하루',
+    'asdfasdfasdf ' + 'abababababababababababab',
+])
+def test_rejects_dominant_or_very_long_runs(content):
+    error, cleaned, quality = validate_input('T', content)
+    assert error == SPAM_ERROR, content
+    assert cleaned is None and quality is None
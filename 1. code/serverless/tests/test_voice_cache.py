@@ -0,0 +1,61 @@
+import pytest
+
+from handlers import voice_handler
+from handlers.cache import LRUCache
+from handlers.tracing import trace_request
+
+COMPLIMENT = '오늘도 정말 잘 해냈어요'
+
+
+@pytest.fixture
+def voice(fake_aws, monkeypatch):
+    if not voice_handler.load_padata_sounds():
+        pytest.skip('사운드 뱅크 없음 (python src/handlers/sound_bank.py)')
+    monkeypatch.setattr(voice_handler, 'voice_cache', LRUCache())
+    return fake_aws
+
+
+def create_voice(compliment):
+    """요청 하나를 Trace로 감싸 (URL, 캐시 횟수 지표) 반환"""
+    with trace_request('/generate/voice') as trace:
+        url = voice_handler.create_voice('diary-1', compliment)
+        trace.status = 200
+    return url, trace.counts
+
+
+def test_miss_then_memory_hit(voice):
+    url, counts = create_voice(COMPLIMENT)
+    assert url and counts == {'voice_cache_miss': 1}
+    assert voice.s3.puts == 1
+
+    again, counts = create_voice(COMPLIMENT)
+    assert again == url and counts == {'voice_cache_hit': 1}
+    assert voice.s3.puts == 1
+
+
+def test_s3_hit_after_container_restart(voice, monkeypatch):
+    url, _ = create_voice(COMPLIMENT)
+    monkeypatch.setattr(voice_handler, 'voice_cache', LRUCache())
+
+    again, counts = create_voice(COMPLIMENT)
+    assert again == url and counts == {'voice_cache_hit': 1, 'voice_cache_s3_hit': 1}
+    assert voice.s3.puts == 1
+
+
+def test_same_consonants_share_a_clip_and_different_sentences_do_not(voice):
+    create_voice(COMPLIMENT)
+    # 구두점/이모지는 지워지고 초성만 남으므로 같은 음성
+    _, counts = create_voice(COMPLIMENT + '!! 🌷')
+    assert counts == {'voice_cache_hit': 1}
+
+    _, counts = create_voice('내일도 힘내요')
+    assert counts == {'voice_cache_miss': 1}
+    assert voice.s3.puts == 2
+
+
+def test_cache_lookup_does_not_print_stats(voice, capsys):
+    create_voice(COMPLIMENT)
+    capsys.readouterr()
+
+    voice_handler.create_voice('diary-1', COMPLIMENT)
+    assert capsys.readouterr().out == ''
@@ -0,0 +1,58 @@
+import json
+import subprocess
+
+import pytest
+
+from handlers import audio_codec, voice_handler
+from handlers.cache import LRUCache
+
+HEADERS = {'Content-Type': 'application/json'}
+COMPLIMENT = '오늘도 정말 잘 해냈어요'
+
+
+@pytest.fixture
+def no_ffmpeg(monkeypatch):
+    monkeypatch.setattr(audio_codec, '_ffmpeg', None)
+    monkeypatch.setattr(audio_codec, '_ffmpeg_checked', True)
+
+
+@pytest.fixture
+def sounds(monkeypatch):
+    if not voice_handler.load_padata_sounds():
+        pytest.skip('사운드 뱅크 없음 (python src/handlers/sound_bank.py)')
+    monkeypatch.setattr(voice_handler, 'voice_cache', LRUCache())
+
+
+def post_voice(body):
+    return voice_handler.handle_generate_voice({'body': json.dumps(body, ensure_ascii=False)}, HEADERS)
+
+
+def test_rejects_compressed_format_without_ffmpeg(fake_aws, no_ffmpeg):
+    assert audio_codec.supported_formats() == ['wav']
+
+    response = post_voice({'diary_id': 'diary-1', 'compliment': COMPLIMENT, 'format': 'mp3'})
+    assert response['statusCode'] == 400
+    assert json.loads(response['body'])['error'] == 'format must be one of wav'
+    assert fake_aws.s3.puts == 0
+
+
+def test_wav_fallback_is_cached_under_wav_key(fake_aws, sounds, monkeypatch):
+    monkeypatch.setattr(audio_codec, '_ffmpeg', '/usr/bin/ffmpeg')
+    monkeypatch.setattr(audio_codec, '_ffmpeg_checked', True)
+
+    def broken_ffmpeg(*args, **kwargs):
+        raise subprocess.CalledProcessError(1, 'ffmpeg')
+    monkeypatch.setattr(audio_codec, 'encode_compressed', broken_ffmpeg)
+
+    first = post_voice({'diary_id': 'diary-1', 'compliment': COMPLIMENT, 'format': 'mp3'})
+    assert first['statusCode'] == 200
+    keys = [key for _, key in fake_aws.s3.objects]
+    assert len(keys) == 1 and keys[0].endswith('.wav')
+    kk_sound = voice_handler.convert_to_kk_style(COMPLIMENT)
+    assert keys[0] == f"{voice_handler.VOICE_CACHE_PREFIX}/{voice_handler.voice_cache_key(kk_sound, 'wav')}.wav"
+
+    # 같은 문장을 wav로 요청하면 다시 합성하지 않고 같은 객체를 재사용
+    monkeypatch.setattr(voice_handler, 'voice_cache', LRUCache())
+    second = post_voice({'diary_id': 'diary-2', 'compliment': COMPLIMENT, 'format': 'wav'})
+    assert json.loads(second['body'])['voice_url'] == json.loads(first['body'])['voice_url']
+    assert fake_aws.s3.puts == 1
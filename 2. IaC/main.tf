@@ -198,6 +198,23 @@ resource "aws_iam_role_policy" "s3_backend_policy" {
   })
 }
 
+# IAM Policy for async image jobs (Lambda self-invoke)
+resource "aws_iam_role_policy" "lambda_self_invoke_policy" {
+  name = "${var.phase}-${var.prefix}-lambda-self-invoke-policy"
+  role = aws_iam_role.lambda_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect   = "Allow"
+        Action   = ["lambda:InvokeFunction"]
+        Resource = aws_lambda_function.api.arn
+      }
+    ]
+  })
+}
+
 # Dummy Lambda deployment package
 data "archive_file" "lambda_zip" {
   type        = "zip"
@@ -252,6 +269,114 @@ resource "aws_lambda_function" "api" {
   }
 }
 
+# Lambda Function for voice (/generate/voice)
+# 음성 경로는 사운드 뱅크 + 피치 테이블을 메모리에 올리고 CPU로 합성하므로 별도 메모리/웜 풀로 분리
+resource "aws_lambda_function" "voice" {
+  filename         = data.archive_file.lambda_zip.output_path
+  function_name    = "${var.phase}-${var.prefix}-voice"
+  role             = aws_iam_role.lambda_role.arn
+  handler          = "app.lambda_handler"
+  runtime          = "python3.11"
+  memory_size      = var.voice_memory_size
+  timeout          = var.lambda_timeout
+  publish          = true
+  source_code_hash = data.archive_file.lambda_zip.output_base64sha256
+
+  environment {
+    variables = {
+      S3_BUCKET       = aws_s3_bucket.backend.bucket
+      ENVIRONMENT     = var.phase
+      FUNCTION_ROUTES = "/generate/voice"
+    }
+  }
+
+  tags = {
+    Name = "${var.phase}-${var.prefix}-voice"
+  }
+}
+
+# Lambda Function for text streaming (POST {text_stream_function_url}/generate/text/stream)
+# API Gateway REST는 응답을 모아서 보내므로 Function URL(RESPONSE_STREAM)로 받고,
+# Lambda Web Adapter 레이어가 run.sh로 띄운 stream_server.py에 요청을 넘겨 SSE 프레임을 그대로 흘려보냄
+resource "aws_lambda_function" "text_stream" {
+  filename         = data.archive_file.lambda_zip.output_path
+  function_name    = "${var.phase}-${var.prefix}-text-stream"
+  role             = aws_iam_role.lambda_role.arn
+  handler          = "run.sh"
+  runtime          = "python3.11"
+  memory_size      = var.text_stream_memory_size
+  timeout          = var.lambda_timeout
+  layers           = ["arn:aws:lambda:${var.aws_region}:753240598075:layer:LambdaAdapterLayerX86:${var.lambda_adapter_layer_version}"]
+  source_code_hash = data.archive_file.lambda_zip.output_base64sha256
+
+  environment {
+    variables = {
+      S3_BUCKET               = aws_s3_bucket.backend.bucket
+      ENVIRONMENT             = var.phase
+      AWS_LAMBDA_EXEC_WRAPPER = "/opt/bootstrap"
+      AWS_LWA_INVOKE_MODE     = "response_stream"
+      PORT                    = "8080"
+    }
+  }
+
+  tags = {
+    Name = "${var.phase}-${var.prefix}-text-stream"
+  }
+}
+
+resource "aws_lambda_function_url" "text_stream" {
+  function_name      = aws_lambda_function.text_stream.function_name
+  authorization_type = "NONE"
+  invoke_mode        = "RESPONSE_STREAM"
+
+  cors {
+    allow_origins  = ["*"]
+    allow_methods  = ["POST"]
+    allow_headers  = ["content-type"]
+    expose_headers = ["retry-after"]
+  }
+}
+
+# 배포(CD)가 새 버전을 게시하고 옮기는 별칭 - 프로비저닝된 동시성은 별칭에 붙음
+resource "aws_lambda_alias" "voice_live" {
+  name             = "live"
+  function_name    = aws_lambda_function.voice.function_name
+  function_version = aws_lambda_function.voice.version
+
+  lifecycle {
+    ignore_changes = [function_version]
+  }
+}
+
+# 초기화 단계에서 app.warm_up이 사운드 뱅크/피치 테이블을 올린 컨테이너를 항상 유지
+resource "aws_lambda_provisioned_concurrency_config" "voice" {
+  count                             = var.voice_provisioned_concurrency > 0 ? 1 : 0
+  function_name                     = aws_lambda_alias.voice_live.function_name
+  qualifier                         = aws_lambda_alias.voice_live.name
+  provisioned_concurrent_executions = var.voice_provisioned_concurrency
+}
+
+# Keep-alive: 프로비저닝된 동시성 밖의 컨테이너도 {"warmup": true} 이벤트로 주기적으로 깨움
+resource "aws_cloudwatch_event_rule" "voice_warmup" {
+  name                = "${var.phase}-${var.prefix}-voice-warmup"
+  schedule_expression = var.warmup_schedule
+}
+
+resource "aws_cloudwatch_event_target" "voice_warmup" {
+  rule  = aws_cloudwatch_event_rule.voice_warmup.name
+  arn   = aws_lambda_alias.voice_live.arn
+  input = jsonencode({ warmup = true })
+}
+
+resource "aws_lambda_permission" "voice_warmup" {
+  statement_id  = "AllowExecutionFromEventBridgeWarmup"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.voice.function_name
+  qualifier     = aws_lambda_alias.voice_live.name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.voice_warmup.arn
+}
+
 # API Gateway REST API
 resource "aws_api_gateway_rest_api" "api" {
   name        = "${var.phase}-${var.prefix}-api"
@@ -294,6 +419,27 @@ resource "aws_api_gateway_resource" "generate_voice" {
   path_part   = "voice"
 }
 
+# API Gateway Resource: /generate/all
+resource "aws_api_gateway_resource" "generate_all" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  parent_id   = aws_api_gateway_resource.generate.id
+  path_part   = "all"
+}
+
+# API Gateway Resource: /generate/text/batch
+resource "aws_api_gateway_resource" "generate_text_batch" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  parent_id   = aws_api_gateway_resource.generate_text.id
+  path_part   = "batch"
+}
+
+# API Gateway Resource: /generate/image/status
+resource "aws_api_gateway_resource" "generate_image_status" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  parent_id   = aws_api_gateway_resource.generate_image.id
+  path_part   = "status"
+}
+
 # API Gateway Method: POST /generate/text
 resource "aws_api_gateway_method" "generate_text_post" {
   rest_api_id   = aws_api_gateway_rest_api.api.id
@@ -318,6 +464,30 @@ resource "aws_api_gateway_method" "generate_voice_post" {
   authorization = "NONE"
 }
 
+# API Gateway Method: POST /generate/all
+resource "aws_api_gateway_method" "generate_all_post" {
+  rest_api_id   = aws_api_gateway_rest_api.api.id
+  resource_id   = aws_api_gateway_resource.generate_all.id
+  http_method   = "POST"
+  authorization = "NONE"
+}
+
+# API Gateway Method: POST /generate/text/batch
+resource "aws_api_gateway_method" "generate_text_batch_post" {
+  rest_api_id   = aws_api_gateway_rest_api.api.id
+  resource_id   = aws_api_gateway_resource.generate_text_batch.id
+  http_method   = "POST"
+  authorization = "NONE"
+}
+
+# API Gateway Method: GET /generate/image/status
+resource "aws_api_gateway_method" "generate_image_status_get" {
+  rest_api_id   = aws_api_gateway_rest_api.api.id
+  resource_id   = aws_api_gateway_resource.generate_image_status.id
+  http_method   = "GET"
+  authorization = "NONE"
+}
+
 # API Gateway Integration: /generate/text
 resource "aws_api_gateway_integration" "generate_text_integration" {
   rest_api_id = aws_api_gateway_rest_api.api.id
@@ -346,6 +516,39 @@ resource "aws_api_gateway_integration" "generate_voice_integration" {
   resource_id = aws_api_gateway_resource.generate_voice.id
   http_method = aws_api_gateway_method.generate_voice_post.http_method
 
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_alias.voice_live.invoke_arn
+}
+
+# API Gateway Integration: /generate/all
+resource "aws_api_gateway_integration" "generate_all_integration" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  resource_id = aws_api_gateway_resource.generate_all.id
+  http_method = aws_api_gateway_method.generate_all_post.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.api.invoke_arn
+}
+
+# API Gateway Integration: /generate/text/batch
+resource "aws_api_gateway_integration" "generate_text_batch_integration" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  resource_id = aws_api_gateway_resource.generate_text_batch.id
+  http_method = aws_api_gateway_method.generate_text_batch_post.http_method
+
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.api.invoke_arn
+}
+
+# API Gateway Integration: /generate/image/status
+resource "aws_api_gateway_integration" "generate_image_status_integration" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  resource_id = aws_api_gateway_resource.generate_image_status.id
+  http_method = aws_api_gateway_method.generate_image_status_get.http_method
+
   integration_http_method = "POST"
   type                    = "AWS_PROXY"
   uri                     = aws_lambda_function.api.invoke_arn
@@ -373,6 +576,20 @@ resource "aws_api_gateway_method" "generate_voice_options" {
   authorization = "NONE"
 }
 
+resource "aws_api_gateway_method" "generate_all_options" {
+  rest_api_id   = aws_api_gateway_rest_api.api.id
+  resource_id   = aws_api_gateway_resource.generate_all.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_method" "generate_text_batch_options" {
+  rest_api_id   = aws_api_gateway_rest_api.api.id
+  resource_id   = aws_api_gateway_resource.generate_text_batch.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
 # CORS OPTIONS Integrations
 resource "aws_api_gateway_integration" "generate_text_options_integration" {
   rest_api_id = aws_api_gateway_rest_api.api.id
@@ -407,6 +624,28 @@ resource "aws_api_gateway_integration" "generate_voice_options_integration" {
   }
 }
 
+resource "aws_api_gateway_integration" "generate_all_options_integration" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  resource_id = aws_api_gateway_resource.generate_all.id
+  http_method = aws_api_gateway_method.generate_all_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{\"statusCode\": 200}"
+  }
+}
+
+resource "aws_api_gateway_integration" "generate_text_batch_options_integration" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  resource_id = aws_api_gateway_resource.generate_text_batch.id
+  http_method = aws_api_gateway_method.generate_text_batch_options.http_method
+  type        = "MOCK"
+
+  request_templates = {
+    "application/json" = "{\"statusCode\": 200}"
+  }
+}
+
 # CORS Method Responses
 resource "aws_api_gateway_method_response" "generate_text_options_200" {
   rest_api_id = aws_api_gateway_rest_api.api.id
@@ -447,6 +686,32 @@ resource "aws_api_gateway_method_response" "generate_voice_options_200" {
   }
 }
 
+resource "aws_api_gateway_method_response" "generate_all_options_200" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  resource_id = aws_api_gateway_resource.generate_all.id
+  http_method = aws_api_gateway_method.generate_all_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_method_response" "generate_text_batch_options_200" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  resource_id = aws_api_gateway_resource.generate_text_batch.id
+  http_method = aws_api_gateway_method.generate_text_batch_options.http_method
+  status_code = "200"
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
 # CORS Integration Responses
 resource "aws_api_gateway_integration_response" "generate_text_options_integration_response" {
   rest_api_id = aws_api_gateway_rest_api.api.id
@@ -487,6 +752,32 @@ resource "aws_api_gateway_integration_response" "generate_voice_options_integrat
   }
 }
 
+resource "aws_api_gateway_integration_response" "generate_all_options_integration_response" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  resource_id = aws_api_gateway_resource.generate_all.id
+  http_method = aws_api_gateway_method.generate_all_options.http_method
+  status_code = aws_api_gateway_method_response.generate_all_options_200.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,Authorization'"
+    "method.response.header.Access-Control-Allow-Methods" = "'POST,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+}
+
+resource "aws_api_gateway_integration_response" "generate_text_batch_options_integration_response" {
+  rest_api_id = aws_api_gateway_rest_api.api.id
+  resource_id = aws_api_gateway_resource.generate_text_batch.id
+  http_method = aws_api_gateway_method.generate_text_batch_options.http_method
+  status_code = aws_api_gateway_method_response.generate_text_batch_options_200.status_code
+
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,Authorization'"
+    "method.response.header.Access-Control-Allow-Methods" = "'POST,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+}
+
 # Lambda Permission for API Gateway
 resource "aws_lambda_permission" "api_gateway_lambda" {
   statement_id  = "AllowExecutionFromAPIGateway"
@@ -496,15 +787,29 @@ resource "aws_lambda_permission" "api_gateway_lambda" {
   source_arn    = "${aws_api_gateway_rest_api.api.execution_arn}/*/*"
 }
 
+resource "aws_lambda_permission" "api_gateway_voice" {
+  statement_id  = "AllowExecutionFromAPIGateway"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.voice.function_name
+  qualifier     = aws_lambda_alias.voice_live.name
+  principal     = "apigateway.amazonaws.com"
+  source_arn    = "${aws_api_gateway_rest_api.api.execution_arn}/*/*"
+}
+
 # API Gateway Deployment
 resource "aws_api_gateway_deployment" "api" {
   depends_on = [
     aws_api_gateway_integration.generate_text_integration,
     aws_api_gateway_integration.generate_image_integration,
     aws_api_gateway_integration.generate_voice_integration,
+    aws_api_gateway_integration.generate_all_integration,
+    aws_api_gateway_integration.generate_text_batch_integration,
+    aws_api_gateway_integration.generate_image_status_integration,
     aws_api_gateway_integration_response.generate_text_options_integration_response,
     aws_api_gateway_integration_response.generate_image_options_integration_response,
-    aws_api_gateway_integration_response.generate_voice_options_integration_response
+    aws_api_gateway_integration_response.generate_voice_options_integration_response,
+    aws_api_gateway_integration_response.generate_all_options_integration_response,
+    aws_api_gateway_integration_response.generate_text_batch_options_integration_response
   ]
 
   rest_api_id = aws_api_gateway_rest_api.api.id
@@ -535,6 +840,15 @@ resource "aws_cloudwatch_log_group" "lambda_logs" {
   }
 }
 
+resource "aws_cloudwatch_log_group" "voice_logs" {
+  name              = "/aws/lambda/${aws_lambda_function.voice.function_name}"
+  retention_in_days = 7
+
+  tags = {
+    Name = "${var.phase}-${var.prefix}-voice-logs"
+  }
+}
+
 # GitHub OIDC Provider
 resource "aws_iam_openid_connect_provider" "github" {
   url = "https://token.actions.githubusercontent.com"
@@ -622,6 +936,20 @@ resource "aws_iam_role_policy" "github_actions_policy" {
         ]
         Resource = aws_lambda_function.api.arn
       },
+      {
+        Effect = "Allow"
+        Action = [
+          "lambda:UpdateFunctionCode",
+          "lambda:GetFunction",
+          "lambda:GetFunctionConfiguration",
+          "lambda:PublishVersion",
+          "lambda:UpdateAlias"
+        ]
+        Resource = [
+          aws_lambda_function.voice.arn,
+          "${aws_lambda_function.voice.arn}:*"
+        ]
+      },
       {
         Effect = "Allow"
         Action = [
@@ -43,6 +43,26 @@ output "lambda_function_name" {
   value       = aws_lambda_function.api.function_name
 }
 
+output "voice_lambda_function_name" {
+  description = "Voice Lambda function name"
+  value       = aws_lambda_function.voice.function_name
+}
+
+output "voice_lambda_alias_name" {
+  description = "Voice Lambda alias that API Gateway and the warm pool use"
+  value       = aws_lambda_alias.voice_live.name
+}
+
+output "text_stream_lambda_function_name" {
+  description = "Text streaming Lambda function name"
+  value       = aws_lambda_function.text_stream.function_name
+}
+
+output "text_stream_function_url" {
+  description = "Function URL for the streaming text endpoint (POST /generate/text/stream)"
+  value       = aws_lambda_function_url.text_stream.function_url
+}
+
 output "lambda_log_group_name" {
   description = "Lambda CloudWatch log group name"
   value       = aws_cloudwatch_log_group.lambda_logs.name
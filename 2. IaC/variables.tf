@@ -28,6 +28,36 @@ variable "lambda_timeout" {
   default     = 60
 }
 
+variable "voice_memory_size" {
+  description = "Voice Lambda function memory size in MB (benchmarks/bench_route_memory.py)"
+  type        = number
+  default     = 512
+}
+
+variable "voice_provisioned_concurrency" {
+  description = "Provisioned concurrency for the voice function alias (0 disables the warm pool)"
+  type        = number
+  default     = 1
+}
+
+variable "text_stream_memory_size" {
+  description = "Text streaming Lambda function memory size in MB"
+  type        = number
+  default     = 256
+}
+
+variable "lambda_adapter_layer_version" {
+  description = "Lambda Web Adapter layer version for the text streaming function (x86_64)"
+  type        = number
+  default     = 25
+}
+
+variable "warmup_schedule" {
+  description = "EventBridge schedule for the voice warm-up (keep-alive) event"
+  type        = string
+  default     = "rate(5 minutes)"
+}
+
 variable "github_repository" {
   description = "GitHub repository in format 'owner/repo'"
   type        = string